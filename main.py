@@ -3,21 +3,114 @@
 Bu dosya projenin tüm adımlarını sırasıyla çalıştırır.
 """
 
-import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score
-import matplotlib.pyplot as plt
+import glob
 import os
 
 # Kendi modüllerimizi import edelim
 import sys
 sys.path.append('src')
 
-from data_preprocessing import preprocess_data, save_processed_data
-from clustering_analysis import determine_optimal_clusters, perform_kmeans_clustering
-from visualization import plot_cluster_analysis, plot_pca_clusters, create_traffic_map, plot_cluster_characteristics
+from data_preprocessing import preprocess_data, preprocess_months, save_processed_data
+from normalization import load_scaler, scaler_columns
+from feature_matrix import build_feature_matrix
+from clustering_analysis import (determine_optimal_clusters, perform_kmeans_clustering,
+                                 FULL_KMEANS_PARAMS, MINIBATCH_PARAMS, SAMPLE_PARAMS, SWEEP_KMEANS_PARAMS,
+                                 SWEEP_N_INIT, SWEEP_SAMPLE_SIZE)
+from cluster_stats import compute_cluster_stats, feature_stat, save_cluster_report
+from cluster_quality import metric_label, select_optimal_k
+from model_cache import fingerprint_array, fingerprint_file, load_entry, make_cache_key, save_entry
+from incremental import month_from_path, save_model_state
+from compression import compress_rows, expand_labels, unique_strata
+from month_partitions import PARTITION_COLUMN
+from instrumentation import DEFAULT_METRICS_PATH, configure, print_summary, track
+from pipeline import DEFAULT_CHECKPOINT_DIR, Stage, run_pipeline
+from projection import (fit_projection, load_projection, projection_arrays, projection_from_arrays,
+                        save_projection)
+from partitioned_clustering import cluster_partitions, partition_cluster_stats, partition_layout
+from site_profiles import build_site_profiles, cluster_site_profiles
+from visualization import (plot_cluster_analysis, plot_pca_clusters, create_traffic_map, plot_cluster_characteristics,
+                           configure_rendering, prepare_figures, render_batch, wait_for_renders)
+
+RAW_DATA_PATH = 'data/raw/traffic_density_202501.csv'
+SCALER_PATH = 'data/processed/scaler.joblib'
+# Ölçeklenmiş özellik matrisi (float32, bellek eşlemeli; bkz. src/feature_matrix.py)
+FEATURE_MATRIX_PATH = 'data/processed/features.npy'
+
+# Birden fazla ay birlikte analiz edilecekse ham dosya deseni verilir
+# (ör. 'data/raw/traffic_density_2025*.csv'). Aylar işçi süreçlerde paralel
+# ayrıştırılıp ay bölümlü Parquet veri setine yazılır (bkz. src/month_partitions.py);
+# ANALYSIS_MONTHS / ANALYSIS_HOURS ile yalnızca istenen ay ve saatler okunur.
+# None ise yalnızca RAW_DATA_PATH analiz edilir.
+RAW_DATA_GLOB = None
+MONTH_DATASET_DIR = 'data/processed/months'
+ANALYSIS_MONTHS = None  # ör. [202501, 202502]
+ANALYSIS_HOURS = None   # ör. [7, 8, 9]
+INGEST_WORKERS = None   # None: dosya sayısı ve çekirdek sayısına göre
+
+# K seçimi için kalite metriği (bkz. cluster_quality.QUALITY_METRICS).
+# Tam silhouette 200K örneklemde O(n²) olduğundan tabakalı alt örneklem kullanılır;
+# daha sıkı zaman bütçesi için 'simplified_silhouette', 'calinski_harabasz'
+# veya 'davies_bouldin' seçilebilir.
+QUALITY_METRIC = 'silhouette_sampled'
+QUALITY_METRIC_OPTIONS = {'sample_size': 20000}
+
+# Son kümeleme motoru: 'kmeans' (tam veri), 'minibatch' (parça parça,
+# tam matris belleğe alınmaz; bkz. clustering_analysis.MINIBATCH_PARAMS) veya
+# 'sample' (saat × gün tabakalı örneklemde eğit, tüm veriyi ata; bkz. SAMPLE_PARAMS)
+KMEANS_ENGINE = 'kmeans'
+
+# Aynı girdi ve ayarlarla K taraması ve son kümeleme yeniden eğitilmez;
+# sonuçlar model önbelleğinden yüklenir (bkz. src/model_cache.py)
+USE_MODEL_CACHE = True
+
+# Aynı özellik vektörleri tek satıra indirilip tekrar sayılarıyla ağırlıklı
+# kümelenir (bkz. src/compression.py). COMPRESS_DECIMALS verilirse vektörler
+# önce yuvarlanır; bu yakın vektörleri de birleştirir ama sonucu yaklaşık yapar.
+# Tekil vektörler satırların bu oranından fazlaysa sıkıştırma kullanılmaz (kazanç yok).
+COMPRESS_FEATURES = True
+COMPRESS_DECIMALS = None
+COMPRESS_MAX_UNIQUE_FRACTION = 0.9
+
+# Veri zaman dilimi / bölgeye göre bölümlenip her bölümde K ayrı seçilerek
+# bağımsız modeller paralel eğitilebilir (bkz. src/partitioned_clustering.py):
+# 'hour_bucket', 'weekend', 'geohash' veya ör. ('hour_bucket', 'weekend').
+# None ise tüm veri tek bir modelle kümelenir.
+CLUSTER_PARTITION = None
+
+# Sonraki aylar için artımlı güncellemenin başlangıç durumu
+# (python src/incremental.py data/raw/traffic_density_202502.csv)
+MODEL_STATE_DIR = 'data/model'
+
+# Okumalara ek olarak konumlar (GEOHASH) haftalık saat profillerine göre kümelenir
+CLUSTER_SITES = True
+SITE_CLUSTERS_PATH = 'results/site_clusters.csv'
+
+# PCA grafiği için kalıcı izdüşüm: 'incremental' (tüm satırlar, parça parça) veya
+# 'randomized' (örneklemde randomized SVD). Model durumu klasörüne kaydedilir ve
+# sonraki çalıştırmalarda (ör. yeni ay) aynı eksenler kullanılır; REFIT_PROJECTION
+# (veya --refit-projection) True ise izdüşüm yeniden eğitilip üzerine yazılır.
+PROJECTION_METHOD = 'incremental'
+REFIT_PROJECTION = False
+
+# Küme istatistikleri raporu (.json ve .parquet uzantılarıyla kaydedilir)
+CLUSTER_REPORT_PATH = 'results/cluster_stats'
+
+# Aşama çıktıları bu klasöre kaydedilir; değişmeyen aşamalar yeniden çalıştırılmaz
+# (bkz. src/pipeline.py ve `python main.py --help`)
+CHECKPOINT_DIR = DEFAULT_CHECKPOINT_DIR
+
+# Grafikler etkileşimsiz (Agg) arka uçla, işçi süreçlerde paralel çizilir; çizimler yorum
+# aşamasıyla örtüşür ve main() sonunda beklenir (hata varsa visualize başarısız sayılır).
+# False ise sırayla çizilip gösterilir
+HEADLESS_RENDER = True
+RENDER_WORKERS = None  # None: grafik sayısı ve çekirdek sayısına göre
+FIGURE_DPI = 300
+FIGURE_FORMAT = 'png'
+
+# Aşama ölçümleri (JSON-lines); --profile ile cProfile/tracemalloc çıktıları PROFILE_DIR'e yazılır
+METRICS_PATH = DEFAULT_METRICS_PATH
+PROFILE_DIR = 'results/profile'
 
 def create_directories():
     """Gerekli klasörleri oluşturur."""
@@ -35,217 +128,433 @@ def create_directories():
     except Exception as e:
         print(f"Klasör oluşturma hatası: {e}")
 
-def main():
-    """Ana analiz fonksiyonu"""
-    print("=== İstanbul Trafik Davranış Kalıplarının Analizi ===\n")
-    print("📊 1.7M veri ile tam analiz yapılıyor...")
-    
-    # Klasörleri oluştur
-    create_directories()
-    
-    # 1. Veri Yükleme ve Ön İşleme
+def ingest_stage():
+    """1. Veri yükleme ve ön işleme."""
     print("1. Veri yükleniyor ve ön işleme yapılıyor...")
     
-    try:
-        # Tam veri dosyasını yükle
-        raw_data = pd.read_csv('data/raw/traffic_density_202501.csv')
-        print(f"Ham veri boyutu: {raw_data.shape}")
-        print(f"Ham veri sütunları: {list(raw_data.columns)}")
-        
-        # Veri ön işleme (tam veri ile)
-        processed_data = preprocess_data('data/raw/traffic_density_202501.csv')
-        print(f"İşlenmiş veri boyutu: {processed_data.shape}")
-        
-        # İşlenmiş veriyi kaydet
-        save_processed_data(processed_data, 'data/processed/temizlenmis_veri_tam.csv')
-        print("✓ Veri ön işleme tamamlandı\n")
-        
-    except Exception as e:
-        print(f"Veri işleme hatası: {e}")
-        return
+    # Veri ön işleme (tam veri ile) - ham dosya yalnızca bir kez ayrıştırılır,
+    # sonraki çalıştırmalar sütunsal önbellekten okur
+    if RAW_DATA_GLOB:
+        processed_data = preprocess_months(RAW_DATA_GLOB, MONTH_DATASET_DIR, months=ANALYSIS_MONTHS,
+                                           hours=ANALYSIS_HOURS, scaler_path=SCALER_PATH,
+                                           max_workers=INGEST_WORKERS)
+    else:
+        processed_data = preprocess_data(RAW_DATA_PATH, scaler_path=SCALER_PATH)
+    print(f"İşlenmiş veri boyutu: {processed_data.shape}")
+    
+    # İşlenmiş veriyi kaydet
+    save_processed_data(processed_data, 'data/processed/temizlenmis_veri_tam.csv')
+    print("✓ Veri ön işleme tamamlandı\n")
     
-    # 2. Kümeleme için özellikleri hazırla
+    # Ön işlemede eğitilen ölçekleyici, kümeleme özelliklerini ve
+    # sütun başına ölçek parametrelerini birlikte taşır
+    return {'processed_data': processed_data, 'scaler': load_scaler(SCALER_PATH)}
+
+def features_stage(processed_data, scaler, **_):
+    """2. Kümeleme için özellik matrisinin hazırlanması."""
     print("2. Kümeleme için özellikler hazırlanıyor...")
     
-    try:
-        available_columns = processed_data.columns.tolist()
-        print(f"Mevcut sütunlar: {available_columns}")
-        
-        # Kümeleme özelliklerini seç
-        feature_columns = []
-        
-        # Ana trafik özellikleri
-        if 'AVERAGE_SPEED' in available_columns:
-            feature_columns.append('AVERAGE_SPEED')
-        if 'NUMBER_OF_VEHICLES' in available_columns:
-            feature_columns.append('NUMBER_OF_VEHICLES')
-        if 'MINIMUM_SPEED' in available_columns:
-            feature_columns.append('MINIMUM_SPEED')
-        if 'MAXIMUM_SPEED' in available_columns:
-            feature_columns.append('MAXIMUM_SPEED')
-            
-        # Zaman özellikleri
-        if 'hour' in available_columns:
-            feature_columns.append('hour')
-        if 'day_of_week' in available_columns:
-            feature_columns.append('day_of_week')
-            
-        print(f"Kümeleme için seçilen özellikler: {feature_columns}")
-        
-        if len(feature_columns) == 0:
-            print("❌ Kümeleme için uygun özellik bulunamadı!")
-            return
-            
-        X = processed_data[feature_columns].values
-        
-        # Veriyi normalize et
-        scaler = StandardScaler()
-        X_scaled = scaler.fit_transform(X)
-        
-        print(f"✓ Özellikler hazırlandı: {X_scaled.shape}")
-        print(f"⚠️  Bu büyük veri ile işlem uzun sürebilir...\n")
+    available_columns = processed_data.columns.tolist()
+    print(f"Mevcut sütunlar: {available_columns}")
+    
+    feature_columns = scaler_columns(scaler)
+    print(f"Kümeleme için seçilen özellikler: {feature_columns}")
+    
+    if len(feature_columns) == 0:
+        raise ValueError("❌ Kümeleme için uygun özellik bulunamadı!")
         
-    except Exception as e:
-        print(f"Özellik hazırlama hatası: {e}")
-        return
+    # Ölçeklenmiş matris bir kez float32 olarak diske yazılır; sonraki tüm
+    # aşamalar (tarama, kümeleme, PCA, silhouette) aynı bellek eşlemesini okur
+    X_scaled = build_feature_matrix(processed_data, scaler, FEATURE_MATRIX_PATH)
+    
+    # Model önbelleği anahtarları ölçeklenmiş matrisin içeriğinden türetilir
+    data_fingerprint = fingerprint_array(X_scaled)
     
-    # 3. Optimal küme sayısını belirle
+    # Tekrarlanan özellik vektörleri tek satıra indirilir
+    # (mini-batch motoru ağırlık desteklemediği için o motorda atlanır)
+    unique_rows, unique_weights, row_inverse = None, None, None
+    if COMPRESS_FEATURES and KMEANS_ENGINE != 'minibatch':
+        unique_rows, unique_weights, row_inverse = compress_rows(X_scaled, decimals=COMPRESS_DECIMALS)
+        if len(unique_rows) > COMPRESS_MAX_UNIQUE_FRACTION * len(X_scaled):
+            print(f"   ↩️  Tekil oranı %{COMPRESS_MAX_UNIQUE_FRACTION * 100:.0f} üzerinde; tüm satırlarla kümelenecek")
+            unique_rows, unique_weights, row_inverse = None, None, None
+    
+    print(f"✓ Özellikler hazırlandı: {X_scaled.shape}")
+    print(f"⚠️  Bu büyük veri ile işlem uzun sürebilir...\n")
+    return {'X_scaled': X_scaled, 'feature_columns': feature_columns, 'data_fingerprint': data_fingerprint,
+            'unique_rows': unique_rows, 'unique_weights': unique_weights, 'row_inverse': row_inverse}
+
+def _fit_inputs(X_scaled, unique_rows, unique_weights, row_inverse):
+    """Kümelemeye verilecek matris, ağırlıklar ve önbellek anahtarı ayarları."""
+    compression_params = {'compress': row_inverse is not None, 'decimals': COMPRESS_DECIMALS}
+    if row_inverse is None:
+        return X_scaled, None, compression_params
+    return unique_rows, unique_weights, compression_params
+
+def sweep_stage(X_scaled, unique_rows, unique_weights, row_inverse, feature_columns, scaler,
+                data_fingerprint, **_):
+    """3. Optimal küme sayısının belirlenmesi."""
     print("3. Optimal küme sayısı belirleniyor...")
+    if CLUSTER_PARTITION:
+        print(f"✓ Bölümlenmiş kümelemede K her bölüm için ayrı seçilir ({CLUSTER_PARTITION})\n")
+        return {'inertia': np.empty(0), 'quality_scores': np.empty(0), 'optimal_k': None}
     print("⏳ Büyük veri ile küme analizi yapılıyor, lütfen bekleyin...")
     
-    try:
-        # 1.7M veri için küme sayısını sınırla
-        max_clusters = 6  # Büyük veri için makul limit
-        
-        print(f"🔍 Test edilecek küme sayısı: 2-{max_clusters}")
-        
-        inertia, silhouette_scores = determine_optimal_clusters(X_scaled, max_k=max_clusters)
-        
-        # Elbow ve Silhouette grafikleri
-        plot_cluster_analysis(processed_data, inertia, silhouette_scores)
-        
-        # Optimal küme sayısını belirle
-        if len(silhouette_scores) > 0:
-            optimal_k = np.argmax(silhouette_scores) + 2
-        else:
-            optimal_k = 4  # Varsayılan
-            
-        print(f"✓ Optimal küme sayısı: {optimal_k}\n")
-        
-    except Exception as e:
-        print(f"Küme sayısı belirleme hatası: {e}")
-        optimal_k = 4
-        print(f"Varsayılan küme sayısı kullanılıyor: {optimal_k}\n")
+    X_fit, fit_weights, compression_params = _fit_inputs(X_scaled, unique_rows, unique_weights, row_inverse)
+    
+    # 1.7M veri için küme sayısını sınırla
+    max_clusters = 6  # Büyük veri için makul limit
+    
+    print(f"🔍 Test edilecek küme sayısı: 2-{max_clusters}")
+    
+    sweep_key = make_cache_key('sweep', data_fingerprint, feature_columns, scaler, {
+        'max_k': max_clusters, 'metric': QUALITY_METRIC, 'metric_options': QUALITY_METRIC_OPTIONS,
+        'sample_size': SWEEP_SAMPLE_SIZE, 'n_init': SWEEP_N_INIT, 'kmeans': SWEEP_KMEANS_PARAMS,
+        **compression_params,
+    })
+    cached = load_entry(sweep_key) if USE_MODEL_CACHE else None
     
-    # 4. K-Means kümeleme uygula
+    if cached is not None:
+        arrays, _ = cached
+        inertia, quality_scores = arrays['inertia'].tolist(), arrays['scores'].tolist()
+    else:
+        # Her K ayrı bir süreçte denenir (n_jobs=-1: tüm çekirdekler)
+        inertia, quality_scores = determine_optimal_clusters(
+            X_fit, max_k=max_clusters, n_jobs=-1,
+            metric=QUALITY_METRIC, metric_options=QUALITY_METRIC_OPTIONS, sample_weight=fit_weights)
+        if USE_MODEL_CACHE and len(quality_scores) > 0:
+            save_entry(sweep_key, {'inertia': inertia, 'scores': quality_scores},
+                       {'metric': QUALITY_METRIC, 'k_values': list(range(2, len(inertia) + 2))})
+    
+    # Hata durumunda varsayılan K checkpoint'e yazılmaz; aşama başarısız sayılır
+    if len(quality_scores) == 0:
+        raise RuntimeError("K taraması hiçbir K için sonuç üretmedi")
+    optimal_k = select_optimal_k(quality_scores, QUALITY_METRIC)
+    print(f"✓ Optimal küme sayısı: {optimal_k}\n")
+    
+    return {'inertia': np.asarray(inertia, dtype=np.float64),
+            'quality_scores': np.asarray(quality_scores, dtype=np.float64), 'optimal_k': optimal_k}
+
+def _latest_month(processed_data):
+    """Model durumuna kaydedilecek ay (çok aylı analizde verideki son ay)."""
+    if PARTITION_COLUMN in processed_data.columns:
+        return str(processed_data[PARTITION_COLUMN].max())
+    return month_from_path(RAW_DATA_PATH)
+
+def _raw_fingerprint():
+    """Ham girdi dosyalarının parmak izi (ingest aşamasının anahtarı için)."""
+    if RAW_DATA_GLOB:
+        paths = sorted(glob.glob(RAW_DATA_GLOB))
+        if not paths:
+            raise ValueError(f"Desene uyan ham veri dosyası bulunamadı: {RAW_DATA_GLOB}")
+        return [fingerprint_file(path) for path in paths]
+    if not os.path.exists(RAW_DATA_PATH):
+        raise ValueError(f"Ham veri dosyası bulunamadı: {RAW_DATA_PATH}")
+    return fingerprint_file(RAW_DATA_PATH)
+
+def _engine_params():
+    """Etkin kümeleme motorunun ayarları (model önbelleği ve checkpoint anahtarı için)."""
+    if KMEANS_ENGINE == 'minibatch':
+        return {'minibatch': MINIBATCH_PARAMS}
+    if KMEANS_ENGINE == 'sample':
+        return {'sample': SAMPLE_PARAMS, 'kmeans': FULL_KMEANS_PARAMS}
+    return {'kmeans': FULL_KMEANS_PARAMS}
+
+def cluster_stage(processed_data, X_scaled, unique_rows, unique_weights, row_inverse, feature_columns,
+                  scaler, data_fingerprint, optimal_k, **_):
+    """4. K-Means kümeleme ve küme istatistikleri."""
     print("4. K-Means kümeleme uygulanıyor...")
+    if CLUSTER_PARTITION:
+        return _partitioned_cluster_stage(processed_data, X_scaled, feature_columns, scaler)
     print("⏳ 1.7M veri ile kümeleme yapılıyor, bu işlem 10-15 dakika sürebilir...")
     
-    try:
-        cluster_labels = perform_kmeans_clustering(X_scaled, optimal_k)
-        processed_data['cluster'] = cluster_labels
-        
-        print(f"✓ {optimal_k} küme oluşturuldu")
-        print(f"Küme dağılımı:")
-        cluster_counts = processed_data['cluster'].value_counts().sort_index()
-        print(cluster_counts)
-        print()
-        
-    except Exception as e:
-        print(f"Kümeleme hatası: {e}")
-        return
+    X_fit, fit_weights, compression_params = _fit_inputs(X_scaled, unique_rows, unique_weights, row_inverse)
+    
+    strata = None
+    if 'hour' in processed_data.columns and 'day_of_week' in processed_data.columns:
+        # Haftanın saati (0-167) tabaka kodu olarak kullanılır
+        strata = processed_data['day_of_week'].to_numpy(np.int16) * 24 + processed_data['hour'].to_numpy(np.int16)
+        if row_inverse is not None:
+            # Sıkıştırılmış satırlarda her tekil vektör ilk geçtiği satırın tabakasını alır
+            strata = unique_strata(strata, row_inverse, len(X_fit))
+    
+    # Tabakalar yalnızca 'sample' motorunda kullanılır; kullanıldığında içerikleri de anahtara girer
+    strata_fingerprint = fingerprint_array(strata) if strata is not None and KMEANS_ENGINE == 'sample' else None
+    kmeans_key = make_cache_key('kmeans', data_fingerprint, feature_columns, scaler, {
+        'n_clusters': optimal_k, 'engine': KMEANS_ENGINE, **_engine_params(),
+        'strata': strata_fingerprint, **compression_params,
+    })
+    cached = load_entry(kmeans_key) if USE_MODEL_CACHE else None
+    
+    if cached is not None:
+        arrays, _ = cached
+        cluster_labels, cluster_centers = np.asarray(arrays['labels']), np.asarray(arrays['centers'])
+    else:
+        cluster_labels, cluster_centers = perform_kmeans_clustering(
+            X_fit, optimal_k, engine=KMEANS_ENGINE, strata=strata, return_centers=True,
+            sample_weight=fit_weights)
+        if row_inverse is not None:
+            # Tekil vektörlerin etiketleri tüm satırlara dağıtılır
+            cluster_labels = expand_labels(cluster_labels, row_inverse)
+        if USE_MODEL_CACHE:
+            save_entry(kmeans_key, {'labels': cluster_labels, 'centers': cluster_centers},
+                       {'n_clusters': optimal_k, 'engine': KMEANS_ENGINE})
+    
+    print(f"✓ {optimal_k} küme oluşturuldu")
+    
+    # Tüm küme özetleri tek geçişte hesaplanır; grafikler ve yorumlar bu tabloyu kullanır
+    cluster_stats = compute_cluster_stats(processed_data, feature_columns, cluster_labels, optimal_k)
+    save_cluster_report(cluster_stats, CLUSTER_REPORT_PATH)
+    # Çevrimiçi etiketleme (src/predictor.py) ölçekleyici, merkezler ve kalıpları buradan yükler
+    save_model_state(MODEL_STATE_DIR, scaler, cluster_centers, cluster_labels, _latest_month(processed_data),
+                     patterns=cluster_stats['pattern'].tolist())
+    print(f"Küme dağılımı:")
+    print(cluster_stats['count'])
+    print()
+    return {'cluster_labels': np.asarray(cluster_labels), 'cluster_centers': np.asarray(cluster_centers),
+            'cluster_stats': cluster_stats}
+
+def _partitioned_cluster_stage(processed_data, X_scaled, feature_columns, scaler):
+    """4. Bölüm başına bağımsız K-Means ve bölüm bilgili küme istatistikleri."""
+    cluster_labels, cluster_centers, partitions = cluster_partitions(
+        processed_data, X_scaled, CLUSTER_PARTITION, max_k=6, metric=QUALITY_METRIC,
+        metric_options=QUALITY_METRIC_OPTIONS, n_jobs=-1)
+    
+    cluster_stats = partition_cluster_stats(processed_data, feature_columns, cluster_labels, partitions)
+    save_cluster_report(cluster_stats, CLUSTER_REPORT_PATH)
+    # Bölüm düzeni de kaydedilir; tahmin ve artımlı güncelleme yalnızca satırın bölümündeki merkezlere bakar
+    save_model_state(MODEL_STATE_DIR, scaler, cluster_centers, cluster_labels, _latest_month(processed_data),
+                     patterns=cluster_stats['pattern'].tolist(),
+                     partitions=partition_layout(partitions, CLUSTER_PARTITION))
+    print(f"Küme dağılımı:")
+    print(cluster_stats[['partition', 'local_cluster', 'count', 'partition_share']])
+    print()
+    return {'cluster_labels': cluster_labels, 'cluster_centers': cluster_centers,
+            'cluster_stats': cluster_stats}
+
+def sites_stage(processed_data, **_):
+    """4b. Konum (GEOHASH) profillerinin kümelenmesi."""
+    if 'hour' not in processed_data.columns or 'day_of_week' not in processed_data.columns:
+        return {'site_clusters': None}
+    print("4b. Konum (GEOHASH) profilleri kümeleniyor...")
+    
+    profiles, profile_columns = build_site_profiles(processed_data)
+    site_clusters, _, _ = cluster_site_profiles(profiles, profile_columns, n_jobs=-1)
     
-    # 5. Sonuçları görselleştir
+    summary_columns = [col for col in ('LATITUDE', 'LONGITUDE', 'n_readings', 'cluster')
+                       if col in site_clusters.columns]
+    site_clusters = site_clusters[summary_columns]
+    site_clusters.to_csv(SITE_CLUSTERS_PATH)
+    print(f"✓ Konum kümeleri kaydedildi: {SITE_CLUSTERS_PATH}")
+    print(site_clusters['cluster'].value_counts().sort_index())
+    print()
+    return {'site_clusters': site_clusters}
+
+def _print_cluster_means(cluster_means):
+    print("Küme İstatistikleri:")
+    print(cluster_means)
+    print()
+
+def _stored_projection(X_scaled):
+    """Model durumundaki izdüşümü döndürür; yoksa, uyumsuzsa veya yeniden eğitim isteniyorsa None."""
+    if REFIT_PROJECTION:
+        return None
+    projection = load_projection(MODEL_STATE_DIR)
+    if projection is None:
+        return None
+    if projection.n_features_in_ != X_scaled.shape[1]:
+        print(f"⚠️ Kayıtlı izdüşüm {projection.n_features_in_} özellik için, veri {X_scaled.shape[1]} özellikli; "
+              f"yeniden eğitiliyor")
+        return None
+    print(f"🧭 Kayıtlı PCA izdüşümü kullanılıyor: {MODEL_STATE_DIR} (yeniden eğitmek için --refit-projection)")
+    return projection
+
+def visualize_stage(processed_data, X_scaled, feature_columns, scaler, data_fingerprint,
+                    inertia, quality_scores, cluster_labels, cluster_stats, **_):
+    """5. Sonuçların görselleştirilmesi."""
     print("5. Sonuçlar görselleştiriliyor...")
     print("⏳ Büyük veri görselleştirmesi yapılıyor...")
+    processed_data['cluster'] = cluster_labels
     
-    try:
-        # PCA ile kümeleri görselleştir (örnekleme ile)
-        print("📊 PCA analizi için veri örneklemesi yapılıyor...")
-        pca_sample_size = min(50000, len(processed_data))
-        pca_sample_data = processed_data.sample(n=pca_sample_size, random_state=42)
-        pca_sample_features = X_scaled[pca_sample_data.index]
-        pca_sample_labels = cluster_labels[pca_sample_data.index]
-        
-        plot_pca_clusters(pca_sample_data, pca_sample_features, pca_sample_labels)
-        
-        # Küme özelliklerini analiz et (tam veri ile)
-        cluster_stats = plot_cluster_characteristics(processed_data, feature_columns)
-        if cluster_stats is not None:
-            print("Küme İstatistikleri:")
-            print(cluster_stats)
-            print()
-        
-        # Harita oluştur (koordinat bilgisi varsa - örnekleme ile)
-        if 'LATITUDE' in processed_data.columns and 'LONGITUDE' in processed_data.columns:
-            print("🗺️  Harita için veri örneklemesi yapılıyor...")
-            map_sample_size = min(10000, len(processed_data))  # Harita için 10K nokta
-            map_data = processed_data.sample(n=map_sample_size, random_state=42)
-            
-            # Sütun isimlerini düzelt
-            map_data = map_data.rename(columns={'LATITUDE': 'latitude', 'LONGITUDE': 'longitude'})
-            traffic_map = create_traffic_map(map_data)
+    # PCA izdüşümü tam matriste bir kez eğitilir ve sonraki aylar için saklanır
+    projection = _stored_projection(X_scaled)
+    if projection is None:
+        projection_key = make_cache_key('projection', data_fingerprint, feature_columns, scaler,
+                                        {'method': PROJECTION_METHOD, 'n_components': 2})
+        cached = load_entry(projection_key) if USE_MODEL_CACHE else None
+        if cached is not None:
+            projection = projection_from_arrays(cached[0])
         else:
-            print("⚠️ Koordinat bilgisi bulunamadı, harita oluşturulamadı")
-            
-        print("✓ Görselleştirme tamamlandı\n")
+            projection = fit_projection(X_scaled, method=PROJECTION_METHOD)
+            if USE_MODEL_CACHE:
+                save_entry(projection_key, projection_arrays(projection), {'method': PROJECTION_METHOD})
+        save_projection(projection, MODEL_STATE_DIR)
+    
+    if HEADLESS_RENDER:
+        # Diziler burada hazırlanır, çizim işçi süreçlerde arka planda yapılır
+        jobs = prepare_figures(processed_data, X_scaled, cluster_labels, feature_columns, cluster_stats,
+                               inertia, quality_scores, metric_label(QUALITY_METRIC), projection)
+        render_batch(jobs, RENDER_WORKERS)
         
-    except Exception as e:
-        print(f"Görselleştirme hatası: {e}")
+        # Çizim işçilerde sürerken tablo ve yorumlar yazdırılır; hatalar main() içinde toplanır
+        _print_cluster_means(feature_stat(cluster_stats, feature_columns, 'mean').round(3))
+        print(f"✓ {len(jobs)} grafik arka planda çiziliyor\n")
+        return
     
-    # 6. Küme yorumları
+    # Elbow ve kalite metriği grafikleri
+    if len(quality_scores) > 0:
+        plot_cluster_analysis(processed_data, list(inertia), list(quality_scores),
+                              score_label=metric_label(QUALITY_METRIC))
+    
+    # PCA ile kümeleri görselleştir (tüm satırlar, rasterleştirilmiş)
+    plot_pca_clusters(processed_data, X_scaled, cluster_labels, mode='raster', projection=projection)
+    
+    # Küme özelliklerini analiz et (tam veri ile)
+    cluster_means = plot_cluster_characteristics(processed_data, feature_columns, cluster_stats)
+    if cluster_means is not None:
+        _print_cluster_means(cluster_means)
+    
+    # Harita oluştur (koordinat bilgisi varsa - tüm veri hücrelere toplanarak)
+    if 'LATITUDE' in processed_data.columns and 'LONGITUDE' in processed_data.columns:
+        create_traffic_map(processed_data)
+    else:
+        print("⚠️ Koordinat bilgisi bulunamadı, harita oluşturulamadı")
+        
+    print("✓ Görselleştirme tamamlandı\n")
+
+def interpret_stage(cluster_stats, feature_columns, **_):
+    """6. Küme yorumları."""
     print("6. Küme Yorumları:")
     print("="*60)
     
-    try:
-        for cluster_id in range(optimal_k):
-            cluster_data = processed_data[processed_data['cluster'] == cluster_id]
-            
-            print(f"\n🔵 KÜME {cluster_id}:")
-            print(f"  📊 Veri Noktası Sayısı: {len(cluster_data):,}")
-            print(f"  📈 Toplam Veri Oranı: %{(len(cluster_data)/len(processed_data)*100):.1f}")
-            
-            # Ana özellikler için ortalama
-            for feature in feature_columns:
-                if feature in cluster_data.columns:
-                    avg_value = cluster_data[feature].mean()
-                    if 'SPEED' in feature:
-                        print(f"  🚗 Ortalama {feature}: {avg_value:.1f} km/h")
-                    elif 'VEHICLES' in feature:
-                        print(f"  🚙 Ortalama {feature}: {avg_value:.0f} araç")
-                    elif feature == 'hour':
-                        print(f"  🕐 Ortalama Saat: {avg_value:.1f}")
-                    else:
-                        print(f"  📋 Ortalama {feature}: {avg_value:.2f}")
-            
-            # Trafik kalıbını belirle
-            if 'AVERAGE_SPEED' in cluster_data.columns:
-                avg_speed = cluster_data['AVERAGE_SPEED'].mean()
-                avg_vehicles = cluster_data['NUMBER_OF_VEHICLES'].mean() if 'NUMBER_OF_VEHICLES' in cluster_data.columns else 0
-                
-                if avg_speed < 30 and avg_vehicles > 150:
-                    pattern = "🔴 Yoğun-Sıkışık Trafik"
-                elif avg_speed > 50 and avg_vehicles < 100:
-                    pattern = "🟢 Akıcı-Düşük Yoğunluk"
-                elif 30 <= avg_speed <= 50:
-                    pattern = "🟡 Orta Yoğunluk Trafik"
+    for cluster_id, row in cluster_stats.iterrows():
+        print(f"\n🔵 KÜME {cluster_id}:")
+        if 'partition' in row:
+            print(f"  🧩 Bölüm: {row['partition']} (yerel küme {row['local_cluster']}, "
+                  f"bölüm içi oran %{row['partition_share'] * 100:.1f})")
+        print(f"  📊 Veri Noktası Sayısı: {row['count']:,}")
+        print(f"  📈 Toplam Veri Oranı: %{row['share'] * 100:.1f}")
+        
+        # Ana özellikler için ortalama
+        for feature in feature_columns:
+            if f'{feature}_mean' in row:
+                avg_value = row[f'{feature}_mean']
+                if 'SPEED' in feature:
+                    print(f"  🚗 Ortalama {feature}: {avg_value:.1f} km/h")
+                elif 'VEHICLES' in feature:
+                    print(f"  🚙 Ortalama {feature}: {avg_value:.0f} araç")
+                elif feature == 'hour':
+                    print(f"  🕐 Ortalama Saat: {avg_value:.1f}")
                 else:
-                    pattern = "⚪ Karma Trafik"
-                    
-                print(f"  🎯 Trafik Kalıbı: {pattern}")
-                
-    except Exception as e:
-        print(f"Küme yorumlama hatası: {e}")
+                    print(f"  📋 Ortalama {feature}: {avg_value:.2f}")
+        
+        # Trafik kalıbı (bkz. cluster_stats.traffic_pattern)
+        if row['pattern'] is not None:
+            print(f"  🎯 Trafik Kalıbı: {row['pattern']}")
     
     print("\n" + "="*60)
+
+def build_stages():
+    """Analiz aşamalarını bağımlılık sırasıyla tanımlar.
+
+    Aşama parametreleri checkpoint anahtarına girer; burada listelenen bir ayar
+    değiştiğinde o aşama ve ona bağlı aşamalar yeniden çalıştırılır.
+    """
+    stages = [
+        # Ham dosyaların parmak izi anahtar gerektiğinde alınır (--list dosyaları okumaz)
+        Stage('ingest', ingest_stage, (),
+              lambda: {'raw': _raw_fingerprint(), 'scaler_path': SCALER_PATH,
+                       'months': ANALYSIS_MONTHS, 'hours': ANALYSIS_HOURS}),
+        Stage('features', features_stage, ('ingest',),
+              {'compress': COMPRESS_FEATURES and KMEANS_ENGINE != 'minibatch', 'decimals': COMPRESS_DECIMALS,
+               'max_unique_fraction': COMPRESS_MAX_UNIQUE_FRACTION,
+               'matrix_path': FEATURE_MATRIX_PATH}),
+        Stage('sweep', sweep_stage, ('ingest', 'features'),
+              {'max_k': 6, 'metric': QUALITY_METRIC, 'metric_options': QUALITY_METRIC_OPTIONS,
+               'sample_size': SWEEP_SAMPLE_SIZE, 'n_init': SWEEP_N_INIT, 'kmeans': SWEEP_KMEANS_PARAMS,
+               'partition': CLUSTER_PARTITION}),
+        Stage('cluster', cluster_stage, ('ingest', 'features', 'sweep'),
+              {'engine': KMEANS_ENGINE, **_engine_params(), 'partition': CLUSTER_PARTITION}),
+    ]
+    if CLUSTER_SITES:
+        stages.append(Stage('sites', sites_stage, ('ingest',)))
+    stages += [
+        Stage('visualize', visualize_stage, ('ingest', 'features', 'sweep', 'cluster'),
+              {'projection': PROJECTION_METHOD, 'refit_projection': REFIT_PROJECTION}, checkpoint=False),
+        Stage('interpret', interpret_stage, ('features', 'cluster'), checkpoint=False),
+    ]
+    return stages
+
+def main(start=None, stop=None, force=False, profile=False):
+    """Ana analiz fonksiyonu.
+
+    Args:
+        start: Bu aşamadan itibaren yeniden çalıştır (öncekiler checkpoint'ten yüklenir).
+        stop: Bu aşamadan sonra dur.
+        force: Checkpoint'leri yok sayarak tüm aşamaları çalıştır.
+        profile: Çalışan aşamalar için cProfile ve tracemalloc çıktılarını kaydet.
+    """
+    print("=== İstanbul Trafik Davranış Kalıplarının Analizi ===\n")
+    print("📊 1.7M veri ile tam analiz yapılıyor...")
+    
+    # Klasörleri oluştur
+    create_directories()
+    
+    configure(METRICS_PATH, profile_dir=PROFILE_DIR if profile else None)
+    configure_rendering(dpi=FIGURE_DPI, fmt=FIGURE_FORMAT, headless=HEADLESS_RENDER)
+    status = run_pipeline(build_stages(), CHECKPOINT_DIR, start=start, stop=stop, force=force)
+    
+    # Arka plan çizimleri yorum aşamasıyla örtüşür; tamamlanmaları ve hataları burada toplanır
+    with track('render_wait'):
+        errors = wait_for_renders()
+    if errors:
+        print(f"❌ {len(errors)} grafik çizilemedi: {', '.join(errors)}")
+        status['visualize'] = 'failed'
+    elif status.get('visualize') == 'run' and HEADLESS_RENDER:
+        print("✓ Görselleştirme tamamlandı\n")
+    print_summary()
+    if any(state in ('failed', 'skipped') for state in status.values()):
+        print(f"⚠️ Tamamlanamayan aşamalar: "
+              f"{', '.join(name for name, state in status.items() if state in ('failed', 'skipped'))}")
+        return
+    if stop is not None:
+        print(f"⏹️ '{stop}' aşamasından sonra durduruldu")
+        return
+    
     print("🎉 === 1.7M Veri ile Analiz Tamamlandı! ===")
     print("📁 Sonuçlar 'results' klasöründe kaydedildi.")
     print("\n📋 Oluşturulan dosyalar:")
-    print("  📊 results/graphs/cluster_analysis.png")
-    print("  🎨 results/graphs/pca_clusters.png") 
-    print("  📈 results/graphs/cluster_characteristics.png")
+    print(f"  📊 results/graphs/cluster_analysis.{FIGURE_FORMAT}")
+    print(f"  🎨 results/graphs/pca_clusters.{FIGURE_FORMAT}") 
+    print(f"  📈 results/graphs/cluster_characteristics.{FIGURE_FORMAT}")
     print("  🗺️ results/maps/traffic_clusters.html")
+    print(f"  📑 {CLUSTER_REPORT_PATH}.json, {CLUSTER_REPORT_PATH}.parquet")
+    if CLUSTER_SITES:
+        print(f"  📍 {SITE_CLUSTERS_PATH}")
     print("  💾 data/processed/temizlenmis_veri_tam.csv")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="İstanbul trafik kalıpları analizini çalıştırır.")
+    parser.add_argument('--from', dest='start', metavar='STAGE',
+                        help="Bu aşamadan itibaren yeniden çalıştır (ör. cluster, visualize)")
+    parser.add_argument('--to', dest='stop', metavar='STAGE', help="Bu aşamadan sonra dur")
+    parser.add_argument('--force', action='store_true', help="Checkpoint'leri yok say")
+    parser.add_argument('--list', action='store_true', help="Aşamaları listele ve çık")
+    parser.add_argument('--refit-projection', action='store_true',
+                        help=f"Kayıtlı PCA izdüşümünü yok say, yeniden eğit ve {MODEL_STATE_DIR} altına yaz")
+    parser.add_argument('--profile', action='store_true',
+                        help=f"Aşamaların cProfile/tracemalloc çıktılarını {PROFILE_DIR} altına kaydet")
+    args = parser.parse_args()
+    if args.refit_projection:
+        REFIT_PROJECTION = True
+    
+    if args.list:
+        for stage in build_stages():
+            print(f"{stage.name:<10} <- {', '.join(stage.deps) or '-'}")
+    else:
+        try:
+            main(start=args.start, stop=args.stop, force=args.force, profile=args.profile)
+        except ValueError as e:
+            parser.error(str(e))
@@ -0,0 +1,356 @@
+"""
+Boru hattı performans ölçümü.
+
+Sentetik veri (bkz. synthetic_data.py) üzerinde ön işleme, K taraması, son
+kümeleme, grafikler ve harita fonksiyonlarını ayrı ayrı çalıştırır; her biri
+için duvar saati süresi, CPU süresi ve tepe bellek (tracemalloc) ölçülür.
+tracemalloc her ayırmayı izleyip süreyi şişirdiğinden süre ve bellek ayrı
+geçişlerde ölçülür.
+Sonuçlar JSON olarak kaydedilir ve kayıtlı bir taban çizgisiyle (baseline)
+karşılaştırılır; tolerans dışındaki yavaşlama veya bellek artışları
+gerileme olarak işaretlenir ve çıkış kodu 1 olur. Taban çizgisi makineye
+özgüdür: depoya eklenmez, ilk çalıştırmada oluşturulur ve ortam parmak izi
+(işlemci, çekirdek sayısı, kütüphane sürümleri) uyuşmazsa süre ve bellek
+karşılaştırması atlanır.
+
+Çekirdek modüllerin (main, predictor, ...) içe aktarma süresi de ayrı, temiz
+süreçlerde ölçülür. Bu modüllerden biri grafik/harita kütüphanelerini
+(matplotlib, seaborn, folium) açılışta yüklerse veya
+içe aktarma süresi taban çizgisine göre uzarsa gerileme olarak işaretlenir.
+
+Örnek:
+    python src/benchmark.py --size 100k                  # ölç ve karşılaştır
+    python src/benchmark.py --size 1.7m --save-baseline  # taban çizgisini yeniden oluştur
+    python src/benchmark.py --imports-only               # yalnızca içe aktarma süreleri
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+from clustering_analysis import determine_optimal_clusters, perform_kmeans_clustering
+from cluster_stats import compute_cluster_stats
+from data_preprocessing import preprocess_data
+from feature_matrix import build_feature_matrix
+from ingestion import clear_cache
+from normalization import load_scaler
+from synthetic_data import generate_traffic_csv
+from visualization import (configure_rendering, create_traffic_map, plot_cluster_analysis,
+                           plot_cluster_characteristics, plot_pca_clusters)
+
+# Grafikler ekrana çizilmeden yalnızca dosyaya yazılır
+configure_rendering(headless=True)
+
+BENCHMARK_SIZES = {
+    '100k': 100_000,
+    '1.7m': 1_700_000,
+    '20m': 20_000_000,
+}
+
+DEFAULT_DATA_DIR = 'data/benchmark'
+DEFAULT_RESULTS_DIR = 'results/benchmarks'
+DEFAULT_BASELINE_DIR = 'benchmarks'
+
+# Taban çizgisine göre izin verilen göreli artış; çok kısa ölçümler gürültülü
+# olduğundan MIN_SECONDS altındaki süreler karşılaştırılmaz
+TIME_TOLERANCE = 0.20
+MEMORY_TOLERANCE = 0.20
+MIN_SECONDS = 0.5
+
+# İçe aktarma süreleri disk önbelleği ve makine yüküne çok duyarlıdır (±%50);
+# asıl koruma tembel kütüphane denetimidir, süre yalnızca iki katına çıkarsa işaretlenir
+IMPORT_TIME_TOLERANCE = 1.0
+
+# K taraması main.py'deki ayarlarla ölçülür (tam silhouette büyük örneklemde O(n²))
+SWEEP_METRIC = 'silhouette_sampled'
+SWEEP_METRIC_OPTIONS = {'sample_size': 20000}
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Açılış süresi ölçülen modüller ve bunların açılışta yüklememesi gereken kütüphaneler
+CORE_MODULES = ('main', 'data_preprocessing', 'clustering_analysis', 'partitioned_clustering',
+                'incremental', 'predictor', 'cluster_stats', 'visualization')
+# (sklearn.decomposition burada yok: sklearn.cluster onu zaten yükler)
+LAZY_MODULES = ('matplotlib', 'seaborn', 'folium')
+IMPORT_REPEATS = 3
+
+_IMPORT_PROBE = '''
+import json, sys, time
+sys.path.insert(0, 'src')
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'loaded': [name for name in {lazy!r} if name in sys.modules]}}))
+'''
+
+
+def _close_figures():
+    if 'matplotlib.pyplot' in sys.modules:
+        sys.modules['matplotlib.pyplot'].close('all')
+
+
+def measure(name, func, *args, setup=None, **kwargs):
+    """Fonksiyonu iki kez çalıştırır ve (ilk geçişin sonucu, ölçüm) döndürür.
+
+    Süre ilk geçişte tracemalloc kapalıyken, tepe bellek ikinci geçişte ölçülür.
+    `setup` verilirse her geçişten önce çağrılır (ör. önbelleği silmek için).
+    """
+    if setup is not None:
+        setup()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    result = func(*args, **kwargs)
+    seconds, cpu_seconds = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    _close_figures()
+
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    _close_figures()
+
+    record = {'seconds': round(seconds, 4), 'cpu_seconds': round(cpu_seconds, 4),
+              'peak_mb': round(peak / 1024 ** 2, 2)}
+    print(f"⏱️  {name:<30} {seconds:8.2f} s  {record['peak_mb']:9.1f} MB")
+    return result, record
+
+
+def measure_import(module, repeats=IMPORT_REPEATS, lazy_modules=LAZY_MODULES):
+    """Modülün içe aktarma süresini temiz bir Python sürecinde ölçer.
+
+    Her tekrar yeni bir süreçte çalışır; en kısa süre raporlanır (ilk tekrar
+    bayt kodu derlemesini de içerebilir).
+
+    Returns:
+        {'seconds': ..., 'loaded': [açılışta yüklenen tembel kütüphaneler]}
+    """
+    probe = _IMPORT_PROBE.format(module=module, lazy=tuple(lazy_modules))
+    timings, loaded = [], []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, '-c', probe], cwd=PROJECT_ROOT, check=True,
+                                capture_output=True, text=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result['seconds'])
+        loaded = result['loaded']
+    record = {'seconds': round(min(timings), 4), 'loaded': loaded}
+    extra = f"  ⚠️ {', '.join(loaded)}" if loaded else ''
+    print(f"📦 import {module:<23} {record['seconds']:8.3f} s{extra}")
+    return record
+
+
+def run_import_benchmarks(modules=CORE_MODULES, repeats=IMPORT_REPEATS):
+    """Çekirdek modüllerin açılış sürelerini ölçer."""
+    return {module: measure_import(module, repeats) for module in modules}
+
+
+def benchmark_data_path(size, data_dir=DEFAULT_DATA_DIR):
+    """Boyut için sentetik veri dosyasını döndürür; yoksa üretir."""
+    path = os.path.abspath(os.path.join(data_dir, f'traffic_density_bench_{size}.csv'))
+    if not os.path.exists(path):
+        generate_traffic_csv(path, BENCHMARK_SIZES[size])
+    return path
+
+
+def run_benchmarks(size, data_dir=DEFAULT_DATA_DIR, max_k=6, n_clusters=4, engine='kmeans'):
+    """Tüm ölçümleri çalıştırır.
+
+    Grafik ve harita çıktıları geçici bir çalışma klasörüne yazılır; projenin
+    `results/` klasörü değişmez.
+
+    Returns:
+        Ölçüm sonuçları sözlüğü (bkz. `save_results`).
+    """
+    path = benchmark_data_path(size, data_dir)
+    results = {}
+    working_dir = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            # Sütunsal önbellek her geçişten önce silinerek CSV ayrıştırması da ölçülür
+            data, results['preprocess_data'] = measure('preprocess_data', preprocess_data, path,
+                                                       setup=lambda: clear_cache(path),
+                                                       scaler_path='scaler.joblib')
+            scaler = load_scaler('scaler.joblib')
+            X, results['build_feature_matrix'] = measure('build_feature_matrix', build_feature_matrix, data, scaler,
+                                                         'features.npy')
+
+            (inertia, scores), results['determine_optimal_clusters'] = measure(
+                'determine_optimal_clusters', determine_optimal_clusters, X, max_k=max_k,
+                metric=SWEEP_METRIC, metric_options=SWEEP_METRIC_OPTIONS)
+            labels, results['perform_kmeans_clustering'] = measure(
+                'perform_kmeans_clustering', perform_kmeans_clustering, X, n_clusters, engine=engine)
+            data['cluster'] = labels
+
+            feature_columns = list(scaler.feature_names_in_)
+            stats, results['compute_cluster_stats'] = measure(
+                'compute_cluster_stats', compute_cluster_stats, data, feature_columns, labels)
+
+            _, results['plot_cluster_analysis'] = measure(
+                'plot_cluster_analysis', plot_cluster_analysis, data, inertia, scores)
+            _, results['plot_pca_clusters'] = measure(
+                'plot_pca_clusters', plot_pca_clusters, data, X, labels, mode='raster')
+            _, results['plot_cluster_characteristics'] = measure(
+                'plot_cluster_characteristics', plot_cluster_characteristics, data, feature_columns, stats)
+            _, results['create_traffic_map'] = measure('create_traffic_map', create_traffic_map, data)
+        finally:
+            os.chdir(working_dir)
+
+    return {
+        'size': size,
+        'rows': BENCHMARK_SIZES[size],
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'environment': environment(),
+        'params': {'max_k': max_k, 'n_clusters': n_clusters, 'engine': engine, 'metric': SWEEP_METRIC},
+        'results': results,
+        'imports': run_import_benchmarks(),
+    }
+
+
+def _cpu_model():
+    try:
+        with open('/proc/cpuinfo', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('model name'):
+                    return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def environment():
+    """Ölçümleri etkileyen ortam bilgisi; taban çizgisiyle eşleşmesi karşılaştırmanın ön koşuludur."""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'machine': platform.machine(),
+        'cpu': _cpu_model(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def save_results(report, path):
+    """Ölçüm sonuçlarını JSON olarak kaydeder."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"💾 Ölçüm sonuçları kaydedildi: {path}")
+
+
+def baseline_path(size, baseline_dir=DEFAULT_BASELINE_DIR):
+    return os.path.join(baseline_dir, f'baseline_{size}.json')
+
+
+def compare_to_baseline(report, baseline, time_tolerance=TIME_TOLERANCE, memory_tolerance=MEMORY_TOLERANCE):
+    """Taban çizgisine göre gerilemeleri listeler.
+
+    Returns:
+        [(ölçüm, metrik, taban, yeni, göreli_değişim)] - yalnızca tolerans dışındakiler.
+    """
+    regressions = []
+    for name, current in report['results'].items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            continue
+        checks = [('peak_mb', memory_tolerance)]
+        if previous['seconds'] >= MIN_SECONDS:
+            checks.append(('seconds', time_tolerance))
+        for metric, tolerance in checks:
+            before, after = previous[metric], current[metric]
+            change = (after - before) / before if before else 0.0
+            if change > tolerance:
+                regressions.append((name, metric, before, after, change))
+    return regressions + check_imports(report, baseline)
+
+
+def check_imports(report, baseline=None, time_tolerance=IMPORT_TIME_TOLERANCE):
+    """Açılış gerilemelerini listeler (bkz. `compare_to_baseline`).
+
+    Tembel yüklenmesi gereken bir kütüphaneyi açılışta yükleyen modül taban
+    çizgisi olmadan da gerileme sayılır; süreler yalnızca taban çizgisiyle
+    karşılaştırılır.
+    """
+    regressions = []
+    previous_imports = (baseline or {}).get('imports', {})
+    for module, current in report.get('imports', {}).items():
+        if current['loaded']:
+            regressions.append((f'import {module}', 'loaded', [], current['loaded'], float('inf')))
+        previous = previous_imports.get(module)
+        if previous is None or previous['seconds'] < MIN_SECONDS:
+            continue
+        change = (current['seconds'] - previous['seconds']) / previous['seconds']
+        if change > time_tolerance:
+            regressions.append((f'import {module}', 'seconds', previous['seconds'], current['seconds'], change))
+    return regressions
+
+
+# Örnek kullanım: python src/benchmark.py --size 100k [--save-baseline]
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Boru hattı performans ölçümü.")
+    parser.add_argument('--size', choices=list(BENCHMARK_SIZES), default='100k')
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR)
+    parser.add_argument('--output', help="Sonuç dosyası (varsayılan: results/benchmarks/<size>.json)")
+    parser.add_argument('--baseline-dir', default=DEFAULT_BASELINE_DIR)
+    parser.add_argument('--save-baseline', action='store_true', help="Sonucu yeni taban çizgisi olarak kaydet")
+    parser.add_argument('--max-k', type=int, default=6, help="K taramasının üst sınırı")
+    parser.add_argument('--engine', default='kmeans', help="perform_kmeans_clustering motoru")
+    parser.add_argument('--imports-only', action='store_true',
+                        help="Yalnızca çekirdek modüllerin içe aktarma sürelerini ölç")
+    args = parser.parse_args()
+
+    if args.imports_only:
+        report = {'size': args.size, 'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+                  'environment': environment(), 'imports': run_import_benchmarks()}
+        save_results(report, args.output or os.path.join(DEFAULT_RESULTS_DIR, 'imports.json'))
+    else:
+        report = run_benchmarks(args.size, args.data_dir, max_k=args.max_k, engine=args.engine)
+        save_results(report, args.output or os.path.join(DEFAULT_RESULTS_DIR, f'{args.size}.json'))
+
+    baseline_file = baseline_path(args.size, args.baseline_dir)
+    baseline = None
+    if not args.imports_only and (args.save_baseline or not os.path.exists(baseline_file)):
+        # İlk çalıştırma bu makinenin taban çizgisini oluşturur
+        save_results(report, baseline_file)
+    elif os.path.exists(baseline_file):
+        with open(baseline_file, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('environment') != report['environment']:
+            print(f"⚠️ Taban çizgisi başka bir ortamda ölçülmüş ({baseline.get('environment')}); "
+                  f"süre ve bellek karşılaştırılmıyor (--save-baseline ile yeniden oluşturun)")
+            baseline = None
+    else:
+        print(f"⚠️ Taban çizgisi bulunamadı: {baseline_file}")
+
+    if baseline is not None and not args.imports_only:
+        if baseline.get('params') != report['params']:
+            print(f"⚠️ Taban çizgisi farklı ayarlarla ölçülmüş: {baseline.get('params')}")
+        regressions = compare_to_baseline(report, baseline)
+    else:
+        regressions = check_imports(report, baseline)
+    for name, metric, before, after, change in regressions:
+        if metric == 'loaded':
+            print(f"🔴 Gerileme: {name} açılışta yüklüyor: {', '.join(after)}")
+        else:
+            print(f"🔴 Gerileme: {name} {metric} {before} -> {after} (+%{change * 100:.0f})")
+    if regressions:
+        sys.exit(1)
+    if baseline is not None:
+        print("✅ Taban çizgisine göre gerileme yok")
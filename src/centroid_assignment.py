@@ -0,0 +1,69 @@
+"""
+Vektörel, parçalı en yakın merkez ataması.
+
+Eğitilmiş küme merkezleri ile büyük bir matrisin tüm satırlarını etiketler.
+Her parça için mesafeler tek bir float32 matris çarpımı (BLAS) ile
+||x||² - 2·x·c + ||c||² biçiminde hesaplanır; bellek kullanımı parça
+boyutuyla sınırlıdır ve parçalar iş parçacıklarına dağıtılabilir.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from threadpoolctl import threadpool_limits
+
+
+def _prepare_centers(centers):
+    centers = np.ascontiguousarray(centers, dtype=np.float32)
+    return centers, np.einsum('ij,ij->i', centers, centers)
+
+
+def _assign_block(block, centers, center_norms):
+    """Bir parçadaki satırlar için (etiket, mesafe) döndürür."""
+    block = np.asarray(block, dtype=np.float32)
+    scores = block @ centers.T
+    scores *= -2.0
+    scores += center_norms
+    labels = scores.argmin(axis=1).astype(np.int32)
+    nearest = scores[np.arange(len(block)), labels]
+    nearest += np.einsum('ij,ij->i', block, block)
+    np.maximum(nearest, 0.0, out=nearest)
+    return labels, np.sqrt(nearest)
+
+
+def assign_to_centroids(X, centers, chunksize=100_000, n_jobs=1):
+    """Her satırı en yakın merkeze atar.
+
+    Args:
+        X: (n, d) özellik matrisi; bellek eşlemeli olabilir, parça parça okunur.
+        centers: (k, d) küme merkezleri.
+        chunksize: Bir seferde işlenen satır sayısı.
+        n_jobs: Parçaları işleyen iş parçacığı sayısı (-1: tüm çekirdekler).
+            NumPy matris çarpımı sırasında GIL'i bıraktığı için iş parçacıkları
+            gerçekten paralel çalışır.
+
+    Returns:
+        (labels, distances) - int32 etiketler ve en yakın merkeze float32 Öklid mesafesi.
+    """
+    if n_jobs is None or n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+    centers, center_norms = _prepare_centers(centers)
+
+    n_rows = len(X)
+    labels = np.empty(n_rows, dtype=np.int32)
+    distances = np.empty(n_rows, dtype=np.float32)
+
+    def work(start):
+        stop = min(start + chunksize, n_rows)
+        labels[start:stop], distances[start:stop] = _assign_block(X[start:stop], centers, center_norms)
+
+    starts = range(0, n_rows, chunksize)
+    if n_jobs == 1:
+        for start in starts:
+            work(start)
+    else:
+        # Her iş parçacığı tek BLAS iş parçacığı kullanır (aşırı abonelik olmasın)
+        with threadpool_limits(limits=1), ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            list(executor.map(work, starts))
+    return labels, distances
@@ -0,0 +1,184 @@
+"""
+Küme kalitesi metrikleri.
+
+Tam silhouette skoru O(n²) mesafe hesabı gerektirir. Bu modül, zaman
+bütçesine göre seçilebilen metrikleri tek bir arayüzde toplar:
+
+- 'silhouette': scikit-learn ile tam silhouette (küçük veriler için)
+- 'silhouette_sampled': küme oranlarını koruyan (tabakalı) alt örneklemde tam silhouette
+- 'silhouette_chunked': karo karo hesaplanan, belleği sınırlı tam silhouette
+- 'simplified_silhouette': merkez tabanlı silhouette, O(n·k)
+- 'calinski_harabasz': O(n·k), yüksek daha iyi
+- 'davies_bouldin': O(n·k), düşük daha iyi
+"""
+
+import numpy as np
+from sklearn.metrics import calinski_harabasz_score, davies_bouldin_score, silhouette_score
+
+
+def _cluster_centers(X, labels, n_clusters):
+    """Etiketlere göre küme merkezlerini bincount ile hesaplar."""
+    counts = np.bincount(labels, minlength=n_clusters).astype(np.float64)
+    centers = np.empty((n_clusters, X.shape[1]), dtype=np.float64)
+    for j in range(X.shape[1]):
+        centers[:, j] = np.bincount(labels, weights=X[:, j], minlength=n_clusters)
+    return centers / np.maximum(counts, 1)[:, None]
+
+
+def _silhouette_values(a, b):
+    """a (küme içi) ve b (en yakın diğer küme) mesafelerinden silhouette değerleri."""
+    denominator = np.maximum(a, b)
+    return np.divide(b - a, denominator, out=np.zeros_like(a), where=denominator > 0)
+
+
+def stratified_sample_indices(labels, sample_size, random_state=42):
+    """Her kümeden büyüklüğüyle orantılı sayıda satır seçer."""
+    labels = np.asarray(labels)
+    if sample_size >= len(labels):
+        return np.arange(len(labels))
+
+    rng = np.random.default_rng(random_state)
+    indices = []
+    for cluster in np.unique(labels):
+        members = np.flatnonzero(labels == cluster)
+        # Silhouette için her kümeden en az iki nokta gerekir
+        size = max(2, int(round(sample_size * len(members) / len(labels))))
+        size = min(size, len(members))
+        indices.append(rng.choice(members, size=size, replace=False))
+    return np.sort(np.concatenate(indices))
+
+
+def silhouette_sampled(X, labels, sample_size=20000, random_state=42, **_):
+    """Tabakalı alt örneklem üzerinde tam silhouette skoru."""
+    indices = stratified_sample_indices(labels, sample_size, random_state)
+    return silhouette_score(X[indices], np.asarray(labels)[indices])
+
+
+def silhouette_chunked(X, labels, chunk_size=2000, **_):
+    """Blok blok hesaplanan, belleği sınırlı tam silhouette skoru.
+
+    Mesafeler (chunk_size × chunk_size) karolar halinde hesaplanır; bellekte
+    yalnızca bir karo ve satır bloğu başına (chunk_size × k) küme toplamları
+    tutulur, kullanım n'den bağımsızdır. Sütunlar kümeye göre sıralı okunur,
+    böylece bir karodaki küme toplamları `np.add.reduceat` ile alınır.
+    Üyesi olmayan küme kimlikleri yok sayılır (scikit-learn ile aynı).
+    """
+    # Kimlikler 0..k-1 aralığına sıkıştırılır; boş kümeler b hesabına girmez
+    _, labels = np.unique(np.asarray(labels), return_inverse=True)
+    labels = labels.ravel()
+    n_samples, n_clusters = len(labels), int(labels.max()) + 1
+    if not 2 <= n_clusters <= n_samples - 1:
+        raise ValueError(f"Silhouette için 2 ile {n_samples - 1} arasında küme gerekir: {n_clusters}")
+    counts = np.bincount(labels, minlength=n_clusters).astype(np.float64)
+
+    order = np.argsort(labels, kind='stable')
+    sorted_labels = labels[order]
+    squared_norms = np.empty(n_samples, dtype=np.float64)
+    for start in range(0, n_samples, chunk_size):
+        block = np.asarray(X[start:start + chunk_size], dtype=np.float64)
+        squared_norms[start:start + chunk_size] = np.einsum('ij,ij->i', block, block)
+    sorted_norms = squared_norms[order]
+
+    total = 0.0
+    for start in range(0, n_samples, chunk_size):
+        block = np.asarray(X[start:start + chunk_size], dtype=np.float64)
+        block_labels = labels[start:start + chunk_size]
+        rows = np.arange(len(block))
+
+        sums = np.zeros((len(block), n_clusters), dtype=np.float64)
+        for column_start in range(0, n_samples, chunk_size):
+            columns = slice(column_start, column_start + chunk_size)
+            tile = np.asarray(X[order[columns]], dtype=np.float64)
+            distances = block @ tile.T
+            distances *= -2.0
+            distances += squared_norms[start:start + chunk_size, None]
+            distances += sorted_norms[None, columns]
+            np.sqrt(np.maximum(distances, 0.0, out=distances), out=distances)
+
+            tile_labels = sorted_labels[columns]
+            boundaries = np.flatnonzero(np.r_[True, tile_labels[1:] != tile_labels[:-1]])
+            sums[:, tile_labels[boundaries]] += np.add.reduceat(distances, boundaries, axis=1)
+
+        own_counts = counts[block_labels]
+        a = np.divide(sums[rows, block_labels], own_counts - 1,
+                      out=np.zeros(len(block)), where=own_counts > 1)
+        means = sums / counts
+        means[rows, block_labels] = np.inf
+        b = means.min(axis=1)
+
+        values = _silhouette_values(a, b)
+        # Tek elemanlı kümelerin silhouette değeri 0 kabul edilir (scikit-learn ile aynı)
+        values[own_counts <= 1] = 0.0
+        total += values.sum()
+    return total / n_samples
+
+
+def simplified_silhouette(X, labels, centers=None, **_):
+    """Merkez tabanlı (basitleştirilmiş) silhouette, O(n·k)."""
+    labels = np.asarray(labels)
+    if centers is None:
+        centers = _cluster_centers(X, labels, labels.max() + 1)
+    centers = np.asarray(centers, dtype=np.float64)
+
+    distances = np.sqrt(np.maximum(
+        np.einsum('ij,ij->i', X, X)[:, None] - 2.0 * X @ centers.T
+        + np.einsum('ij,ij->i', centers, centers)[None, :], 0.0))
+    rows = np.arange(len(X))
+    a = distances[rows, labels]
+    distances[rows, labels] = np.inf
+    b = distances.min(axis=1)
+    return _silhouette_values(a, b).mean()
+
+
+def calinski_harabasz(X, labels, **_):
+    """Calinski-Harabasz skoru (yüksek daha iyi)."""
+    return calinski_harabasz_score(X, labels)
+
+
+def davies_bouldin(X, labels, **_):
+    """Davies-Bouldin skoru (düşük daha iyi)."""
+    return davies_bouldin_score(X, labels)
+
+
+def silhouette_exact(X, labels, **_):
+    """scikit-learn ile tam silhouette skoru."""
+    return silhouette_score(X, labels)
+
+
+# Metrik adı -> (fonksiyon, yüksek değer daha mı iyi, grafik etiketi)
+QUALITY_METRICS = {
+    'silhouette': (silhouette_exact, True, 'Silhouette Skoru'),
+    'silhouette_sampled': (silhouette_sampled, True, 'Silhouette Skoru (örneklem)'),
+    'silhouette_chunked': (silhouette_chunked, True, 'Silhouette Skoru'),
+    'simplified_silhouette': (simplified_silhouette, True, 'Basitleştirilmiş Silhouette'),
+    'calinski_harabasz': (calinski_harabasz, True, 'Calinski-Harabasz Skoru'),
+    'davies_bouldin': (davies_bouldin, False, 'Davies-Bouldin Skoru'),
+}
+
+
+def _metric(metric):
+    if metric not in QUALITY_METRICS:
+        raise ValueError(f"Bilinmeyen kalite metriği: {metric} (seçenekler: {list(QUALITY_METRICS)})")
+    return QUALITY_METRICS[metric]
+
+
+def score_clustering(X, labels, metric='silhouette', centers=None, **options):
+    """Seçilen metrik ile kümeleme kalitesini hesaplar.
+
+    `centers` yalnızca merkez tabanlı metrikler tarafından kullanılır; ek
+    seçenekler (ör. `sample_size`, `chunk_size`) ilgili fonksiyona iletilir.
+    """
+    function, _, _ = _metric(metric)
+    return float(function(X, labels, centers=centers, **options))
+
+
+def metric_label(metric):
+    """Metrik için grafik/rapor etiketi."""
+    return _metric(metric)[2]
+
+
+def select_optimal_k(scores, metric='silhouette', k_start=2):
+    """Skor listesinden metriğin yönüne göre en iyi K'yı seçer."""
+    _, higher_is_better, _ = _metric(metric)
+    best = np.argmax(scores) if higher_is_better else np.argmin(scores)
+    return int(best) + k_start
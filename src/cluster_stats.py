@@ -0,0 +1,170 @@
+"""
+Küme istatistikleri motoru.
+
+Küme özetleri (sayı, oran, ortalama, standart sapma, min/max ve yüzdelikler)
+etiket dizisi üzerinden `np.bincount` ile tek geçişte hesaplanır; küme başına
+boolean maske kopyası veya `groupby` yapılmaz. Üretilen tablo grafikler, trafik
+kalıbı yorumları ve kaydedilen JSON/Parquet raporu tarafından ortak kullanılır.
+
+Tablo küme indekslidir; sütunlar `count`, `share`, özellik başına
+`{özellik}_{istatistik}` (ör. `AVERAGE_SPEED_mean`, `AVERAGE_SPEED_q50`) ve
+yorum sütunu `pattern`'dir.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+STATS_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# Yüzdelik taslağının özellik başına kutu sayısı; hata en fazla bir kutu genişliğidir
+QUANTILE_BINS = 1024
+
+FEATURE_STATS = ('mean', 'std', 'min', 'max')
+
+
+def _quantile_column(q):
+    return f'q{round(q * 100):02d}'
+
+
+def _quantile_sketch(values, labels, n_clusters, quantiles, bins):
+    """Küme başına sabit kutulu histogramdan yüzdelikleri doğrusal aradeğerleme ile tahmin eder.
+
+    Eksik (NaN) değerler yok sayılır; hiç değeri olmayan (boş veya tamamen
+    eksik) kümelerin yüzdelikleri NaN olur.
+    """
+    estimates = np.full((n_clusters, len(quantiles)), np.nan)
+    valid = ~np.isnan(values)
+    if not valid.any():
+        return estimates
+    values, labels = values[valid], labels[valid]
+    lower, upper = values.min(), values.max()
+
+    width = (upper - lower) / bins or 1.0
+    bin_index = np.clip(((values - lower) / width).astype(np.int64), 0, bins - 1)
+    histogram = np.bincount(labels * bins + bin_index, minlength=n_clusters * bins)
+    cumulative = np.cumsum(histogram.reshape(n_clusters, bins), axis=1)
+
+    totals = cumulative[:, -1]
+    for cluster in np.flatnonzero(totals):
+        row = cumulative[cluster]
+        targets = np.asarray(quantiles) * totals[cluster]
+        position = np.searchsorted(row, targets, side='left')
+        previous = np.where(position > 0, row[np.maximum(position - 1, 0)], 0)
+        in_bin = row[position] - previous
+        fraction = np.where(in_bin > 0, (targets - previous) / np.maximum(in_bin, 1), 0.0)
+        estimates[cluster] = lower + (position + fraction) * width
+    return estimates
+
+
+def compute_cluster_stats(data, feature_columns, labels=None, n_clusters=None,
+                          quantiles=STATS_QUANTILES, bins=QUANTILE_BINS):
+    """Tüm küme ve özellikler için özet istatistikleri tek geçişte hesaplar.
+
+    Args:
+        data: Özellik sütunlarını içeren veri çerçevesi (orijinal birimler).
+        feature_columns: Özetlenecek sütunlar.
+        labels: Küme etiketleri; verilmezse `data['cluster']` kullanılır.
+        n_clusters: Küme sayısı; verilmezse etiketlerden çıkarılır.
+        quantiles: Tahmin edilecek yüzdelikler (histogram taslağı ile).
+        bins: Yüzdelik taslağının kutu sayısı.
+
+    Returns:
+        Küme indeksli istatistik tablosu (`pattern` sütunu dahil).
+    """
+    labels = np.asarray(data['cluster'] if labels is None else labels, dtype=np.int64)
+    n_clusters = n_clusters or int(labels.max()) + 1
+    counts = np.bincount(labels, minlength=n_clusters)
+    present = counts > 0
+
+    # Min/max için etiketler bir kez sıralanır; her küme ardışık bir dilim olur
+    order = np.argsort(labels, kind='stable')
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[present]
+
+    columns = {'count': counts, 'share': counts / max(len(labels), 1)}
+    for feature in feature_columns:
+        if feature not in data.columns:
+            continue
+        values = data[feature].to_numpy(np.float64)
+        # Sapma hesabında sayısal kaybı azaltmak için değerler genel ortalamaya göre kaydırılır
+        offset = values.mean() if len(values) else 0.0
+        shifted = values - offset
+        sums = np.bincount(labels, weights=shifted, minlength=n_clusters)
+        squares = np.bincount(labels, weights=shifted * shifted, minlength=n_clusters)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / counts
+            variances = np.maximum(squares / counts - means * means, 0.0) * counts / np.maximum(counts - 1, 1)
+        minimums = np.full(n_clusters, np.nan)
+        maximums = np.full(n_clusters, np.nan)
+        if present.any():
+            sorted_values = values[order]
+            minimums[present] = np.minimum.reduceat(sorted_values, starts)
+            maximums[present] = np.maximum.reduceat(sorted_values, starts)
+
+        columns[f'{feature}_mean'] = means + offset
+        columns[f'{feature}_std'] = np.sqrt(variances)
+        columns[f'{feature}_min'] = minimums
+        columns[f'{feature}_max'] = maximums
+        if quantiles:
+            estimates = _quantile_sketch(values, labels, n_clusters, quantiles, bins)
+            for j, q in enumerate(quantiles):
+                columns[f'{feature}_{_quantile_column(q)}'] = estimates[:, j]
+
+    stats = pd.DataFrame(columns, index=pd.RangeIndex(n_clusters, name='cluster'))
+    stats['pattern'] = [traffic_pattern(row) for _, row in stats.iterrows()]
+    return stats
+
+
+def feature_stat(stats, feature_columns, stat='mean'):
+    """Tablodan tek bir istatistiği küme × özellik tablosu olarak seçer."""
+    available = [col for col in feature_columns if f'{col}_{stat}' in stats.columns]
+    table = stats[[f'{col}_{stat}' for col in available]]
+    table.columns = available
+    return table
+
+
+def traffic_pattern(row):
+    """Küme ortalamalarından trafik kalıbını belirler."""
+    if 'AVERAGE_SPEED_mean' not in row:
+        return None
+    avg_speed = row['AVERAGE_SPEED_mean']
+    avg_vehicles = row.get('NUMBER_OF_VEHICLES_mean', 0)
+
+    if avg_speed < 30 and avg_vehicles > 150:
+        return "🔴 Yoğun-Sıkışık Trafik"
+    elif avg_speed > 50 and avg_vehicles < 100:
+        return "🟢 Akıcı-Düşük Yoğunluk"
+    elif 30 <= avg_speed <= 50:
+        return "🟡 Orta Yoğunluk Trafik"
+    return "⚪ Karma Trafik"
+
+
+def center_patterns(centers, feature_columns):
+    """Orijinal birimlerdeki küme merkezlerinden küme başına trafik kalıbını belirler.
+
+    KMeans merkezleri küme ortalamaları olduğundan `traffic_pattern` ile aynı
+    kurallar uygulanır; istatistik tablosu olmadan (ör. artımlı güncellemeden
+    sonra) kalıp eşlemesi üretmek için kullanılır.
+    """
+    return [traffic_pattern({f'{column}_mean': value for column, value in zip(feature_columns, center)})
+            for center in np.asarray(centers)]
+
+
+def save_cluster_report(stats, path):
+    """İstatistik tablosunu `<path>.json` ve `<path>.parquet` olarak kaydeder.
+
+    JSON çıktısı küme başına okunabilir bir sözlük listesidir; Parquet dosyası
+    tabloyu olduğu gibi saklar.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    records = json.loads(stats.reset_index().to_json(orient='records', force_ascii=False))
+    with open(f'{path}.json', 'w', encoding='utf-8') as f:
+        json.dump(records, f, ensure_ascii=False, indent=2)
+    stats.to_parquet(f'{path}.parquet')
+    print(f"💾 Küme raporu kaydedildi: {path}.json, {path}.parquet")
@@ -1,12 +1,26 @@
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
-from sklearn.cluster import KMeans
+from sklearn.cluster import KMeans, MiniBatchKMeans, kmeans_plusplus
 from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import silhouette_score
-import matplotlib.pyplot as plt
 import numpy as np
+from threadpoolctl import threadpool_limits
+
+from centroid_assignment import assign_to_centroids
+from cluster_quality import metric_label, score_clustering, stratified_sample_indices
+from compression import stratified_weighted_sample, weighted_sample
+from data_preprocessing import STREAM_SCALER_FILENAME, iter_processed_chunks
+from feature_matrix import attach_matrix, backing_file
+from ingestion import load_traffic_data
+from instrumentation import instrumented, record_metric
+from normalization import load_scaler, scaler_columns, transform_features
 
 def load_data(file_path):
-    data = pd.read_csv(file_path)
+    data = load_traffic_data(file_path)
     return data
 
 def preprocess_data(data):
@@ -16,52 +30,245 @@ def preprocess_data(data):
     scaled_features = scaler.fit_transform(features)
     return scaled_features
 
-def determine_optimal_clusters(data, max_k=6):
-    """1.7M veri için optimize edilmiş küme analizi."""
+# K taraması örneklem boyutu ve başlatma sayısı
+SWEEP_SAMPLE_SIZE = 200_000  # 200K ile küme analizi
+SWEEP_N_INIT = 5  # Hızlandırma için azaltıldı
+
+# K taraması için KMeans ayarları (büyük veri için hızlandırılmış)
+SWEEP_KMEANS_PARAMS = {
+    'max_iter': 200,  # Yeterli iterasyon
+    'tol': 1e-3,  # Gevşetilmiş tolerans
+    'algorithm': 'lloyd',  # 'auto' yerine 'lloyd' veya 'elkan' kullanılabilir
+}
+
+def _restart_init(data, k, seed, restart, sample_weight=None):
+    """`KMeans(random_state=seed, n_init>restart)` içindeki `restart`. başlatmanın merkezleri.
+
+    scikit-learn tüm başlatmalarda tek bir `RandomState(seed)` akışını sırayla
+    tüketir; aynı akış ortalaması çıkarılmış veride k-means++ ile yeniden
+    oynatılır. Böylece ayrı görevlerde koşan başlatmalar bölünmemiş
+    çalıştırmayla aynı başlangıç merkezlerini kullanır.
+    """
+    X = np.array(data, dtype=np.float32 if data.dtype == np.float32 else np.float64)
+    X -= X.mean(axis=0)
+    random_state = np.random.RandomState(seed)
+    for _ in range(restart + 1):
+        _, indices = kmeans_plusplus(X, k, sample_weight=sample_weight, random_state=random_state)
+    return np.asarray(data[indices])
+
+def _fit_candidate(source, k, seed, n_init, weight_source=None, restart=None):
+    """Tek bir K (veya `restart` verilirse tek bir başlatma) için KMeans eğitir.
+
+    İşçi süreçlerde çalışır; veri, paylaşılan `.npy` dosyasından kopyalanmadan
+    eşlenir. BLAS iş parçacıkları 1 ile sınırlanır ki süreçler çekirdekleri
+    birbirinden çalmasın.
+    """
+    data = attach_matrix(source)
+    sample_weight = attach_matrix(weight_source) if weight_source is not None else None
+    start = time.perf_counter()
+    with threadpool_limits(limits=1):
+        if restart is None:
+            kmeans = KMeans(n_clusters=k, random_state=seed, n_init=n_init, **SWEEP_KMEANS_PARAMS)
+        else:
+            init = _restart_init(data, k, seed, restart, sample_weight)
+            kmeans = KMeans(n_clusters=k, init=init, n_init=1, random_state=seed, **SWEEP_KMEANS_PARAMS)
+        kmeans.fit(data, sample_weight=sample_weight)
+    return kmeans.inertia_, kmeans.labels_, kmeans.cluster_centers_, time.perf_counter() - start
+
+def _score_candidate(source, labels, centers, metric, metric_options, score_index=None):
+    """Verilen etiketler için seçilen kalite metriğini hesaplar.
+
+    `score_index` verilirse metrik yalnızca (tekrarlı olabilen) bu satırlarda
+    hesaplanır; ağırlıklı örneklemde satırlar ağırlıkları kadar tekrarlanır.
+    """
+    data = attach_matrix(source)
+    if score_index is not None:
+        data, labels = data[score_index], labels[score_index]
+    start = time.perf_counter()
+    with threadpool_limits(limits=1):
+        score = score_clustering(data, labels, metric, centers=centers, **metric_options)
+    return score, time.perf_counter() - start
+
+def _run_sweep(source, k_values, n_init, n_jobs, split_n_init, metric, metric_options,
+               weight_source=None, score_index=None):
+    """K adaylarını sırayla veya süreç havuzunda eğitir; sonuçlar K sırasıyla döner."""
+    results = {}
+    if n_jobs == 1:
+        for k in k_values:
+            try:
+                inertia_val, labels, centers, fit_time = _fit_candidate(source, k, 42, n_init, weight_source)
+                score_val, score_time = _score_candidate(source, labels, centers, metric, metric_options,
+                                                         score_index)
+                results[k] = (inertia_val, score_val, fit_time, score_time)
+            except Exception as e:
+                results[k] = e
+                break
+        return results
+
+    # Başlatmalar ayrı görevlere bölünürse her K için n_init görev oluşur; her görev
+    # random_state=42 akışındaki kendi başlatmasını yeniden üretir (bkz. `_restart_init`)
+    restarts = list(range(n_init)) if split_n_init else [None]
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        fit_futures = {
+            (k, restart): executor.submit(_fit_candidate, source, k, 42, n_init, weight_source, restart)
+            for k in k_values for restart in restarts
+        }
+
+        best = {}
+        for k in k_values:
+            try:
+                fits = [fit_futures[(k, restart)].result() for restart in restarts]
+            except Exception as e:
+                best[k] = e
+                continue
+            inertia_val, labels, centers, _ = min(fits, key=lambda fit: fit[0])
+            # Başlatmalar paralel koştuğu için K'nın süresi en uzun başlatmadır
+            best[k] = (inertia_val, labels, centers, max(fit[3] for fit in fits))
+
+        score_futures = {
+            k: executor.submit(_score_candidate, source, fit[1], fit[2], metric, metric_options,
+                               score_index)
+            for k, fit in best.items() if not isinstance(fit, Exception)
+        }
+
+        for k in k_values:
+            if isinstance(best[k], Exception):
+                results[k] = best[k]
+                break
+            try:
+                score_val, score_time = score_futures[k].result()
+            except Exception as e:
+                results[k] = e
+                break
+            inertia_val, _, _, fit_time = best[k]
+            results[k] = (inertia_val, score_val, fit_time, score_time)
+    return results
+
+def _weighted_sweep_sample(data, sample_weight):
+    """Tekilleştirilmiş (ağırlıklı) veriden tarama örneklemini hazırlar.
+
+    Toplam ağırlık örneklem boyutunu aşıyorsa tekil satırlar ağırlıklarıyla
+    orantılı çekilir. Metrik için satırlar ağırlıkları kadar tekrarlanır
+    (gerekirse yine örneklem boyutuyla sınırlanır), böylece skor orijinal
+    satırlar üzerinden hesaplanmış gibi olur.
+
+    Returns:
+        (sample, weights, score_index)
+    """
+    sample_weight = np.asarray(sample_weight, dtype=np.float64)
+    if sample_weight.sum() > SWEEP_SAMPLE_SIZE:
+        indices, weights = weighted_sample(sample_weight, SWEEP_SAMPLE_SIZE)
+    else:
+        indices, weights = np.arange(len(data)), sample_weight
+    sample = np.asarray(data[indices])
+
+    if weights.sum() > SWEEP_SAMPLE_SIZE:
+        rng = np.random.default_rng(42)
+        score_index = np.sort(rng.choice(len(sample), size=SWEEP_SAMPLE_SIZE, p=weights / weights.sum()))
+    else:
+        score_index = np.repeat(np.arange(len(sample)), np.rint(weights).astype(np.int64))
+    return sample, weights, score_index
+
+@instrumented()
+def determine_optimal_clusters(data, max_k=6, n_jobs=1, split_n_init=False,
+                               metric='silhouette', metric_options=None, sample_weight=None):
+    """1.7M veri için optimize edilmiş küme analizi.
+
+    Args:
+        data: Ölçeklenmiş özellik matrisi.
+        max_k: Test edilecek en büyük küme sayısı (2..max_k).
+        n_jobs: Aynı anda çalışacak süreç sayısı; 1 ise sıralı çalışır,
+            -1 tüm çekirdekleri kullanır. Örneklem bir kez diske yazılır (veri
+            zaten `feature_matrix` dosyasıysa yazılmaz) ve işçiler tarafından
+            bellek eşlemeli okunur (her işçiye kopyalanmaz).
+        split_n_init: True ise her K'nın n_init başlatması da ayrı görevlerde koşar;
+            başlatmalar aynı `random_state=42` akışından üretildiğinden sonuç değişmez.
+        metric: `cluster_quality.QUALITY_METRICS` içinden kalite metriği; tam
+            silhouette O(n²) olduğundan büyük örneklemlerde 'silhouette_sampled'
+            veya O(n·k) metrikler tercih edilebilir.
+        metric_options: Metriğe iletilecek ek seçenekler (ör. {'sample_size': 20000}).
+        sample_weight: `data` tekilleştirilmiş satırlarsa her satırın tekrar sayısı
+            (bkz. `compression.compress_rows`); KMeans ağırlıklı eğitilir.
+
+    Returns:
+        (inertia, scores) - K=2'den başlayarak sıralı listeler; `scores` seçilen metriğe aittir.
+    """
     print(f"🔍 Kümeleme analizi başlıyor...")
     print(f"   📊 Tam veri boyutu: {data.shape}")
     print(f"   🎯 Test edilecek küme sayısı: 2-{max_k}")
     print(f"   ⚠️  Büyük veri nedeniyle kümeleme için örnekleme yapılıyor...")
     
     # Büyük veri için kümeleme analizi örneklemesi
-    sample_size = min(200000, len(data))  # 200K ile küme analizi
-    sample_indices = np.random.choice(len(data), size=sample_size, replace=False)
-    data_sample = data[sample_indices]
-    print(f"   ✓ {len(data_sample):,} veri noktası ile küme analizi yapılacak")
+    sample_weights = score_index = None
+    if sample_weight is not None:
+        data_sample, sample_weights, score_index = _weighted_sweep_sample(data, sample_weight)
+        print(f"   ✓ {len(data_sample):,} tekil vektör ({sample_weights.sum():,.0f} satır ağırlığı) "
+              f"ile küme analizi yapılacak")
+    else:
+        sample_size = min(SWEEP_SAMPLE_SIZE, len(data))
+        if sample_size < len(data):
+            # Sıralı indeksler bellek eşlemeli matriste ardışık okunur
+            sample_indices = np.sort(np.random.choice(len(data), size=sample_size, replace=False))
+            data_sample = data[sample_indices]
+        else:
+            data_sample = data
+        print(f"   ✓ {len(data_sample):,} veri noktası ile küme analizi yapılacak")
+    
+    if n_jobs is None or n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+    k_values = list(range(2, max_k + 1))
+    n_init = SWEEP_N_INIT
+    
+    metric_options = metric_options or {}
+    label = metric_label(metric)
+    print(f"   📐 Kalite metriği: {label}")
     
     inertia = []
-    silhouette_scores = []
-    
-    for k in range(2, max_k + 1):
-        print(f"   🔄 K={k} test ediliyor...", end="", flush=True)
-        try:
-            # Büyük veri için hızlandırılmış ayarlar
-            kmeans = KMeans(
-                n_clusters=k, 
-                random_state=42, 
-                n_init=5,  # Hızlandırma için azaltıldı
-                max_iter=200,  # Yeterli iterasyon
-                tol=1e-3,  # Gevşetilmiş tolerans
-                algorithm='lloyd'  # 'auto' yerine 'lloyd' veya 'elkan' kullanılabilir
-            )
-            kmeans.fit(data_sample)
-            
-            inertia_val = kmeans.inertia_
-            silhouette_val = silhouette_score(data_sample, kmeans.labels_)
-            
-            inertia.append(inertia_val)
-            silhouette_scores.append(silhouette_val)
-            
-            print(f" ✓ (Inertia: {inertia_val:.0f}, Silhouette: {silhouette_val:.3f})")
-            
-        except Exception as e:
-            print(f" ❌ Hata: {e}")
+    scores = []
+    
+    shared_dir = None
+    source, weight_source = data_sample, sample_weights
+    if n_jobs > 1:
+        print(f"   ⚙️  {n_jobs} süreç ile paralel tarama yapılıyor...")
+        shared_dir = tempfile.mkdtemp(prefix='kmeans_sweep_')
+        # Örneklem zaten dosya destekli matrisin tamamıysa işçiler onu doğrudan eşler
+        source = backing_file(data_sample)
+        if source is None:
+            source = os.path.join(shared_dir, 'sample.npy')
+            np.save(source, np.ascontiguousarray(data_sample, dtype=np.float32))
+        if sample_weights is not None:
+            weight_source = os.path.join(shared_dir, 'weights.npy')
+            np.save(weight_source, sample_weights)
+    
+    try:
+        results = _run_sweep(source, k_values, n_init, n_jobs, split_n_init, metric, metric_options,
+                             weight_source, score_index)
+    finally:
+        if shared_dir is not None:
+            shutil.rmtree(shared_dir, ignore_errors=True)
+    
+    for k in k_values:
+        if k not in results:
+            break
+        print(f"   🔄 K={k} test edildi...", end="")
+        if isinstance(results[k], Exception):
+            print(f" ❌ Hata: {results[k]}")
             break
+        inertia_val, score_val, fit_time, score_time = results[k]
+        inertia.append(inertia_val)
+        scores.append(score_val)
+        record_metric('sweep_k', k=k, inertia=float(inertia_val), score=float(score_val), metric=metric,
+                      fit_seconds=round(fit_time, 4), score_seconds=round(score_time, 4),
+                      rows=len(data_sample))
+        print(f" ✓ (Inertia: {inertia_val:.0f}, {label}: {score_val:.3f}, Süre: {fit_time + score_time:.1f}s)")
     
     print(f"✅ Kümeleme analizi tamamlandı!")
-    return inertia, silhouette_scores
+    return inertia, scores
 
 def plot_elbow_method(inertia):
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(10, 6))
     plt.plot(range(2, len(inertia) + 2), inertia, marker='o')
     plt.title('Elbow Method for Optimal k')
@@ -71,6 +278,8 @@ def plot_elbow_method(inertia):
     plt.show()
 
 def plot_silhouette_scores(silhouette_scores):
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(10, 6))
     plt.plot(range(2, len(silhouette_scores) + 2), silhouette_scores, marker='o')
     plt.title('Silhouette Scores for Optimal k')
@@ -79,27 +288,200 @@ def plot_silhouette_scores(silhouette_scores):
     plt.grid()
     plt.show()
 
-def perform_kmeans_clustering(data, n_clusters):
-    """1.7M veri için optimize edilmiş K-Means kümeleme."""
-    print(f"🔄 K-Means kümeleme başlıyor (K={n_clusters})...")
-    print(f"   📊 Tam veri boyutu: {data.shape}")
+# Mini-batch motorunun varsayılan ayarları
+MINIBATCH_PARAMS = {
+    'chunksize': 100_000,  # Diskten/bellek eşlemesinden bir seferde okunan satır
+    'batch_size': 10_000,  # Her partial_fit güncellemesindeki satır
+    'max_epochs': 10,  # Veri üzerinden en fazla geçiş sayısı
+    'tol': 1e-4,  # Merkez hareketi bu değerin altına inerse erken durdur
+}
+
+# Örneklemde eğit, tüm veriyi ata motorunun varsayılan ayarları
+SAMPLE_PARAMS = {
+    'sample_size': 200_000,  # Merkezlerin eğitileceği örneklem
+    'chunksize': 100_000,  # Atama sırasında bir seferde işlenen satır
+    'n_jobs': -1,  # Atama iş parçacığı sayısı
+    'compare_full_fit': False,  # True ise tam veri KMeans ile inertia farkı raporlanır
+}
+
+# Tam veri (ve örneklem) motorunun KMeans ayarları
+FULL_KMEANS_PARAMS = {
+    'random_state': 42,
+    'n_init': 5,  # Hızlandırma için
+    'max_iter': 300,
+    'tol': 1e-3,
+    'algorithm': 'lloyd',
+}
+
+def _full_kmeans(n_clusters):
+    """Tam veri motorunun KMeans modelini oluşturur."""
+    return KMeans(n_clusters=n_clusters, **FULL_KMEANS_PARAMS)
+
+def _sample_kmeans(data, n_clusters, strata=None, sample_size=200_000, chunksize=100_000,
+                   n_jobs=-1, compare_full_fit=False, sample_weight=None):
+    """Merkezleri (tabakalı) bir örneklemde eğitir, tüm veriyi parçalı olarak atar.
+
+    `strata` verilirse (ör. saat × haftanın günü kodu) örneklem her tabakadan
+    büyüklüğüyle orantılı seçilir. Rapor, örneklemdeki inertia'nın tüm veriye
+    ölçeklenmiş hali ile merkezlerin tüm verideki gerçek inertia'sı arasındaki
+    farkı, istenirse tam veri KMeans'e göre farkı da içerir.
+
+    `sample_weight` verilirse (tekilleştirilmiş satırlar) örneklem ağırlıklarla
+    orantılı çekilir; `strata` da verilirse (tekil satır başına, bkz.
+    `compression.unique_strata`) tabaka payları ağırlıklarla korunur.
+    """
+    n_rows = len(data)
+    sample_weights = None
+    if sample_weight is not None:
+        sample_weight = np.asarray(sample_weight, dtype=np.float64)
+        n_rows = sample_weight.sum()
+        if len(data) <= sample_size:
+            sample_indices, sample_weights = np.arange(len(data)), sample_weight
+        elif strata is not None:
+            sample_indices, sample_weights = stratified_weighted_sample(sample_weight, strata, sample_size)
+        else:
+            sample_indices, sample_weights = weighted_sample(sample_weight, sample_size)
+    elif strata is not None:
+        sample_indices = stratified_sample_indices(np.asarray(strata), sample_size)
+    else:
+        rng = np.random.default_rng(42)
+        sample_indices = np.sort(rng.choice(n_rows, size=min(sample_size, n_rows), replace=False))
+    sample = np.asarray(data[sample_indices], dtype=np.float32)
+    print(f"   🎯 {len(sample):,} satırlık örneklemde merkezler eğitiliyor...")
+    
+    kmeans = _full_kmeans(n_clusters)
+    kmeans.fit(sample, sample_weight=sample_weights)
+    
+    print(f"   🧮 {len(data):,} satır en yakın merkeze atanıyor...")
+    labels, distances = assign_to_centroids(data, kmeans.cluster_centers_, chunksize=chunksize, n_jobs=n_jobs)
+    
+    squared = np.square(distances, dtype=np.float64)
+    full_inertia = float(squared @ sample_weight if sample_weight is not None else squared.sum())
+    sample_total = sample_weights.sum() if sample_weights is not None else len(sample)
+    expected_inertia = kmeans.inertia_ * n_rows / sample_total
+    print(f"   📏 Inertia (örneklemden ölçeklenmiş): {expected_inertia:.0f}, "
+          f"tüm veride: {full_inertia:.0f} (fark: %{(full_inertia / expected_inertia - 1) * 100:+.2f})")
+    
+    if compare_full_fit:
+        print(f"   ⏳ Karşılaştırma için tam veri KMeans eğitiliyor...")
+        reference = _full_kmeans(n_clusters).fit(data, sample_weight=sample_weight)
+        print(f"   📏 Tam veri KMeans inertia: {reference.inertia_:.0f} "
+              f"(örneklem merkezlerinin farkı: %{(full_inertia / reference.inertia_ - 1) * 100:+.2f})")
+    
+    return labels, kmeans.cluster_centers_
+
+def _iter_scaled_chunks(data, chunksize, scaler=None, rng=None):
+    """Ölçeklenmiş özellik matrisini float32 parçalar halinde üretir.
+
+    `data` bir dizi (bellek eşlemeli olabilir) ise dilimlenir; bir klasör/dosya
+    yolu ise işlenmiş Parquet veri seti parça parça okunup ölçekleyici ile
+    dönüştürülür. `rng` verilirse parçaların (Parquet'te satır gruplarının)
+    sırası karıştırılır.
+    """
+    if isinstance(data, str):
+        if scaler is None:
+            scaler = load_scaler(os.path.join(data, STREAM_SCALER_FILENAME))
+        for frame in iter_processed_chunks(data, scaler_columns(scaler), chunksize, rng):
+            yield transform_features(frame, scaler)
+        return
+
+    starts = np.arange(0, len(data), chunksize)
+    if rng is not None:
+        starts = rng.permutation(starts)
+    for start in starts:
+        yield np.asarray(data[start:start + chunksize], dtype=np.float32)
+
+def _minibatch_kmeans(data, n_clusters, scaler=None, chunksize=100_000, batch_size=10_000,
+                      max_epochs=10, tol=1e-4):
+    """Veriyi parça parça akıtarak MiniBatchKMeans eğitir ve etiketler.
+
+    Tam matris hiçbir zaman belleğe alınmaz. Her geçişin (epoch) sonunda
+    merkezlerin en büyük yer değiştirmesi `tol` altına inerse eğitim durur.
+    """
+    rng = np.random.default_rng(42)
+    kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=42, batch_size=batch_size)
+
+    previous_centers = None
+    for epoch in range(1, max_epochs + 1):
+        for chunk in _iter_scaled_chunks(data, chunksize, scaler, rng):
+            chunk = chunk[rng.permutation(len(chunk))]
+            for start in range(0, len(chunk), batch_size):
+                batch = chunk[start:start + batch_size]
+                # İlk güncelleme k-means++ başlatması için en az K satır ister
+                if not hasattr(kmeans, 'cluster_centers_') and len(batch) < n_clusters:
+                    continue
+                kmeans.partial_fit(batch)
+
+        centers = kmeans.cluster_centers_.copy()
+        if previous_centers is not None:
+            shift = np.sqrt(((centers - previous_centers) ** 2).sum(axis=1)).max()
+            print(f"   🔁 Geçiş {epoch}: en büyük merkez hareketi {shift:.5f}")
+            if shift < tol:
+                print(f"   ✓ Merkezler yakınsadı, erken durduruldu")
+                break
+        previous_centers = centers
+
+    # Etiketler ikinci bir akış ile, veri sırası korunarak atanır
+    labels = [kmeans.predict(chunk) for chunk in _iter_scaled_chunks(data, chunksize, scaler)]
+    return np.concatenate(labels).astype(np.int32), kmeans.cluster_centers_
+
+@instrumented()
+def perform_kmeans_clustering(data, n_clusters, engine='kmeans', scaler=None, strata=None,
+                              return_centers=False, sample_weight=None, **engine_options):
+    """1.7M veri için optimize edilmiş K-Means kümeleme.
+
+    Args:
+        data: Ölçeklenmiş özellik matrisi; 'minibatch' motoru için işlenmiş
+            Parquet veri setinin yolu da verilebilir.
+        n_clusters: Küme sayısı.
+        engine: 'kmeans' (tam veri, Lloyd), 'minibatch' (parça parça
+            partial_fit, tam matris belleğe alınmaz) veya 'sample' (örneklemde
+            eğit, tüm veriyi parçalı en yakın merkez ile ata).
+        scaler: Yol verildiğinde parçaları ölçeklemek için kullanılır; verilmezse
+            veri setinin yanındaki ölçekleyici yüklenir.
+        strata: 'sample' motorunda tabakalı örnekleme için satır başına tabaka kodu.
+        return_centers: True ise küme merkezleri de döndürülür.
+        sample_weight: `data` tekilleştirilmiş satırlarsa her satırın tekrar sayısı
+            ('kmeans' ve 'sample' motorları); etiketler tekil satırlar içindir ve
+            `compression.expand_labels` ile tüm satırlara dağıtılır.
+        **engine_options: Motor ayarları (bkz. `MINIBATCH_PARAMS`, `SAMPLE_PARAMS`).
+
+    Returns:
+        Her satır için küme etiketi dizisi; `return_centers` ise (etiketler, merkezler).
+    """
+    print(f"🔄 K-Means kümeleme başlıyor (K={n_clusters}, motor: {engine})...")
+    if not isinstance(data, str):
+        print(f"   📊 Tam veri boyutu: {data.shape}")
+    
+    if engine == 'minibatch':
+        if sample_weight is not None:
+            raise ValueError("'minibatch' motoru sample_weight desteklemiyor; 'kmeans' veya 'sample' kullanın")
+        options = {**MINIBATCH_PARAMS, **engine_options}
+        print(f"   📦 Parça boyutu: {options['chunksize']:,}, en fazla {options['max_epochs']} geçiş")
+        labels, centers = _minibatch_kmeans(data, n_clusters, scaler=scaler, **options)
+        print(f"✅ Mini-batch kümeleme tamamlandı! ({len(labels):,} satır)")
+        return (labels, centers) if return_centers else labels
+    
+    if engine == 'sample':
+        options = {**SAMPLE_PARAMS, **engine_options}
+        labels, centers = _sample_kmeans(data, n_clusters, strata=strata, sample_weight=sample_weight,
+                                         **options)
+        print(f"✅ Örneklem tabanlı kümeleme tamamlandı! ({len(labels):,} satır)")
+        return (labels, centers) if return_centers else labels
+    
+    if engine != 'kmeans':
+        raise ValueError(f"Bilinmeyen kümeleme motoru: {engine} (seçenekler: 'kmeans', 'minibatch', 'sample')")
+    
     print(f"   ⏳ Bu işlem 10-15 dakika sürebilir...")
     
     # 1.7M veri için optimizasyon ayarları
-    kmeans = KMeans(
-        n_clusters=n_clusters, 
-        random_state=42, 
-        n_init=5,  # Hızlandırma için
-        max_iter=300,
-        tol=1e-3,
-        algorithm='auto'  # En uygun algoritmayı seçer
-    )
+    kmeans = _full_kmeans(n_clusters)
     
     # Tam veri ile kümeleme
-    labels = kmeans.fit_predict(data)
+    labels = kmeans.fit_predict(data, sample_weight=sample_weight)
     
     print(f"✅ 1.7M veri ile kümeleme tamamlandı!")
-    return labels
+    return (labels, kmeans.cluster_centers_) if return_centers else labels
 
 # Örnek kullanım
 if __name__ == "__main__":
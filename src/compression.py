@@ -0,0 +1,112 @@
+"""
+Özellik vektörlerinin tekilleştirilmesi (ağırlıklı kümeleme için).
+
+Kümeleme matrisi çoğunlukla küçük tamsayılardan (hız, araç sayısı, saat,
+gün) oluştuğu için 1.7M satırın büyük kısmı aynı vektörü paylaşır. Aynı
+(veya isteğe bağlı olarak yuvarlanmış) satırlar tek satıra indirilir ve
+tekrar sayısı `sample_weight` olarak kullanılır. Ağırlıklı KMeans, tüm
+satırlarla yapılan KMeans ile aynı amaç fonksiyonunu optimize eder; etiketler
+ters indeks ile tüm satırlara geri dağıtılır.
+"""
+
+import numpy as np
+
+
+def unique_row_groups(values):
+    """Aynı satırları gruplar (`np.unique(values, axis=0)` karşılığı, çok daha hızlı).
+
+    Her satır tek bir bayt dizisi olarak görülür; bu nedenle bayt düzeyinde
+    eşit olmayan değerler (ör. -0.0 ve 0.0) ayrı gruplanır.
+
+    Returns:
+        (first_index, inverse, counts) - her grubun ilk satırı, her satırın grup
+        indeksi ve grup büyüklükleri.
+    """
+    values = np.ascontiguousarray(values)
+    row_view = values.view(np.dtype((np.void, values.dtype.itemsize * values.shape[1]))).ravel()
+    _, first_index, inverse, counts = np.unique(row_view, return_index=True,
+                                                return_inverse=True, return_counts=True)
+    return first_index, inverse.ravel().astype(np.int64), counts
+
+
+def compress_rows(X, decimals=None):
+    """Aynı satırları tekilleştirir.
+
+    Args:
+        X: (n, d) özellik matrisi.
+        decimals: Verilirse satırlar önce bu ondalık basamağa yuvarlanır
+            (yakın vektörler birleşir, sonuç yaklaşık olur).
+
+    Returns:
+        (unique_rows, counts, inverse) - float32 tekil satırlar, float64 tekrar
+        sayıları ve her orijinal satırın tekil satır indeksi (`unique_rows[inverse]`
+        orijinal matrisi verir).
+    """
+    values = np.ascontiguousarray(X, dtype=np.float32)
+    if decimals is not None:
+        values = np.round(values, decimals)
+    # -0.0 ile 0.0 bayt düzeyinde farklı olduğundan eşitlenir (girdi matrisi
+    # salt okunur bir bellek eşlemesi olabileceğinden yerinde yapılmaz)
+    values = values + np.float32(0.0)
+
+    first_index, inverse, counts = unique_row_groups(values)
+
+    unique_rows = values[first_index]
+    print(f"🗜️  {len(values):,} satır -> {len(unique_rows):,} tekil vektör "
+          f"(%{len(unique_rows) / max(len(values), 1) * 100:.1f})")
+    return unique_rows, counts.astype(np.float64), inverse
+
+
+def expand_labels(labels, inverse):
+    """Tekil satırların etiketlerini tüm satırlara dağıtır."""
+    return np.asarray(labels)[inverse]
+
+
+def weighted_sample(weights, size, random_state=42):
+    """Ağırlıklarla orantılı (iadeli) örneklem çeker ve tekrar sayılarına indirger.
+
+    Tekil satırlardan çekilen örneklem, orijinal satırlardan çekilen düzgün
+    örneklemle aynı dağılıma sahiptir.
+
+    Returns:
+        (indices, counts) - seçilen tekil satırlar ve örneklemdeki tekrar sayıları.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    rng = np.random.default_rng(random_state)
+    draws = rng.choice(len(weights), size=size, replace=True, p=weights / weights.sum())
+    indices, counts = np.unique(draws, return_counts=True)
+    return indices, counts.astype(np.float64)
+
+
+def unique_strata(strata, inverse, n_unique):
+    """Her tekil satıra ilk geçtiği orijinal satırın tabaka kodunu verir.
+
+    Kümeleme özellikleri saat ve haftanın gününü içerdiğinde aynı vektörü
+    paylaşan satırlar zaten aynı tabakadadır.
+    """
+    inverse = np.asarray(inverse)
+    first = np.empty(n_unique, dtype=np.int64)
+    # Ters sırayla yazıldığından her tekil satırda en son yazılan ilk geçiştir
+    first[inverse[::-1]] = np.arange(len(inverse) - 1, -1, -1)
+    return np.asarray(strata)[first]
+
+
+def stratified_weighted_sample(weights, strata, size, random_state=42):
+    """Her tabakadan toplam ağırlığıyla orantılı, tabaka içinde ağırlıklı örneklem çeker.
+
+    Returns:
+        (indices, counts) - `weighted_sample` ile aynı biçimde.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    strata = np.asarray(strata)
+    rng = np.random.default_rng(random_state)
+    total = weights.sum()
+    draws = []
+    for stratum in np.unique(strata):
+        members = np.flatnonzero(strata == stratum)
+        member_weights = weights[members]
+        stratum_size = max(1, int(round(size * member_weights.sum() / total)))
+        draws.append(rng.choice(members, size=stratum_size, replace=True,
+                                p=member_weights / member_weights.sum()))
+    indices, counts = np.unique(np.concatenate(draws), return_counts=True)
+    return indices, counts.astype(np.float64)
@@ -1,12 +1,32 @@
+import os
+
 import pandas as pd
-from sklearn.preprocessing import StandardScaler
 import numpy as np
 
-def load_data(file_path):
-    """1.7M veri setini yükler."""
+from ingestion import load_traffic_data, read_csv_typed
+from instrumentation import instrumented, track
+from month_partitions import DEFAULT_DATASET_DIR, ingest_months, list_months, load_months
+from normalization import fit_scaler, make_scaler, save_scaler
+from time_features import add_calendar_features, parse_timestamps
+
+# Parçalı ön işlemede ölçekleyicinin veri seti klasöründeki adı
+# (`_` önekli dosyalar Parquet okuyucuları tarafından atlanır)
+STREAM_SCALER_FILENAME = '_scaler.joblib'
+
+TIME_FEATURE_COLUMNS = ['hour', 'day_of_week', 'month', 'is_weekend']
+
+# Kümeleme özellikleri: ana trafik ölçümleri ve zaman bilgisi
+CLUSTER_FEATURE_COLUMNS = [
+    'AVERAGE_SPEED', 'NUMBER_OF_VEHICLES', 'MINIMUM_SPEED', 'MAXIMUM_SPEED',
+    'hour', 'day_of_week',
+]
+
+def load_data(file_path, use_cache=True):
+    """1.7M veri setini ortak şema ve sütunsal önbellek ile yükler."""
     print("📥 Büyük veri dosyası yükleniyor...")
-    return pd.read_csv(file_path)
+    return load_traffic_data(file_path, use_cache=use_cache)
 
+@instrumented()
 def clean_data(df):
     """1.7M veri temizleme işlemlerini gerçekleştirir."""
     print(f"🧹 Temizleme öncesi: {df.shape}")
@@ -28,6 +48,7 @@ def clean_data(df):
     print(f"✅ Temizleme sonrası: {df.shape}")
     return df
 
+@instrumented()
 def extract_features(df):
     """1.7M veri için özellik çıkarımı yapar."""
     print("🔧 Özellik çıkarımı yapılıyor...")
@@ -35,16 +56,23 @@ def extract_features(df):
     # Tarih/saat sütunları varsa işle
     date_columns = [col for col in df.columns if 'date' in col.lower() or 'time' in col.lower()]
     
+    # Takvim özellikleri tek bir ana sütundan, benzersiz zaman damgaları
+    # üzerinden bir kez hesaplanır (diğer sütunlar yalnızca ayrıştırılır)
+    primary_column = 'DATE_TIME' if 'DATE_TIME' in date_columns else None
+    
     for col in date_columns:
         try:
             print(f"   📅 {col} sütunu işleniyor...")
-            df[col] = pd.to_datetime(df[col])
-            df['hour'] = df[col].dt.hour
-            df['day_of_week'] = df[col].dt.dayofweek
-            df['month'] = df[col].dt.month
-            df['is_weekend'] = df['day_of_week'].isin([5, 6]).astype(int)
-            print(f"   ✓ {col} sütunundan zaman özellikleri çıkarıldı")
+            if primary_column is None:
+                primary_column = col
+            if col == primary_column:
+                add_calendar_features(df, col, features=TIME_FEATURE_COLUMNS)
+                print(f"   ✓ {col} sütunundan zaman özellikleri çıkarıldı")
+            else:
+                df[col] = parse_timestamps(df[col])
         except Exception as e:
+            if col == primary_column:
+                primary_column = None
             print(f"   ⚠️ {col} sütunu işlenemedi: {e}")
     
     # Sayısal sütunları kontrol et
@@ -53,26 +81,49 @@ def extract_features(df):
     
     return df
 
-def normalize_features(df):
-    """1.7M veri için özellikleri normalize eder."""
-    print("🔧 Normalizasyon yapılıyor...")
+def select_feature_columns(df):
+    """Kümeleme için kullanılacak özellik sütunlarını (mevcut olanları) seçer."""
+    return [col for col in CLUSTER_FEATURE_COLUMNS if col in df.columns]
+
+@instrumented()
+def normalize_features(df, feature_columns=None, method='standard', scaler_path=None, return_scaler=False):
+    """1.7M veri için normalizasyon parametrelerini hesaplar.
+
+    Sütun başına ölçek parametreleri bir kez hesaplanıp (isteğe bağlı olarak)
+    diske kaydedilir; veri çerçevesi orijinal birimlerde kalır ve kopya
+    sütun oluşturulmaz. Ölçeklenmiş matris `normalization.transform_features`
+    ile, orijinal değerler ise `normalization.inverse_transform_column` ile
+    gerektiğinde üretilir.
+
+    Returns:
+        df; `return_scaler=True` ise (df, scaler).
+    """
+    print("🔧 Normalizasyon parametreleri hesaplanıyor...")
     
-    numeric_columns = df.select_dtypes(include=[np.number]).columns
+    if feature_columns is None:
+        feature_columns = select_feature_columns(df)
+    if len(feature_columns) == 0:
+        print("⚠️ Normalize edilecek özellik bulunamadı")
+        return (df, None) if return_scaler else df
     
-    # Orijinal değerleri koru
-    for col in numeric_columns:
-        if col not in ['hour', 'day_of_week', 'month', 'is_weekend']:
-            df[f'{col}_original'] = df[col].copy()
+    scaler = fit_scaler(df, feature_columns, method=method)
+    if scaler_path is not None:
+        save_scaler(scaler, scaler_path)
     
-    print("✅ Normalizasyon tamamlandı")
-    return df
+    print(f"✅ Normalizasyon tamamlandı ({method}): {feature_columns}")
+    return (df, scaler) if return_scaler else df
+
+def preprocess_data(file_path, scaler_path=None):
+    """1.7M veri ön işleme adımlarını gerçekleştirir.
 
-def preprocess_data(file_path):
-    """1.7M veri ön işleme adımlarını gerçekleştirir."""
+    `scaler_path` verilirse eğitilen ölçekleyici bu yola kaydedilir.
+    """
     print("=== 1.7M Veri Ön İşleme Başlıyor ===")
     
     # Veri yükleme
-    df = load_data(file_path)
+    with track('load_data') as record:
+        df = load_data(file_path)
+        record['rows'] = len(df)
     print(f"📊 Yüklenen veri boyutu: {df.shape}")
     print(f"📋 Sütunlar: {list(df.columns)}")
     
@@ -83,11 +134,165 @@ def preprocess_data(file_path):
     df = extract_features(df)
     
     # Normalizasyon
-    df = normalize_features(df)
+    df = normalize_features(df, scaler_path=scaler_path)
     
     print("=== 1.7M Veri Ön İşleme Tamamlandı ===")
     return df
 
+def preprocess_months(pattern, dataset_dir=DEFAULT_DATASET_DIR, months=None, hours=None,
+                      scaler_path=None, max_workers=None):
+    """Birden fazla aylık dosyayı paralel ön işler ve birlikte yükler.
+
+    Desene uyan dosyalar işçi süreçlerde temizlenip ay bölümlü veri setine
+    yazılır (bkz. month_partitions.py; güncel bölümler atlanır), ardından
+    istenen ay/saatler filtrelenerek yüklenir ve ölçekleyici tüm aylar
+    üzerinde eğitilir. Yalnızca desene uyan dosyaların ayları okunur;
+    veri setinde önceki çalıştırmalardan kalan diğer aylar analize girmez.
+    """
+    print("=== Çok Aylı Veri Ön İşleme Başlıyor ===")
+    
+    with track('ingest_months') as record:
+        summary = ingest_months(pattern, dataset_dir, max_workers=max_workers)
+        record['rows'] = int(summary['rows_read'].sum())
+    
+    ingested = sorted(int(month) for month in summary['month'])
+    if months is None:
+        months = ingested
+    else:
+        requested = {int(month) for month in months}
+        missing = sorted(requested - set(ingested))
+        if missing:
+            print(f"⚠️ İstenen aylar desene uyan dosyalarda yok, atlanıyor: {missing}")
+        months = [month for month in ingested if month in requested]
+        if not months:
+            raise ValueError(f"İstenen aylar desene uyan dosyalarda yok: {missing}")
+    stale = sorted(set(list_months(dataset_dir)) - set(ingested))
+    if stale:
+        print(f"ℹ️ Veri setindeki desen dışı aylar yüklenmiyor: {stale}")
+    
+    with track('load_months') as record:
+        df = load_months(dataset_dir, months=months, hours=hours)
+        record['rows'] = len(df)
+    print(f"📊 Yüklenen veri boyutu: {df.shape} ({df['year_month'].nunique()} ay)")
+    
+    df = normalize_features(df, scaler_path=scaler_path)
+    
+    print("=== Çok Aylı Veri Ön İşleme Tamamlandı ===")
+    return df
+
+def _drop_seen_rows(hashes, seen):
+    """Parça içi ve önceki parçalarda görülmüş satırları eleyen maskeyi döndürür."""
+    # Parça içinde ilk görüleni tut (drop_duplicates ile aynı davranış)
+    _, first_index = np.unique(hashes, return_index=True)
+    keep = np.zeros(len(hashes), dtype=bool)
+    keep[first_index] = True
+
+    # Önceki parçalarda görülenleri ele (seen sıralı tutulur)
+    if len(seen) > 0:
+        positions = np.searchsorted(seen, hashes)
+        positions[positions == len(seen)] = 0
+        keep &= seen[positions] != hashes
+    return keep
+
+def _merge_seen(seen, hashes):
+    """Yeni özetleri sıralı `seen` dizisine sıralı kalacak şekilde ekler.
+
+    Yalnızca yeni parça (m satır) sıralanır; ekleme konumları ikili aramayla
+    bulunur ve `np.insert` tek kopyada birleştirir: O(m log m + N).
+    """
+    hashes = np.sort(hashes)
+    return np.insert(seen, np.searchsorted(seen, hashes), hashes)
+
+def preprocess_data_streaming(file_path, output_dir, chunksize=500_000, key_columns=None,
+                              method='standard'):
+    """Büyük veriyi parça parça işleyerek bölümlenmiş Parquet veri setine yazar.
+
+    Her parçada eksik değerler atılır, parçalar arası duplikeler satır özetleri
+    (hash) ile elenir, zaman özellikleri çıkarılır ve ölçekleyici istatistikleri
+    tek geçişte güncellenir. Bellek kullanımı parça boyutuyla sınırlıdır; tek
+    istisna girdiyle büyüyen duplike özet kümesidir (benzersiz satır başına
+    8 bayt, ör. 100M satır için ~800 MB).
+
+    Args:
+        file_path: Ham CSV dosyası.
+        output_dir: `part-*.parquet` dosyalarının ve ölçekleyicinin
+            (`STREAM_SCALER_FILENAME`) yazılacağı klasör.
+        chunksize: Her parçadaki satır sayısı.
+        key_columns: Duplike tespitinde kullanılacak sütunlar (ör. DATE_TIME, GEOHASH);
+            verilmezse tüm sütunlar kullanılır.
+        method: Normalizasyon yöntemi ('standard' veya 'minmax').
+
+    Returns:
+        Kümeleme özellikleri üzerinde parça parça eğitilmiş ölçekleyici.
+    """
+    print("=== Parçalı (streaming) Veri Ön İşleme Başlıyor ===")
+    os.makedirs(output_dir, exist_ok=True)
+    for name in os.listdir(output_dir):
+        if name.startswith('part-') and name.endswith('.parquet'):
+            os.remove(os.path.join(output_dir, name))
+
+    seen = np.empty(0, dtype=np.uint64)
+    scaler = make_scaler(method)
+    feature_columns = None
+    total_rows = missing_removed = duplicates_removed = written_rows = 0
+
+    # Ölçüm aşama düzeyinde tutulur; parça başına çağrılan fonksiyonlar ayrı kayıt üretmez
+    with track('preprocess_streaming', children=False) as record:
+        for part, chunk in enumerate(read_csv_typed(file_path, chunksize=chunksize)):
+            total_rows += len(chunk)
+
+            size = len(chunk)
+            chunk = chunk.dropna()
+            missing_removed += size - len(chunk)
+
+            keys = chunk[key_columns] if key_columns else chunk
+            hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+            keep = _drop_seen_rows(hashes, seen)
+            duplicates_removed += int((~keep).sum())
+            chunk = chunk[keep]
+            seen = _merge_seen(seen, hashes[keep])
+
+            if len(chunk) == 0:
+                continue
+
+            chunk = extract_features(chunk)
+
+            if feature_columns is None:
+                feature_columns = select_feature_columns(chunk)
+            scaler.partial_fit(chunk[feature_columns])
+
+            chunk.to_parquet(os.path.join(output_dir, f'part-{part:05d}.parquet'), index=False)
+            written_rows += len(chunk)
+            print(f"   ✓ Parça {part}: {total_rows:,} satır okundu, {written_rows:,} satır yazıldı")
+        record['rows'] = total_rows
+
+    save_scaler(scaler, os.path.join(output_dir, STREAM_SCALER_FILENAME))
+
+    print(f"🔍 {missing_removed:,} eksik değerli, {duplicates_removed:,} duplike kayıt silindi")
+    print(f"=== Parçalı Ön İşleme Tamamlandı: {written_rows:,} satır -> {output_dir} ===")
+    return scaler
+
+def iter_processed_chunks(path, columns=None, chunksize=100_000, rng=None):
+    """İşlenmiş (bölümlenmiş Parquet) veri setini parça parça okur.
+
+    Tüm veri belleğe alınmaz; her seferde en fazla `chunksize` satırlık bir
+    DataFrame döndürülür. `rng` verilirse dosyalar satır grubu düzeyinde
+    bölünür ve satır gruplarının okunma sırası karıştırılır (zaman sıralı
+    dosyalarda her geçiş farklı sırayla okunur).
+    """
+    import pyarrow.dataset as ds
+    dataset = ds.dataset(path, format='parquet')
+    if rng is None:
+        batches = dataset.to_batches(columns=columns, batch_size=chunksize)
+    else:
+        row_groups = [group for fragment in dataset.get_fragments()
+                      for group in fragment.split_by_row_group()]
+        batches = (batch for index in rng.permutation(len(row_groups))
+                   for batch in row_groups[index].to_batches(columns=columns, batch_size=chunksize))
+    for batch in batches:
+        if batch.num_rows > 0:
+            yield batch.to_pandas()
+
 def save_processed_data(df, output_path):
     """1.7M işlenmiş veriyi kaydeder."""
     print(f"💾 Büyük veri kaydediliyor: {output_path}")
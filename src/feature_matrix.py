@@ -0,0 +1,72 @@
+"""
+Paylaşılan, bellek eşlemeli ölçeklenmiş özellik matrisi.
+
+Ölçeklenmiş matris bir kez, parça parça ve doğrudan diskteki bir `.npy`
+dosyasına float32 ve C sıralı (satır bitişik) olarak yazılır; ardından salt
+okunur bellek eşlemesi (memory-map) olarak açılır. K taraması, son kümeleme,
+parçalı merkez ataması, PCA ve silhouette aynı eşlemeyi kopyalamadan okur.
+Veri işletim sisteminin sayfa önbelleğinde tek kopya olarak durur.
+
+İşçi süreçlere dizinin kendisi değil dosya yolu (`shared_source`) verilir;
+işçiler `attach_matrix` ile aynı dosyayı eşler, veri serileştirilmez.
+"""
+
+import os
+
+import numpy as np
+
+from normalization import scaler_columns, transform_features
+
+DEFAULT_MATRIX_PATH = 'data/processed/features.npy'
+BUILD_CHUNK_ROWS = 1_000_000
+
+
+def build_feature_matrix(df, scaler, path=DEFAULT_MATRIX_PATH, chunksize=BUILD_CHUNK_ROWS):
+    """Ölçeklenmiş özellik matrisini dosyaya yazar ve salt okunur eşlemesini döndürür.
+
+    Her seferde yalnızca `chunksize` satırlık bir float32 parça bellekte
+    tutulur. Dosya geçici adla yazılıp yerine taşınır; böylece eski dosyayı
+    eşleyen okuyucular (ör. checkpoint bağlantıları) etkilenmez.
+    """
+    columns = scaler_columns(scaler)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    temporary_path = f'{path}.tmp.npy'
+    matrix = np.lib.format.open_memmap(temporary_path, mode='w+', dtype=np.float32,
+                                       shape=(len(df), len(columns)))
+    for start in range(0, len(df), chunksize):
+        matrix[start:start + chunksize] = transform_features(df.iloc[start:start + chunksize], scaler)
+    matrix.flush()
+    del matrix
+    os.replace(temporary_path, path)
+    return attach_matrix(path)
+
+
+def attach_matrix(source):
+    """Dizi ise kendisini, dosya yolu ise salt okunur bellek eşlemesini döndürür."""
+    if isinstance(source, str):
+        return np.load(source, mmap_mode='r')
+    return source
+
+
+def backing_file(X):
+    """Dizi bir `.npy` dosyasının tamamını eşliyorsa dosya yolunu, değilse None döndürür.
+
+    Dilimler ve türetilmiş diziler dosyanın tamamı olmadığından None döner.
+    """
+    if not isinstance(X, np.memmap) or not X.filename or not str(X.filename).endswith('.npy'):
+        return None
+    try:
+        whole = np.load(X.filename, mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+    if whole.shape != X.shape or whole.dtype != X.dtype or whole.offset != X.offset:
+        return None
+    return str(X.filename)
+
+
+def shared_source(X):
+    """İşçi süreçlere verilecek kaynak: dosya destekliyse yolu, değilse dizinin kendisi."""
+    return backing_file(X) or X
@@ -0,0 +1,264 @@
+"""
+Aylık artımlı güncelleme.
+
+Her ay yeni bir `traffic_density_YYYYMM.csv` dosyası gelir. Tüm veriyi yeniden
+işlemek yerine önceki çalıştırmada kaydedilen ölçekleyici ve küme merkezleri
+yüklenir, yalnızca yeni ayın satırlarıyla güncellenir ve yalnızca bu satırlar
+etiketlenir. Önceki ayların etiketleri yeniden hesaplanmaz, yenileri eklenir.
+
+Model durumu klasörü:
+    scaler.joblib       Ölçekleyici (özellik sütunlarını da taşır)
+    centers.npy         Küme merkezleri (ölçeklenmiş uzayda)
+    counts.npy          Her merkeze bugüne kadar atanan satır sayısı
+    months.json         İşlenmiş ayların sırası
+    labels/YYYYMM.npy   Her ayın etiketleri
+    drift/YYYYMM.json   Aylar arası merkez hareketi raporu
+    patterns.json       Küme başına trafik kalıbı (bkz. predictor.py)
+    partitions.json     Bölümlü kümelemede bölüm düzeni (bkz. partitioned_clustering.py);
+                        satırlar yalnızca kendi bölümlerinin merkezlerine atanır
+    projection.joblib   Grafiklerde ortak eksenler için PCA izdüşümü (bkz. projection.py)
+"""
+
+import copy
+import json
+import os
+
+import numpy as np
+
+from centroid_assignment import assign_to_centroids
+from cluster_stats import center_patterns
+from data_preprocessing import clean_data, extract_features, load_data
+from ingestion import month_from_path
+from normalization import (inverse_transform, load_scaler, save_scaler, scaler_columns,
+                           transform_features, transform_matrix)
+from partitioned_clustering import assign_within_partitions, partition_indices, partition_names
+
+DEFAULT_STATE_DIR = 'data/model'
+
+
+def _read_months(state_dir):
+    path = os.path.join(state_dir, 'months.json')
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_months(state_dir, months):
+    with open(os.path.join(state_dir, 'months.json'), 'w', encoding='utf-8') as f:
+        json.dump(months, f)
+
+
+def _write_patterns(state_dir, patterns):
+    with open(os.path.join(state_dir, 'patterns.json'), 'w', encoding='utf-8') as f:
+        json.dump(list(patterns), f, ensure_ascii=False)
+
+
+def load_patterns(state_dir=DEFAULT_STATE_DIR):
+    """Küme başına trafik kalıbı listesini yükler; kayıtlı değilse None döndürür."""
+    path = os.path.join(state_dir, 'patterns.json')
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_partitions(state_dir, partitions):
+    path = os.path.join(state_dir, 'partitions.json')
+    if partitions is None:
+        # Bölümsüz bir çalıştırma önceki bölüm düzenini geçersiz kılar
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(partitions, f, ensure_ascii=False)
+
+
+def load_partitions(state_dir=DEFAULT_STATE_DIR):
+    """Bölüm düzenini yükler; model bölümsüz kümelemeyle kaydedildiyse None döndürür."""
+    path = os.path.join(state_dir, 'partitions.json')
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def has_model_state(state_dir=DEFAULT_STATE_DIR):
+    """Klasörde kayıtlı bir model durumu var mı kontrol eder."""
+    return os.path.exists(os.path.join(state_dir, 'centers.npy'))
+
+
+def load_model_state(state_dir=DEFAULT_STATE_DIR):
+    """(scaler, centers, counts) üçlüsünü yükler."""
+    scaler = load_scaler(os.path.join(state_dir, 'scaler.joblib'))
+    centers = np.load(os.path.join(state_dir, 'centers.npy'))
+    counts = np.load(os.path.join(state_dir, 'counts.npy'))
+    return scaler, centers, counts
+
+
+def save_model_state(state_dir, scaler, centers, labels, month, patterns=None, partitions=None):
+    """Tam bir kümeleme çalıştırmasının sonucunu artımlı güncellemeler için kaydeder.
+
+    Klasördeki önceki durum (ay listesi ve etiketler dahil) silinir ve bu ay
+    ilk ay olarak kaydedilir. `patterns` verilirse küme başına trafik kalıbı
+    (main.py'deki küme yorumları) çevrimiçi etiketleme için saklanır; verilmezse
+    merkezlerden türetilir. `partitions` bölümlü kümelemenin düzenidir
+    (`partition_layout`); verilirse tahmin ve artımlı güncelleme satırları
+    yalnızca kendi bölümlerinin merkezlerine atar.
+    """
+    os.makedirs(os.path.join(state_dir, 'labels'), exist_ok=True)
+    for name in os.listdir(os.path.join(state_dir, 'labels')):
+        os.remove(os.path.join(state_dir, 'labels', name))
+
+    labels = np.asarray(labels, dtype=np.int32)
+    save_scaler(scaler, os.path.join(state_dir, 'scaler.joblib'))
+    np.save(os.path.join(state_dir, 'centers.npy'), np.asarray(centers, dtype=np.float64))
+    np.save(os.path.join(state_dir, 'counts.npy'), np.bincount(labels, minlength=len(centers)).astype(np.float64))
+    np.save(os.path.join(state_dir, 'labels', f'{month}.npy'), labels)
+    if patterns is None:
+        patterns = center_patterns(inverse_transform(scaler, centers), scaler_columns(scaler))
+    _write_patterns(state_dir, patterns)
+    _write_partitions(state_dir, partitions)
+    _write_months(state_dir, [month])
+    print(f"💾 Model durumu kaydedildi: {state_dir} (ay: {month})")
+
+
+def _assign(X, centers, row_partitions=None, partitions=None, **options):
+    if partitions is None:
+        return assign_to_centroids(X, centers, **options)
+    return assign_within_partitions(X, centers, row_partitions, partitions, **options)
+
+
+def _update_centers(X, centers, counts, batch_size, row_partitions=None, partitions=None):
+    """Merkezleri sıralı mini-batch güncellemesi ile yeni satırlara uyarlar.
+
+    Her partide satırlar en yakın merkeze atanır ve merkez, önceki satır sayısı
+    ile ağırlıklı ortalama olarak güncellenir: c = (n·c + Σx) / (n + m).
+    Böylece geçmiş aylar sayıları oranında etkisini korur. Bölümlü modelde
+    satırlar yalnızca kendi bölümlerinin merkezlerine atanır.
+    """
+    centers = centers.copy()
+    counts = counts.copy()
+    n_clusters, n_features = centers.shape
+    for start in range(0, len(X), batch_size):
+        batch = np.asarray(X[start:start + batch_size], dtype=np.float64)
+        batch_partitions = None if row_partitions is None else row_partitions[start:start + batch_size]
+        labels, _ = _assign(batch, centers, batch_partitions, partitions)
+        batch_counts = np.bincount(labels, minlength=n_clusters).astype(np.float64)
+        sums = np.zeros((n_clusters, n_features))
+        for j in range(n_features):
+            sums[:, j] = np.bincount(labels, weights=batch[:, j], minlength=n_clusters)
+        updated = batch_counts > 0
+        total = counts[updated] + batch_counts[updated]
+        centers[updated] = (counts[updated, None] * centers[updated] + sums[updated]) / total[:, None]
+        counts[updated] = total
+    return centers, counts
+
+
+def _drift_report(month, previous_month, scaler, old_centers, new_centers, counts_added):
+    """Merkezlerin ölçeklenmiş ve orijinal birimlerdeki hareketini raporlar."""
+    columns = scaler_columns(scaler)
+    old_original = inverse_transform(scaler, old_centers)
+    new_original = inverse_transform(scaler, new_centers)
+    shift = np.sqrt(((new_centers - old_centers) ** 2).sum(axis=1))
+    return {
+        'month': month,
+        'previous_month': previous_month,
+        'clusters': [
+            {
+                'cluster': cluster,
+                'new_rows': int(counts_added[cluster]),
+                'shift_scaled': float(shift[cluster]),
+                'shift_original': {col: float(new_original[cluster, j] - old_original[cluster, j])
+                                   for j, col in enumerate(columns)},
+            }
+            for cluster in range(len(new_centers))
+        ],
+        'max_shift_scaled': float(shift.max()),
+    }
+
+
+def update_month(file_path, state_dir=DEFAULT_STATE_DIR, month=None, update_scaler=True,
+                 batch_size=50_000, n_jobs=1):
+    """Yeni ayın verisiyle model durumunu günceller ve yalnızca yeni satırları etiketler.
+
+    Args:
+        file_path: Yeni ayın ham CSV dosyası.
+        state_dir: Model durumu klasörü (bkz. `save_model_state`).
+        month: Ay etiketi; verilmezse dosya adından çıkarılır.
+        update_scaler: True ise ölçekleyici istatistikleri de yeni satırlarla güncellenir;
+            eski merkezler orijinal birimler üzerinden yeni ölçeğe taşınır.
+        batch_size: Merkez güncellemesindeki parti boyutu.
+        n_jobs: Etiket atamasındaki iş parçacığı sayısı.
+
+    Returns:
+        (labels, drift) - yeni ayın etiketleri ve merkez hareketi raporu.
+    """
+    month = month or month_from_path(file_path)
+    months = _read_months(state_dir)
+    if month in months:
+        raise ValueError(f"{month} ayı zaten işlenmiş: {state_dir}")
+
+    print(f"=== Artımlı Güncelleme: {month} ===")
+    scaler, centers, counts = load_model_state(state_dir)
+    columns = scaler_columns(scaler)
+    partitions = load_partitions(state_dir)
+
+    df = extract_features(clean_data(load_data(file_path)))
+    print(f"📊 Yeni ay satır sayısı: {len(df):,}")
+
+    if update_scaler and hasattr(scaler, 'partial_fit'):
+        # Eski merkezler orijinal birimlere döndürülüp güncellenen ölçekle yeniden ölçeklenir
+        original_centers = inverse_transform(scaler, centers)
+        scaler = copy.deepcopy(scaler)
+        scaler.partial_fit(df[columns])
+        centers = transform_matrix(scaler, original_centers)
+
+    X = transform_features(df, scaler)
+    row_partitions = None
+    if partitions is not None:
+        row_partitions = partition_indices(partition_names(df, partitions['by']), partitions)
+        unseen = int((row_partitions < 0).sum())
+        if unseen:
+            print(f"⚠️ {unseen:,} satır eğitimde görülmemiş bölümlerde; tüm merkezlere göre atanacak")
+    del df
+
+    new_centers, new_counts = _update_centers(X, centers, counts, batch_size, row_partitions, partitions)
+    labels, _ = _assign(X, new_centers, row_partitions, partitions, n_jobs=n_jobs)
+
+    drift = _drift_report(month, months[-1] if months else None, scaler, centers, new_centers,
+                          new_counts - counts)
+    for cluster in drift['clusters']:
+        print(f"   🔵 Küme {cluster['cluster']}: +{cluster['new_rows']:,} satır, "
+              f"merkez hareketi {cluster['shift_scaled']:.4f}")
+
+    save_scaler(scaler, os.path.join(state_dir, 'scaler.joblib'))
+    np.save(os.path.join(state_dir, 'centers.npy'), new_centers)
+    np.save(os.path.join(state_dir, 'counts.npy'), new_counts)
+    os.makedirs(os.path.join(state_dir, 'labels'), exist_ok=True)
+    np.save(os.path.join(state_dir, 'labels', f'{month}.npy'), labels)
+    os.makedirs(os.path.join(state_dir, 'drift'), exist_ok=True)
+    with open(os.path.join(state_dir, 'drift', f'{month}.json'), 'w', encoding='utf-8') as f:
+        json.dump(drift, f, ensure_ascii=False, indent=2)
+    # Merkezler hareket ettiğinden kalıplar yeni merkezlerden yeniden belirlenir
+    _write_patterns(state_dir, center_patterns(inverse_transform(scaler, new_centers), columns))
+    _write_months(state_dir, months + [month])
+
+    print(f"✅ {month} ayı eklendi: {len(labels):,} satır etiketlendi "
+          f"(en büyük merkez hareketi: {drift['max_shift_scaled']:.4f})")
+    return labels, drift
+
+
+def load_labels(state_dir=DEFAULT_STATE_DIR, months=None):
+    """Kayıtlı ayların etiketlerini ay sırasıyla birleştirerek döndürür."""
+    months = months or _read_months(state_dir)
+    return np.concatenate([np.load(os.path.join(state_dir, 'labels', f'{month}.npy'))
+                           for month in months])
+
+
+# Örnek kullanım: python src/incremental.py data/raw/traffic_density_202502.csv
+if __name__ == "__main__":
+    import sys
+
+    for path in sys.argv[1:]:
+        update_month(path)
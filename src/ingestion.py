@@ -0,0 +1,140 @@
+"""
+Ham trafik verisi için ortak yükleme katmanı.
+
+IBB `traffic_density_*.csv` dosyalarının şeması burada bir kez tanımlanır.
+İlk okumada CSV tipli olarak ayrıştırılır ve sütunsal (Feather) bir önbelleğe
+yazılır; sonraki çalıştırmalar metni yeniden ayrıştırmak yerine bu önbelleği
+bellek eşlemeli (memory-map) olarak okur.
+"""
+
+import os
+import re
+
+import pandas as pd
+
+from time_features import parse_timestamps
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow yoksa önbellek devre dışı kalır
+    feather = None
+
+# Önbellek biçimi değiştiğinde eski dosyaların kullanılmaması için artırılır
+# (2: şema dışı sütunları kırpılmış işlenmiş veri önbellekleri geçersiz)
+SCHEMA_VERSION = 2
+
+TIMESTAMP_COLUMNS = ['DATE_TIME']
+
+# Ölçüm sütunları float32 tutulur: eksik değer (NaN) taşıyabilmeleri için
+# tamsayı yerine 32 bit ondalık kullanılır, bu yine de float64'ün yarısıdır.
+RAW_DTYPES = {
+    'LATITUDE': 'float32',
+    'LONGITUDE': 'float32',
+    'GEOHASH': 'category',
+    'MINIMUM_SPEED': 'float32',
+    'MAXIMUM_SPEED': 'float32',
+    'AVERAGE_SPEED': 'float32',
+    'NUMBER_OF_VEHICLES': 'float32',
+}
+RAW_COLUMNS = TIMESTAMP_COLUMNS + list(RAW_DTYPES)
+
+
+def month_from_path(file_path):
+    """Dosya adındaki YYYYMM ay bilgisini döndürür (ör. traffic_density_202501.csv -> 202501)."""
+    match = re.search(r'(\d{6})(?!.*\d{6})', os.path.basename(file_path))
+    if match is None:
+        raise ValueError(f"Dosya adından ay bilgisi çıkarılamadı: {file_path}")
+    return match.group(1)
+
+
+def cache_path_for(file_path, cache_dir=None):
+    """CSV dosyasına karşılık gelen Feather önbellek yolunu döndürür."""
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(file_path)), '.cache')
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(cache_dir, f'{stem}.v{SCHEMA_VERSION}.feather')
+
+
+def _is_cache_fresh(file_path, cache_path):
+    """Önbellek dosyası kaynak CSV'den yeni mi kontrol eder."""
+    return (os.path.exists(cache_path)
+            and os.path.getmtime(cache_path) >= os.path.getmtime(file_path))
+
+
+def read_header(file_path):
+    """CSV dosyasının sütun adlarını döndürür."""
+    return pd.read_csv(file_path, nrows=0).columns
+
+
+def is_raw_header(columns):
+    """Sütunlar yalnızca ham şemadan oluşuyorsa (ör. traffic_density_*.csv) True döndürür."""
+    return len(columns) > 0 and all(col in RAW_COLUMNS for col in columns)
+
+
+def read_csv_typed(file_path, **kwargs):
+    """CSV dosyasını ortak şemaya göre tipli olarak okur.
+
+    Tüm sütunlar okunur; tipler yalnızca şema sütunlarına uygulanır, şema
+    dışındaki sütunlar (ör. işlenmiş verideki `hour`) varsayılan tiplerle kalır.
+    Ek anahtar argümanlar `pd.read_csv`'ye iletilir (ör. `chunksize`).
+    """
+    header = read_header(file_path)
+    dtypes = {col: RAW_DTYPES[col] for col in header if col in RAW_DTYPES}
+    reader = pd.read_csv(file_path, dtype=dtypes or None, **kwargs)
+
+    if 'chunksize' in kwargs:
+        return (_parse_timestamp_columns(chunk) for chunk in reader)
+    return _parse_timestamp_columns(reader)
+
+
+def _parse_timestamp_columns(df):
+    for col in TIMESTAMP_COLUMNS:
+        if col in df.columns:
+            df[col] = parse_timestamps(df[col])
+    return df
+
+
+def load_traffic_data(file_path, columns=None, use_cache=True, cache_dir=None):
+    """Trafik verisini yükler; mümkünse sütunsal önbellekten okur.
+
+    Args:
+        file_path: Ham CSV dosyasının yolu.
+        columns: Yalnızca bu sütunları döndür (önbellekten okurken diğerleri hiç okunmaz).
+        use_cache: False ise önbellek ne okunur ne yazılır. Yalnızca ham şemadaki
+            dosyalar önbelleğe alınır; işlenmiş veri her seferinde CSV'den okunur.
+        cache_dir: Önbellek klasörü; verilmezse CSV'nin yanındaki `.cache` klasörü.
+    """
+    if use_cache and feather is None:
+        print("⚠️ pyarrow bulunamadı, önbellek kullanılmıyor")
+        use_cache = False
+
+    if use_cache and not is_raw_header(read_header(file_path)):
+        use_cache = False
+
+    cache_path = cache_path_for(file_path, cache_dir)
+
+    if use_cache and _is_cache_fresh(file_path, cache_path):
+        print(f"⚡ Önbellekten yükleniyor: {cache_path}")
+        table = feather.read_table(cache_path, columns=columns, memory_map=True)
+        return table.to_pandas()
+
+    print(f"📥 CSV ayrıştırılıyor: {file_path}")
+    df = read_csv_typed(file_path)
+
+    if use_cache:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # Sıkıştırmasız yazılır ki sonraki okumalar bellek eşlemeli yapılabilsin
+        feather.write_feather(df, cache_path, compression='uncompressed')
+        print(f"💾 Önbellek yazıldı: {cache_path}")
+
+    if columns is not None:
+        df = df[columns]
+    return df
+
+
+def clear_cache(file_path, cache_dir=None):
+    """CSV dosyasına ait önbelleği siler."""
+    cache_path = cache_path_for(file_path, cache_dir)
+    if os.path.exists(cache_path):
+        os.remove(cache_path)
+        print(f"🗑️ Önbellek silindi: {cache_path}")
@@ -0,0 +1,199 @@
+"""
+Aşama ölçümleri (süre, CPU, bellek, işlem hızı).
+
+`track` bağlam yöneticisi ve `instrumented` dekoratörü sarılan kod için duvar
+saati süresi, CPU süresi, tepe RSS artışı ve satır/saniye ölçer; ölçümler
+bellekte toplanır ve `configure(metrics_path)` çağrıldıysa JSON-lines dosyasına
+tek satır olarak eklenir (varsayılan olarak dosyaya yazılmaz; main.py
+`METRICS_PATH` ile açar). `record_metric` tekil değerleri
+(ör. K başına eğitim süresi) aynı dosyaya yazar. `print_summary` çalıştırma
+sonunda ölçümleri tablo olarak gösterir.
+
+Profil modu açıksa (`configure(profile_dir=...)`) `profile=True` ile izlenen
+aşamalar için cProfile çıktısı (`<ad>.prof`) ve tracemalloc'un en çok bellek
+ayıran satırları (`<ad>.tracemalloc.txt`) kaydedilir.
+"""
+
+import cProfile
+import functools
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+DEFAULT_METRICS_PATH = 'results/metrics.jsonl'
+TRACEMALLOC_TOP_LINES = 25
+
+_state = {
+    'metrics_path': None,
+    'profile_dir': None,
+    'records': [],
+    'stack': [],
+    'muted': 0,
+}
+
+
+def configure(metrics_path=None, profile_dir=None, reset=True):
+    """Ölçüm çıktılarını ayarlar.
+
+    Args:
+        metrics_path: JSON-lines dosyası; None ise dosyaya yazılmaz.
+        profile_dir: Verilirse profil modu açılır ve çıktılar bu klasöre yazılır.
+        reset: True ise önceki ölçümler ve dosya temizlenir.
+    """
+    _state['metrics_path'] = metrics_path
+    _state['profile_dir'] = profile_dir
+    if reset:
+        _state['records'] = []
+        if metrics_path and os.path.exists(metrics_path):
+            os.remove(metrics_path)
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+
+
+def _peak_rss_mb():
+    """Sürecin şimdiye kadarki tepe RSS değeri (MB)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux KB, macOS bayt döndürür
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+def _emit(record):
+    if _state['muted']:
+        return
+    _state['records'].append(record)
+    path = _state['metrics_path']
+    if path:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+
+
+def record_metric(name, **fields):
+    """Tekil bir ölçümü (ör. K başına süre) kaydeder."""
+    _emit({'kind': 'metric', 'name': name, 'parent': '/'.join(_state['stack']) or None,
+           'time': time.time(), **fields})
+
+
+def _safe_name(name):
+    return ''.join(c if c.isalnum() or c in '-_.' else '_' for c in name)
+
+
+@contextmanager
+def track(name, rows=None, profile=False, children=True, **fields):
+    """Bloğu ölçer ve sonucu kaydeder.
+
+    `children=False` ise blok içindeki iç içe ölçümler kaydedilmez (ör. parça
+    başına çağrılan fonksiyonlar); yalnızca bloğun kendi kaydı yazılır.
+
+    Blok içinde dönen sözlüğe `rows` veya başka alanlar eklenebilir:
+
+        with track('ingest') as record:
+            df = load(...)
+            record['rows'] = len(df)
+    """
+    record = {'kind': 'stage', 'name': name, 'parent': '/'.join(_state['stack']) or None, **fields}
+    if rows is not None:
+        record['rows'] = rows
+
+    profile_dir = _state['profile_dir'] if profile else None
+    profiler = None
+    if profile_dir:
+        profiler = cProfile.Profile()
+        tracemalloc.start()
+        profiler.enable()
+
+    _state['stack'].append(name)
+    _state['muted'] += not children
+    peak_before = _peak_rss_mb()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    status = 'ok'
+    try:
+        yield record
+    except BaseException:
+        status = 'error'
+        raise
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        _state['stack'].pop()
+        _state['muted'] -= not children
+
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(os.path.join(profile_dir, f'{_safe_name(name)}.prof'))
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            with open(os.path.join(profile_dir, f'{_safe_name(name)}.tracemalloc.txt'), 'w',
+                      encoding='utf-8') as f:
+                for stat in snapshot.statistics('lineno')[:TRACEMALLOC_TOP_LINES]:
+                    f.write(f'{stat}\n')
+
+        record.update({
+            'status': status,
+            'wall_seconds': round(wall, 4),
+            'cpu_seconds': round(cpu, 4),
+            'peak_rss_mb': round(_peak_rss_mb(), 1),
+            'peak_rss_delta_mb': round(_peak_rss_mb() - peak_before, 1),
+            'time': time.time(),
+        })
+        if record.get('rows') and wall > 0:
+            record['rows_per_second'] = round(record['rows'] / wall, 1)
+        _emit(record)
+
+
+def _row_count(value):
+    shape = getattr(value, 'shape', None)
+    if shape:
+        return int(shape[0])
+    return None
+
+
+def instrumented(name=None, profile=False):
+    """Fonksiyonu `track` ile saran dekoratör.
+
+    Satır sayısı ilk konumsal argümanın (DataFrame / dizi) boyutundan alınır.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            rows = _row_count(args[0]) if args else None
+            with track(name or func.__name__, rows=rows, profile=profile):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def summary_table(records=None):
+    """Aşama ölçümlerini tablo olarak döndürür."""
+    records = [r for r in (records if records is not None else _state['records']) if r['kind'] == 'stage']
+    columns = ['name', 'parent', 'status', 'wall_seconds', 'cpu_seconds', 'peak_rss_delta_mb',
+               'peak_rss_mb', 'rows', 'rows_per_second']
+    table = pd.DataFrame(records)
+    return table.reindex(columns=columns)
+
+
+def print_summary(records=None):
+    """Ölçüm özetini yazdırır."""
+    table = summary_table(records)
+    if table.empty:
+        return
+    print("\n📏 Ölçüm özeti:")
+    print(table.to_string(index=False, na_rep='-'))
+    if _state['metrics_path']:
+        print(f"💾 Ölçümler: {_state['metrics_path']}")
+    if _state['profile_dir']:
+        print(f"🔬 Profil çıktıları: {_state['profile_dir']}")
+
+
+def load_metrics(path=DEFAULT_METRICS_PATH):
+    """JSON-lines ölçüm dosyasını kayıt listesi olarak okur."""
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -0,0 +1,199 @@
+"""
+İçerik adresli model önbelleği.
+
+K taraması ve son kümeleme sonuçları (merkezler, inertia/kalite eğrileri,
+etiketler) girdinin parmak izi, özellik sütunları, ölçekleyici parametreleri
+ve KMeans ayarlarından türetilen bir anahtar altında diske yazılır. Aynı
+girdi ve ayarlarla yapılan sonraki çalıştırmalar sonucu milisaniyeler içinde
+(bellek eşlemeli) yükler. Önbellek boyutu aşıldığında en uzun süredir
+kullanılmayan kayıtlar silinir.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = 'data/cache/models'
+MAX_CACHE_BYTES = 2 * 1024 ** 3  # 2 GB
+METADATA_FILENAME = 'meta.json'
+
+# Parmak izi hesaplanırken bir seferde okunan bayt miktarı
+_FINGERPRINT_BLOCK_BYTES = 64 * 1024 ** 2
+
+
+def fingerprint_array(X):
+    """Dizinin içeriğinden (şekil, tip ve baytlar) kısa bir parmak izi üretir.
+
+    Bellek eşlemeli diziler satır blokları halinde okunur; tamamı belleğe alınmaz.
+    """
+    X = np.asarray(X)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f'{X.shape}|{X.dtype.str}'.encode())
+    if X.ndim == 0 or X.size == 0:
+        digest.update(X.tobytes())
+        return digest.hexdigest()
+    rows_per_block = max(1, _FINGERPRINT_BLOCK_BYTES // max(1, X[0].nbytes))
+    for start in range(0, len(X), rows_per_block):
+        digest.update(np.ascontiguousarray(X[start:start + rows_per_block]).data)
+    return digest.hexdigest()
+
+
+def fingerprint_file(path):
+    """Dosyanın yolu, boyutu ve değiştirilme zamanından parmak izi üretir."""
+    stat = os.stat(path)
+    return hashlib.blake2b(f'{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}'.encode(),
+                           digest_size=16).hexdigest()
+
+
+def _scaler_state(scaler):
+    """Ölçekleyicinin anahtara giren parametreleri."""
+    if scaler is None:
+        return None
+    state = {'type': type(scaler).__name__}
+    for name in ('mean_', 'scale_', 'min_', 'data_min_', 'data_max_'):
+        value = getattr(scaler, name, None)
+        if value is not None:
+            state[name] = np.asarray(value).tolist()
+    return state
+
+
+def _jsonable(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def make_cache_key(kind, data_fingerprint, feature_columns=None, scaler=None, params=None):
+    """Önbellek anahtarını üretir.
+
+    Args:
+        kind: Kayıt türü (ör. 'sweep', 'kmeans').
+        data_fingerprint: `fingerprint_array` / `fingerprint_file` çıktısı.
+        feature_columns: Kümelemede kullanılan sütunlar.
+        scaler: Eğitilmiş ölçekleyici (parametreleri anahtara girer).
+        params: KMeans ve diğer ayarlar sözlüğü.
+    """
+    payload = {
+        'kind': kind,
+        'data': data_fingerprint,
+        'features': list(feature_columns or []),
+        'scaler': _scaler_state(scaler),
+        'params': params or {},
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=_jsonable).encode()
+    return f'{kind}-{hashlib.sha256(encoded).hexdigest()[:32]}'
+
+
+def _entry_dir(key, cache_dir):
+    return os.path.join(cache_dir, key)
+
+
+def _entry_size(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+def load_entry(key, cache_dir=DEFAULT_CACHE_DIR):
+    """Kaydı yükler; yoksa None döndürür.
+
+    Returns:
+        (arrays, metadata) - diziler salt okunur bellek eşlemesi olarak açılır.
+    """
+    path = _entry_dir(key, cache_dir)
+    metadata_path = os.path.join(path, METADATA_FILENAME)
+    if not os.path.exists(metadata_path):
+        return None
+
+    with open(metadata_path, encoding='utf-8') as f:
+        metadata = json.load(f)
+    arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+              for name in metadata.get('arrays', [])}
+
+    # Son kullanım zamanı, boyut tabanlı temizlikte sıralama için güncellenir
+    os.utime(metadata_path)
+    print(f"⚡ Model önbelleğinden yüklendi: {key}")
+    return arrays, metadata
+
+
+def save_entry(key, arrays, metadata=None, cache_dir=DEFAULT_CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    """Dizileri ve meta veriyi anahtar altında kaydeder, ardından önbelleği sınırlar."""
+    path = _entry_dir(key, cache_dir)
+    temporary_path = f'{path}.tmp'
+    shutil.rmtree(temporary_path, ignore_errors=True)
+    os.makedirs(temporary_path)
+
+    for name, values in arrays.items():
+        np.save(os.path.join(temporary_path, f'{name}.npy'), np.asarray(values))
+    metadata = {**(metadata or {}), 'arrays': list(arrays)}
+    with open(os.path.join(temporary_path, METADATA_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=2, default=_jsonable)
+
+    # Yarım kalmış yazmalar okunmasın diye kayıt en son yerine taşınır
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(temporary_path, path)
+    print(f"💾 Model önbelleğine kaydedildi: {key}")
+
+    evict(cache_dir, max_bytes)
+
+
+def evict(cache_dir=DEFAULT_CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    """Toplam boyut `max_bytes`'ı aşarsa en uzun süredir kullanılmayan kayıtları siler."""
+    if not os.path.isdir(cache_dir):
+        return
+
+    entries = []
+    for entry in os.scandir(cache_dir):
+        metadata_path = os.path.join(entry.path, METADATA_FILENAME)
+        if entry.is_dir() and os.path.exists(metadata_path):
+            entries.append((os.path.getmtime(metadata_path), _entry_size(entry.path), entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+        print(f"🗑️ Önbellekten çıkarıldı: {os.path.basename(path)}")
+
+
+def invalidate(key=None, cache_dir=DEFAULT_CACHE_DIR):
+    """Tek bir kaydı (key verilirse) veya tüm önbelleği siler."""
+    if key is None:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        print(f"🗑️ Model önbelleği temizlendi: {cache_dir}")
+        return
+    path = _entry_dir(key, cache_dir)
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+        print(f"🗑️ Önbellek kaydı silindi: {key}")
+
+
+def list_entries(cache_dir=DEFAULT_CACHE_DIR):
+    """Önbellekteki kayıtları (anahtar, bayt) listesi olarak döndürür."""
+    if not os.path.isdir(cache_dir):
+        return []
+    return sorted((entry.name, _entry_size(entry.path)) for entry in os.scandir(cache_dir)
+                  if entry.is_dir() and os.path.exists(os.path.join(entry.path, METADATA_FILENAME)))
+
+
+# Örnek kullanım: python src/model_cache.py [--clear | --invalidate KEY]
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Model önbelleğini yönetir.")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--clear', action='store_true', help="Tüm önbelleği sil")
+    parser.add_argument('--invalidate', metavar='KEY', help="Tek bir kaydı sil")
+    args = parser.parse_args()
+
+    if args.clear:
+        invalidate(cache_dir=args.cache_dir)
+    elif args.invalidate:
+        invalidate(args.invalidate, cache_dir=args.cache_dir)
+    else:
+        for key, size in list_entries(args.cache_dir):
+            print(f"{key}  {size / 1024 ** 2:.1f} MB")
@@ -0,0 +1,219 @@
+"""
+Birden fazla ayın paralel yüklenmesi ve ay bölümlü sütunsal veri seti.
+
+`traffic_density_2025*.csv` gibi bir desene uyan her aylık dosya ayrı bir
+işçi süreçte ayrıştırılır, temizlenir (eksik değerler ve duplikeler) ve zaman
+özellikleri eklenerek veri setinin kendi bölümüne yazılır:
+
+    <veri_seti>/year_month=202501/part-0.parquet
+    <veri_seti>/year_month=202501/_source.json
+
+Büyük tablolar süreçler arasında taşınmaz; işçiler yalnızca kısa bir özet
+döndürür. Bu yüzden bir yıllık verinin süresi dosya sayısıyla değil çekirdek
+sayısıyla ölçeklenir. Kaynak dosyası değişmeyen aylar yeniden işlenmez.
+
+Bölümler saate göre sıralı yazılır; `load_months` ay filtresini bölüm
+klasörleri, saat filtresini satır grubu istatistikleri üzerinden uygular ve
+elenen aylar/saatler diskten hiç okunmaz.
+
+Örnek: python src/month_partitions.py "data/raw/traffic_density_2025*.csv" --workers 4
+"""
+
+import glob
+import json
+import operator
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import reduce
+
+import pandas as pd
+
+from ingestion import month_from_path, read_csv_typed
+from instrumentation import record_metric
+from model_cache import fingerprint_file
+from time_features import DEFAULT_FEATURES, add_calendar_features
+
+DEFAULT_DATASET_DIR = 'data/processed/months'
+PARTITION_COLUMN = 'year_month'
+SOURCE_FILENAME = '_source.json'  # `_` önekli dosyalar Parquet okuyucuları tarafından atlanır
+
+# Saate göre sıralı bölümlerde her satır grubu birkaç saati kapsar; saat
+# filtresi yalnızca ilgili satır gruplarını okur
+ROW_GROUP_SIZE = 65_536
+
+
+def partition_path(dataset_dir, month):
+    """Ayın bölüm klasörünü döndürür."""
+    return os.path.join(dataset_dir, f'{PARTITION_COLUMN}={int(month)}')
+
+
+def _read_source(path):
+    source_path = os.path.join(path, SOURCE_FILENAME)
+    if not os.path.exists(source_path):
+        return None
+    with open(source_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def is_partition_fresh(file_path, dataset_dir):
+    """Ayın bölümü bu kaynak dosyanın güncel haliyle mi yazılmış?"""
+    source = _read_source(partition_path(dataset_dir, month_from_path(file_path)))
+    return source is not None and source['fingerprint'] == fingerprint_file(file_path)
+
+
+def ingest_month(file_path, dataset_dir=DEFAULT_DATASET_DIR):
+    """Tek bir aylık CSV dosyasını ayrıştırır, temizler ve bölümüne yazar.
+
+    İşçi süreçte çalışır; veri yerine kısa bir özet döndürür. Bölüm geçici
+    klasöre yazılıp yerine taşındığından yarım kalan yazmalar geçerli sayılmaz.
+
+    Returns:
+        {'month', 'source', 'rows_read', 'missing_removed', 'duplicates_removed',
+         'rows', 'seconds'}
+    """
+    started = time.perf_counter()
+    month = int(month_from_path(file_path))
+
+    df = read_csv_typed(file_path)
+    rows_read = len(df)
+    df = df.dropna()
+    missing_removed = rows_read - len(df)
+    # Her dosya tek bir ayı içerdiğinden duplikeler dosya içinde aranır
+    size = len(df)
+    df = df.drop_duplicates()
+    duplicates_removed = size - len(df)
+
+    add_calendar_features(df, 'DATE_TIME', features=DEFAULT_FEATURES)
+    df = df.sort_values(['hour', 'DATE_TIME'], kind='stable')
+
+    path = partition_path(dataset_dir, month)
+    # `.` önekli klasörler veri seti okunurken atlanır
+    temporary_path = os.path.join(dataset_dir, f'.{os.path.basename(path)}.tmp')
+    shutil.rmtree(temporary_path, ignore_errors=True)
+    os.makedirs(temporary_path)
+    df.to_parquet(os.path.join(temporary_path, 'part-0.parquet'), index=False, row_group_size=ROW_GROUP_SIZE)
+
+    summary = {
+        'month': month,
+        'source': os.path.abspath(file_path),
+        'rows_read': rows_read,
+        'missing_removed': missing_removed,
+        'duplicates_removed': duplicates_removed,
+        'rows': len(df),
+    }
+    with open(os.path.join(temporary_path, SOURCE_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump({**summary, 'fingerprint': fingerprint_file(file_path),
+                   'created': time.strftime('%Y-%m-%d %H:%M:%S')}, f, ensure_ascii=False, indent=2)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(temporary_path, path)
+    summary['seconds'] = round(time.perf_counter() - started, 3)
+    return summary
+
+
+def ingest_months(pattern, dataset_dir=DEFAULT_DATASET_DIR, max_workers=None, force=False):
+    """Desene uyan aylık dosyaları paralel olarak ay bölümlü veri setine yazar.
+
+    Args:
+        pattern: Ham CSV dosyaları için glob deseni (ör. 'data/raw/traffic_density_2025*.csv').
+        dataset_dir: Veri seti klasörü.
+        max_workers: İşçi süreç sayısı; verilmezse dosya ve çekirdek sayısının küçüğü.
+        force: Güncel bölümleri de yeniden yaz.
+
+    Returns:
+        Ay başına özet tablosu (yeniden yazılmayan aylar 'cached' durumundadır).
+    """
+    files = sorted(glob.glob(pattern))
+    if not files:
+        raise ValueError(f"Desene uyan dosya bulunamadı: {pattern}")
+
+    months = {}
+    for file_path in files:
+        month = month_from_path(file_path)
+        if month in months:
+            raise ValueError(f"{month} ayı için birden fazla dosya var: {months[month]}, {file_path}")
+        months[month] = file_path
+
+    os.makedirs(dataset_dir, exist_ok=True)
+    pending = [path for path in files if force or not is_partition_fresh(path, dataset_dir)]
+    summaries = [{**_read_source(partition_path(dataset_dir, month_from_path(path))), 'status': 'cached'}
+                 for path in files if path not in pending]
+    for summary in summaries:
+        print(f"⚡ {summary['month']} bölümü güncel, atlandı")
+
+    if pending:
+        max_workers = max_workers or min(len(pending), os.cpu_count() or 1)
+        print(f"📥 {len(pending)} aylık dosya {max_workers} süreçte ayrıştırılıyor...")
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(ingest_month, path, dataset_dir): path for path in pending}
+            for future in as_completed(futures):
+                try:
+                    summary = future.result()
+                except Exception as e:
+                    raise RuntimeError(f"{futures[future]} yükleme hatası: {e}") from e
+                record_metric('ingest_month', **summary)
+                print(f"   ✓ {summary['month']}: {summary['rows']:,} satır "
+                      f"({summary['missing_removed']:,} eksik, {summary['duplicates_removed']:,} duplike silindi, "
+                      f"{summary['seconds']:.1f} s)")
+                summaries.append({**summary, 'status': 'run'})
+
+    table = pd.DataFrame(summaries).drop(columns=['fingerprint', 'created'], errors='ignore')
+    return table.sort_values('month').reset_index(drop=True)
+
+
+def list_months(dataset_dir=DEFAULT_DATASET_DIR):
+    """Veri setindeki ayları (YYYYMM tamsayı) sıralı döndürür."""
+    if not os.path.isdir(dataset_dir):
+        return []
+    prefix = f'{PARTITION_COLUMN}='
+    return sorted(int(name[len(prefix):]) for name in os.listdir(dataset_dir) if name.startswith(prefix))
+
+
+def _any_of(field, values):
+    # Eşitliklerin birleşimi hem bölüm hem satır grubu istatistikleriyle elenebilir
+    return reduce(operator.or_, [field == value for value in values])
+
+
+def load_months(dataset_dir=DEFAULT_DATASET_DIR, months=None, hours=None, columns=None):
+    """Ay bölümlü veri setini filtreleyerek yükler.
+
+    Args:
+        dataset_dir: Veri seti klasörü.
+        months: Yalnızca bu aylar (YYYYMM, ör. [202501, 202502]); None ise tümü.
+        hours: Yalnızca bu saatler (0-23); None ise tümü.
+        columns: Yalnızca bu sütunlar; None ise tümü (`year_month` dahil).
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    if not list_months(dataset_dir):
+        raise ValueError(f"Veri setinde ay bölümü yok: {dataset_dir}")
+    partitioning = ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.int32())]), flavor='hive')
+    dataset = ds.dataset(dataset_dir, format='parquet', partitioning=partitioning)
+
+    filters = []
+    if months is not None:
+        filters.append(_any_of(ds.field(PARTITION_COLUMN), [int(month) for month in months]))
+    if hours is not None:
+        filters.append(_any_of(ds.field('hour'), [int(hour) for hour in hours]))
+    expression = reduce(operator.and_, filters) if filters else None
+
+    table = dataset.to_table(columns=columns, filter=expression)
+    return table.to_pandas()
+
+
+# Örnek kullanım: python src/month_partitions.py "data/raw/traffic_density_2025*.csv"
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Aylık trafik dosyalarını ay bölümlü veri setine yazar.")
+    parser.add_argument('pattern', help="Ham CSV dosyaları için glob deseni")
+    parser.add_argument('--dataset-dir', default=DEFAULT_DATASET_DIR)
+    parser.add_argument('--workers', type=int, help="İşçi süreç sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument('--force', action='store_true', help="Güncel bölümleri de yeniden yaz")
+    args = parser.parse_args()
+
+    summary = ingest_months(args.pattern, args.dataset_dir, max_workers=args.workers, force=args.force)
+    print(summary.to_string(index=False))
@@ -0,0 +1,104 @@
+"""
+Kümeleme özellikleri için tek, kalıcı normalizasyon nesnesi.
+
+Ölçekleyici (sütun başına ortalama/std veya min/max) bir kez eğitilir ve
+işlenmiş verinin yanına kaydedilir. Veri çerçevesi orijinal birimlerde kalır;
+ölçeklenmiş matris gerektiğinde üretilir, orijinal birimlere dönüş ise
+yalnızca istenen sütun için hesaplanır (`_original` kopyaları tutulmaz).
+"""
+
+import os
+
+import joblib
+import numpy as np
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+SCALERS = {
+    'standard': StandardScaler,
+    'minmax': MinMaxScaler,
+}
+
+
+def make_scaler(method='standard'):
+    """İsmi verilen yöntem için eğitilmemiş bir ölçekleyici oluşturur."""
+    if method not in SCALERS:
+        raise ValueError(f"Bilinmeyen normalizasyon yöntemi: {method} (seçenekler: {list(SCALERS)})")
+    return SCALERS[method]()
+
+
+def fit_scaler(df, columns, method='standard'):
+    """Verilen sütunlar üzerinde ölçekleyiciyi eğitir.
+
+    Ölçekleyici sütun adlarını (`feature_names_in_`) saklar; böylece daha sonra
+    aynı sütun sırası ile dönüşüm yapılabilir.
+    """
+    scaler = make_scaler(method)
+    scaler.fit(df[list(columns)])
+    return scaler
+
+
+def save_scaler(scaler, path):
+    """Ölçekleyiciyi diske kaydeder."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    joblib.dump(scaler, path)
+    print(f"💾 Ölçekleyici kaydedildi: {path}")
+
+
+def load_scaler(path):
+    """Kaydedilmiş ölçekleyiciyi yükler."""
+    return joblib.load(path)
+
+
+def scaler_columns(scaler):
+    """Ölçekleyicinin eğitildiği sütunların listesini döndürür."""
+    return list(scaler.feature_names_in_)
+
+
+def scale_and_offset(scaler):
+    """Ölçeklenmiş değeri z = x * a + b biçimine getiren (a, b) katsayıları."""
+    if isinstance(scaler, StandardScaler):
+        scale = scaler.scale_ if scaler.scale_ is not None else np.ones_like(scaler.mean_)
+        mean = scaler.mean_ if scaler.mean_ is not None else np.zeros_like(scale)
+        return 1.0 / scale, -mean / scale
+    if isinstance(scaler, MinMaxScaler):
+        return scaler.scale_, scaler.min_
+    raise TypeError(f"Desteklenmeyen ölçekleyici: {type(scaler).__name__}")
+
+
+def transform_features(df, scaler, dtype=np.float32):
+    """Veri çerçevesinden ölçeklenmiş özellik matrisini üretir.
+
+    Tek bir `dtype` (varsayılan float32) dizisi oluşturulur ve yerinde ölçeklenir;
+    ara float64 kopyaları oluşmaz.
+    """
+    X = df[scaler_columns(scaler)].to_numpy(dtype=dtype, copy=True)
+    a, b = scale_and_offset(scaler)
+    X *= a.astype(dtype)
+    X += b.astype(dtype)
+    return X
+
+
+def transform_matrix(scaler, X):
+    """Sütunları ölçekleyicinin sırasında olan bir matrisi (ör. merkezler) ölçekler."""
+    a, b = scale_and_offset(scaler)
+    return np.asarray(X) * a + b
+
+
+def inverse_transform_column(scaler, X_scaled, column):
+    """Ölçeklenmiş matrisin tek bir sütununu orijinal birimlere döndürür.
+
+    Sadece istenen sütun hesaplanır; `X_scaled` tek boyutlu bir dizi ise
+    doğrudan o sütunun değerleri kabul edilir.
+    """
+    j = scaler_columns(scaler).index(column)
+    values = X_scaled if np.ndim(X_scaled) == 1 else X_scaled[:, j]
+    a, b = scale_and_offset(scaler)
+    return (values - b[j]) / a[j]
+
+
+def inverse_transform(scaler, X_scaled):
+    """Ölçeklenmiş matrisin (ör. küme merkezleri) tamamını orijinal birimlere döndürür."""
+    a, b = scale_and_offset(scaler)
+    return (np.asarray(X_scaled) - b) / a
@@ -0,0 +1,315 @@
+"""
+Zaman dilimi / bölge bazında bölümlenmiş kümeleme.
+
+Tüm satırları tek bir KMeans ile kümelemek gece ve zirve saat rejimlerini
+karıştırır. Bu modda veri bir anahtara göre bölümlere ayrılır (saat dilimi,
+hafta içi/sonu, ilçe ölçeğinde geohash öneki veya bunların birleşimi); her
+bölümde K ayrı seçilir ve bağımsız bir model eğitilir. Bölümler süreç havuzunda
+paralel koşar. İşçiler ölçeklenmiş matrisi dosya yolundan bellek eşlemeli okur
+ve yalnızca kendi satırlarını kopyalar (bkz. feature_matrix.py).
+
+Yerel etiketler bölüm sırasıyla kaydırılarak global etiketlere çevrilir:
+`global = offset[bölüm] + yerel`. Merkezler aynı sırayla tek bir dizide
+birleştirilir; istatistik tablosu her kümenin bölümünü ve bölüm içi payını
+da içerir.
+
+Bölüm düzeni (`partition_layout`: anahtar, bölüm adları, bölüm başına K)
+model durumuyla birlikte kaydedilir. Yeni okumalar (predictor.py,
+incremental.py) önce bölümlerine ayrılır, ardından yalnızca o bölümün
+merkezleri arasında en yakın merkeze atanır (`assign_within_partitions`).
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from threadpoolctl import threadpool_limits
+
+from cluster_quality import select_optimal_k
+from centroid_assignment import assign_to_centroids
+from cluster_stats import compute_cluster_stats
+from clustering_analysis import determine_optimal_clusters, perform_kmeans_clustering
+from feature_matrix import attach_matrix, shared_source
+from instrumentation import configure, record_metric
+
+# Saat dilimleri: [başlangıç, bitiş) saat aralıkları
+HOUR_BUCKETS = {
+    'gece': (0, 6),
+    'sabah_zirve': (6, 10),
+    'gündüz': (10, 16),
+    'akşam_zirve': (16, 20),
+    'akşam': (20, 24),
+}
+GEOHASH_PREFIX_LENGTH = 4  # ~20 km × 40 km, ilçe ölçeği
+WEEKEND_NAMES = ('hafta_içi', 'hafta_sonu')
+
+PARTITION_KEYS = ('hour_bucket', 'weekend', 'geohash')
+
+# Bu kadar satırdan küçük bölümlerde K taranmaz, tek küme kullanılır
+MIN_PARTITION_ROWS = 1_000
+
+
+def _hour_bucket_codes(data):
+    hours = data['hour'].to_numpy(np.int64)
+    lookup = np.zeros(24, dtype=np.int64)
+    for code, (start, stop) in enumerate(HOUR_BUCKETS.values()):
+        lookup[start:stop] = code
+    return lookup[hours], list(HOUR_BUCKETS)
+
+
+def _weekend_codes(data):
+    if 'is_weekend' in data.columns:
+        weekend = data['is_weekend'].to_numpy() > 0
+    else:
+        weekend = data['day_of_week'].to_numpy() >= 5
+    return weekend.astype(np.int64), list(WEEKEND_NAMES)
+
+
+def _geohash_codes(data, precision=GEOHASH_PREFIX_LENGTH):
+    codes, names = pd.factorize(data['GEOHASH'].astype(str).str[:precision], sort=True)
+    return codes.astype(np.int64), list(names)
+
+
+_KEY_FUNCTIONS = {
+    'hour_bucket': _hour_bucket_codes,
+    'weekend': _weekend_codes,
+    'geohash': _geohash_codes,
+}
+
+
+def _partition_keys(by):
+    keys = (by,) if isinstance(by, str) else tuple(by)
+    unknown = [key for key in keys if key not in _KEY_FUNCTIONS]
+    if unknown or not keys:
+        raise ValueError(f"Bilinmeyen bölüm anahtarı: {unknown} (seçenekler: {list(PARTITION_KEYS)})")
+    return keys
+
+
+def _key_codes(data, key):
+    try:
+        return _KEY_FUNCTIONS[key](data)
+    except KeyError as e:
+        raise ValueError(f"'{key}' bölüm anahtarı için sütun bulunamadı: {e}") from e
+
+
+def partition_codes(data, by):
+    """Her satırın bölüm kodunu ve bölüm adlarını döndürür.
+
+    Args:
+        data: İşlenmiş veri (ham birimlerde `hour`, `day_of_week`, `GEOHASH`).
+        by: `PARTITION_KEYS` içinden bir anahtar veya anahtar demeti
+            (ör. ('hour_bucket', 'weekend')); demetlerde bölümler birleşimdir.
+
+    Returns:
+        (codes, names) - satır başına int64 kod ve yalnızca dolu bölümlerin adları.
+    """
+    combined = np.zeros(len(data), dtype=np.int64)
+    combined_names = ['']
+    for key in _partition_keys(by):
+        codes, names = _key_codes(data, key)
+        combined = combined * len(names) + codes
+        combined_names = [f'{prefix}|{name}' if prefix else name for prefix in combined_names for name in names]
+
+    # Boş birleşimler atılır, kodlar 0..n-1 aralığına sıkıştırılır
+    present, codes = np.unique(combined, return_inverse=True)
+    return codes.astype(np.int64), [combined_names[code] for code in present]
+
+
+def partition_names(data, by):
+    """Her satırın bölüm adını (ör. 'sabah_zirve|hafta_içi') döndürür."""
+    names = None
+    for key in _partition_keys(by):
+        codes, key_names = _key_codes(data, key)
+        values = np.asarray(key_names, dtype=object)[codes]
+        names = values if names is None else names + '|' + values
+    return names
+
+
+def record_partition_name(record, by):
+    """Tek bir okumanın (sözlük) bölüm adı; `partition_names` ile aynı kurallar."""
+    parts = []
+    try:
+        for key in _partition_keys(by):
+            if key == 'hour_bucket':
+                hour = int(record['hour'])
+                parts.append(next(name for name, (start, stop) in HOUR_BUCKETS.items() if start <= hour < stop))
+            elif key == 'weekend':
+                if record.get('is_weekend') is not None:
+                    weekend = record['is_weekend'] > 0
+                else:
+                    weekend = record['day_of_week'] >= 5
+                parts.append(WEEKEND_NAMES[int(weekend)])
+            else:
+                parts.append(str(record['GEOHASH'])[:GEOHASH_PREFIX_LENGTH])
+    except KeyError as e:
+        raise ValueError(f"Bölüm için eksik alan: {e}") from e
+    return '|'.join(parts)
+
+
+def partition_layout(partitions, by):
+    """Model durumuna kaydedilecek bölüm düzeni (bkz. `cluster_partitions`)."""
+    return {
+        'by': list(_partition_keys(by)),
+        'names': [str(name) for name in partitions.index],
+        'sizes': [int(k) for k in partitions['k']],
+        'offsets': [int(offset) for offset in partitions['offset']],
+    }
+
+
+def partition_indices(names, layout):
+    """Bölüm adlarını düzendeki bölüm sırasına çevirir; bilinmeyen bölümler -1."""
+    return pd.Index(layout['names']).get_indexer(pd.Index(np.asarray(names, dtype=object)))
+
+
+def partition_owners(layout):
+    """Her merkezin ait olduğu bölüm indeksi."""
+    return np.repeat(np.arange(len(layout['sizes'])), layout['sizes'])
+
+
+def assign_within_partitions(X, centers, row_partitions, layout, **options):
+    """Her satırı yalnızca kendi bölümünün merkezleri arasında en yakın merkeze atar.
+
+    Args:
+        X: (n, d) ölçeklenmiş matris.
+        centers: Bölüm sırasıyla birleştirilmiş (toplam_k, d) merkezler.
+        row_partitions: Satır başına bölüm indeksi (`partition_indices`); -1 olan
+            satırlar (eğitimde görülmemiş bölüm) tüm merkezler arasında atanır.
+        layout: `partition_layout` çıktısı.
+        **options: `assign_to_centroids` seçenekleri.
+
+    Returns:
+        (labels, distances) - global int32 etiketler ve float32 mesafeler.
+    """
+    centers = np.asarray(centers)
+    row_partitions = np.asarray(row_partitions)
+    labels = np.empty(len(X), dtype=np.int32)
+    distances = np.empty(len(X), dtype=np.float32)
+    groups = [(-1, slice(None))] + [(p, slice(offset, offset + size)) for p, (offset, size)
+                                    in enumerate(zip(layout['offsets'], layout['sizes']))]
+    for partition, columns in groups:
+        rows = np.flatnonzero(row_partitions == partition)
+        if len(rows) == 0:
+            continue
+        local, local_distances = assign_to_centroids(np.asarray(X[rows]), centers[columns], **options)
+        labels[rows] = local + (columns.start or 0)
+        distances[rows] = local_distances
+    return labels, distances
+
+
+def _init_partition_worker():
+    # Ölçümler ana süreçte bölüm özeti olarak kaydedilir
+    configure(metrics_path=None, reset=True)
+
+
+def _fit_partition(source, rows, max_k, metric, metric_options):
+    """Tek bir bölümde K'yı seçer ve modeli eğitir (işçi süreçte çalışır).
+
+    Returns:
+        (labels, centers, özet) - yerel etiketler, merkezler ve K/skor/süre özeti.
+    """
+    started = time.perf_counter()
+    X = np.asarray(attach_matrix(source)[rows])
+    max_k = min(max_k, len(X) - 1)
+
+    if len(X) < MIN_PARTITION_ROWS or max_k < 2:
+        labels = np.zeros(len(X), dtype=np.int32)
+        centers = X.mean(axis=0, keepdims=True, dtype=np.float64)
+        return labels, centers, {'rows': len(X), 'k': 1, 'score': None,
+                                 'seconds': round(time.perf_counter() - started, 3)}
+
+    # Bölüm başına ayrıntılı çıktılar bastırılır; ana süreç tek satır özet yazar
+    with threadpool_limits(limits=1), contextlib.redirect_stdout(io.StringIO()):
+        inertia, scores = determine_optimal_clusters(X, max_k=max_k, n_jobs=1, metric=metric,
+                                                     metric_options=metric_options)
+        k = select_optimal_k(scores, metric) if len(scores) > 0 else 2
+        labels, centers = perform_kmeans_clustering(X, k, return_centers=True)
+    score = scores[k - 2] if len(scores) >= k - 1 else None
+    return np.asarray(labels, dtype=np.int32), centers, {
+        'rows': len(X), 'k': int(k), 'score': None if score is None else float(score),
+        'seconds': round(time.perf_counter() - started, 3)}
+
+
+def cluster_partitions(data, X, by, max_k=6, metric='silhouette_sampled', metric_options=None, n_jobs=-1):
+    """Her bölümde bağımsız K seçip kümeler ve sonuçları global etiketlere birleştirir.
+
+    Args:
+        data: Bölüm anahtarlarını içeren işlenmiş veri (satır sırası `X` ile aynı).
+        X: Ölçeklenmiş özellik matrisi; `feature_matrix` dosyası ise işçiler onu eşler,
+            değilse (paralel çalışmada) bir kez geçici `.npy` dosyasına yazılır.
+        by: Bölüm anahtarı (bkz. `partition_codes`).
+        max_k: Bölüm başına denenecek en büyük K.
+        metric, metric_options: K seçimi için kalite metriği (bkz. cluster_quality).
+        n_jobs: Süreç sayısı (-1: tüm çekirdekler).
+
+    Returns:
+        (labels, centers, partitions) - global int32 etiketler, (toplam_k, d) merkezler ve
+        bölüm indeksli özet tablosu (rows, k, score, offset, seconds).
+    """
+    codes, names = partition_codes(data, by)
+    if n_jobs is None or n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = min(n_jobs, len(names))
+    print(f"🧩 {len(names)} bölümde ({by}) ayrı kümeleme yapılıyor, {n_jobs} süreç...")
+
+    # Bölüm satırları sıralı tutulur; bellek eşlemesinden ardışık okunur
+    order = np.argsort(codes, kind='stable')
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(names)))])
+    part_rows = [order[bounds[p]:bounds[p + 1]] for p in range(len(names))]
+
+    shared_dir = None
+    source = shared_source(X)
+    if n_jobs > 1 and not isinstance(source, str):
+        shared_dir = tempfile.mkdtemp(prefix='partitioned_')
+        source = os.path.join(shared_dir, 'features.npy')
+        np.save(source, np.ascontiguousarray(X, dtype=np.float32))
+
+    args = [(source, rows, max_k, metric, metric_options or {}) for rows in part_rows]
+    try:
+        if n_jobs == 1:
+            results = [_fit_partition(*task) for task in args]
+        else:
+            # Büyük bölümler önce gönderilir ki son işçi tek başına beklemesin
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_partition_worker) as executor:
+                futures = {p: executor.submit(_fit_partition, *args[p])
+                           for p in sorted(range(len(names)), key=lambda p: -len(part_rows[p]))}
+                results = [futures[p].result() for p in range(len(names))]
+    finally:
+        if shared_dir is not None:
+            shutil.rmtree(shared_dir, ignore_errors=True)
+
+    labels = np.empty(len(codes), dtype=np.int32)
+    centers, summaries = [], []
+    offset = 0
+    for name, rows, (local_labels, local_centers, summary) in zip(names, part_rows, results):
+        labels[rows] = local_labels + offset
+        centers.append(np.asarray(local_centers, dtype=np.float64))
+        summaries.append({'partition': name, **summary, 'offset': offset})
+        record_metric('partition_fit', partition=name, **summary)
+        score = f"{summary['score']:.3f}" if summary['score'] is not None else '-'
+        print(f"   ✓ {name}: {summary['rows']:,} satır, K={summary['k']} (skor: {score}, {summary['seconds']:.1f} s)")
+        offset += summary['k']
+
+    partitions = pd.DataFrame(summaries).set_index('partition')
+    print(f"✅ Bölümlenmiş kümeleme tamamlandı: toplam {offset} küme")
+    return labels, np.vstack(centers), partitions
+
+
+def partition_cluster_stats(data, feature_columns, labels, partitions):
+    """Global küme istatistiklerine bölüm bilgisini ekler.
+
+    `partition` ve `local_cluster` sütunları kümenin hangi bölümün kaçıncı
+    kümesi olduğunu, `partition_share` ise bölüm içindeki payını gösterir.
+    """
+    n_clusters = int(partitions['k'].sum())
+    stats = compute_cluster_stats(data, feature_columns, labels, n_clusters)
+    owners = np.repeat(np.arange(len(partitions)), partitions['k'].to_numpy())
+    stats.insert(0, 'partition', partitions.index.to_numpy()[owners])
+    stats.insert(1, 'local_cluster', stats.index.to_numpy() - partitions['offset'].to_numpy()[owners])
+    stats.insert(4, 'partition_share', stats['count'] / partitions['rows'].to_numpy()[owners])
+    return stats
@@ -0,0 +1,216 @@
+"""
+Kaldığı yerden devam edebilen aşama (stage) çalıştırıcısı.
+
+Analiz, her biri adı, bağımlılıkları ve parametreleri olan aşamalardan oluşan
+küçük bir DAG olarak tanımlanır. Her aşamanın anahtarı kendi parametreleri ile
+bağımlılıklarının anahtarlarından türetilir; aşama çıktıları bu anahtar altında
+diske yazılır (checkpoint). Sonraki çalıştırmada anahtarı değişmeyen aşamalar
+atlanır ve çıktıları yalnızca bir sonraki aşama ihtiyaç duyarsa yüklenir.
+
+Checkpoint biçimleri:
+    DataFrame  -> <ad>.parquet
+    np.ndarray -> <ad>.npy (salt okunur bellek eşlemesi olarak yüklenir; zaten
+                  bir `.npy` dosyasını eşleyen diziler yeniden yazılmaz, dosyaya
+                  sabit bağlantı verilir)
+    diğerleri  -> <ad>.joblib
+
+Kod değişiklikleri anahtara girmez; kodu değişen bir aşama `--from` veya
+`--force` ile yeniden çalıştırılmalıdır.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import traceback
+from collections import namedtuple
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from feature_matrix import backing_file
+from instrumentation import track
+
+DEFAULT_CHECKPOINT_DIR = 'data/checkpoints'
+MANIFEST_FILENAME = 'manifest.json'
+
+# func(**bağımlılık_çıktıları) -> {çıktı_adı: değer}; checkpoint=False olan
+# aşamalar (grafikler, yorumlar) her çalıştırmada yeniden çalışır. params bir
+# sözlük veya sözlük döndüren fonksiyondur; fonksiyonlar yalnızca anahtar
+# hesaplanırken çağrılır (ör. ham dosyanın parmak izi)
+Stage = namedtuple('Stage', ['name', 'func', 'deps', 'params', 'checkpoint'], defaults=((), None, True))
+
+
+def _jsonable(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def stage_keys(stages):
+    """Her aşamanın anahtarını bağımlılık sırasıyla hesaplar."""
+    keys = {}
+    for stage in stages:
+        missing = [dep for dep in stage.deps if dep not in keys]
+        if missing:
+            raise ValueError(f"'{stage.name}' aşamasının bağımlılıkları önce tanımlanmalı: {missing}")
+        payload = {
+            'stage': stage.name,
+            'params': (stage.params() if callable(stage.params) else stage.params) or {},
+            'deps': {dep: keys[dep] for dep in stage.deps},
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=_jsonable).encode()
+        keys[stage.name] = hashlib.sha256(encoded).hexdigest()[:16]
+    return keys
+
+
+def _checkpoint_path(checkpoint_dir, name):
+    return os.path.join(checkpoint_dir, name)
+
+
+def _read_manifest(checkpoint_dir, name):
+    path = os.path.join(_checkpoint_path(checkpoint_dir, name), MANIFEST_FILENAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def has_checkpoint(checkpoint_dir, name, key):
+    """Aşamanın bu anahtarla kaydedilmiş bir checkpoint'i var mı?"""
+    manifest = _read_manifest(checkpoint_dir, name)
+    return manifest is not None and manifest['key'] == key
+
+
+def _link_or_copy(source, target):
+    """Dosyaya sabit bağlantı verir; farklı dosya sistemlerinde kopyalar."""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def save_checkpoint(checkpoint_dir, name, key, outputs, elapsed=None):
+    """Aşama çıktılarını kaydeder; yarım kalmış yazmalar geçerli sayılmaz."""
+    path = _checkpoint_path(checkpoint_dir, name)
+    temporary_path = f'{path}.tmp'
+    shutil.rmtree(temporary_path, ignore_errors=True)
+    os.makedirs(temporary_path)
+
+    artifacts = {}
+    for artifact, value in outputs.items():
+        if isinstance(value, pd.DataFrame):
+            value.to_parquet(os.path.join(temporary_path, f'{artifact}.parquet'))
+            artifacts[artifact] = 'parquet'
+        elif isinstance(value, np.ndarray):
+            target = os.path.join(temporary_path, f'{artifact}.npy')
+            source = backing_file(value)
+            if source is not None:
+                _link_or_copy(source, target)
+            else:
+                np.save(target, value)
+            artifacts[artifact] = 'npy'
+        else:
+            joblib.dump(value, os.path.join(temporary_path, f'{artifact}.joblib'))
+            artifacts[artifact] = 'joblib'
+
+    manifest = {'stage': name, 'key': key, 'artifacts': artifacts,
+                'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'seconds': elapsed}
+    with open(os.path.join(temporary_path, MANIFEST_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(temporary_path, path)
+
+
+def load_checkpoint(checkpoint_dir, name):
+    """Aşamanın kayıtlı çıktılarını yükler."""
+    path = _checkpoint_path(checkpoint_dir, name)
+    manifest = _read_manifest(checkpoint_dir, name)
+    outputs = {}
+    for artifact, kind in manifest['artifacts'].items():
+        artifact_path = os.path.join(path, f'{artifact}.{kind}')
+        if kind == 'parquet':
+            outputs[artifact] = pd.read_parquet(artifact_path)
+        elif kind == 'npy':
+            outputs[artifact] = np.load(artifact_path, mmap_mode='r')
+        else:
+            outputs[artifact] = joblib.load(artifact_path)
+    return outputs
+
+
+def _row_count(outputs):
+    """Aşama girdi/çıktılarındaki ilk tablo veya dizinin satır sayısı."""
+    for value in outputs.values():
+        if isinstance(value, (pd.DataFrame, np.ndarray)):
+            return len(value)
+    return None
+
+
+def run_pipeline(stages, checkpoint_dir=DEFAULT_CHECKPOINT_DIR, start=None, stop=None, force=False):
+    """Aşamaları sırayla çalıştırır; anahtarı değişmeyenleri checkpoint'ten atlar.
+
+    Args:
+        stages: Bağımlılık sırasına dizilmiş `Stage` listesi.
+        checkpoint_dir: Checkpoint klasörü.
+        start: Bu aşama ve sonrakiler checkpoint'e bakılmadan yeniden çalıştırılır;
+            öncekiler checkpoint'ten yüklenir (checkpoint yoksa çalıştırılır).
+        stop: Bu aşamadan sonra durulur.
+        force: Tüm aşamaları yeniden çalıştırır.
+
+    Returns:
+        {aşama_adı: durum} - 'run', 'cached', 'failed' veya 'skipped'.
+    """
+    names = [stage.name for stage in stages]
+    for name in (start, stop):
+        if name is not None and name not in names:
+            raise ValueError(f"Bilinmeyen aşama: {name} (seçenekler: {names})")
+    if stop is not None:
+        stages = stages[:names.index(stop) + 1]
+    start_index = names.index(start) if start is not None else len(names)
+
+    keys = stage_keys(stages)
+    outputs = {}
+    status = {}
+
+    def resolve(name):
+        # Atlanan aşamaların çıktıları yalnızca gerektiğinde yüklenir
+        if name not in outputs:
+            outputs[name] = load_checkpoint(checkpoint_dir, name)
+        return outputs[name]
+
+    for index, stage in enumerate(stages):
+        failed_deps = [dep for dep in stage.deps if status.get(dep) in ('failed', 'skipped')]
+        if failed_deps:
+            print(f"⏭️  '{stage.name}' atlandı (başarısız bağımlılık: {', '.join(failed_deps)})")
+            status[stage.name] = 'skipped'
+            continue
+
+        rerun = force or index >= start_index
+        if stage.checkpoint and not rerun and has_checkpoint(checkpoint_dir, stage.name, keys[stage.name]):
+            print(f"⚡ '{stage.name}' aşaması checkpoint'ten atlandı ({keys[stage.name]})")
+            status[stage.name] = 'cached'
+            continue
+
+        try:
+            inputs = {}
+            for dep in stage.deps:
+                inputs.update(resolve(dep))
+            started = time.perf_counter()
+            with track(stage.name, profile=True) as record:
+                result = stage.func(**inputs) or {}
+                record['rows'] = _row_count(inputs) or _row_count(result)
+            elapsed = time.perf_counter() - started
+            outputs[stage.name] = result
+            if stage.checkpoint:
+                save_checkpoint(checkpoint_dir, stage.name, keys[stage.name], result, elapsed)
+            status[stage.name] = 'run'
+        except Exception as e:
+            # Sonraki aşamalar atlanır; hata yeri `--from` ile devam etmeden önce görülebilsin
+            print(f"❌ '{stage.name}' aşaması hatası: {type(e).__name__}: {e}")
+            print(traceback.format_exc())
+            status[stage.name] = 'failed'
+
+    return status
@@ -0,0 +1,381 @@
+"""
+Canlı saatlik okumalar için düşük gecikmeli çevrimiçi etiketleme.
+
+Model durumu klasöründeki ölçekleyici, küme merkezleri ve küme başına trafik
+kalıbı (bkz. incremental.py, `patterns.json`) bir kez yüklenir. Ölçekleme en
+yakın merkez hesabına katlanır:
+
+    ||x·a + b - c||² = ||x·a||² - 2·x·(a·(c - b)) + ||c - b||²
+
+Böylece her okuma için tek bir matris çarpımı ve argmin yeterlidir; ham
+okumalar ölçeklenmeden doğrudan etiketlenir. Model bölümlü kümelemeyle
+kaydedildiyse (`partitions.json`) her okuma önce bölümüne ayrılır ve argmin
+yalnızca o bölümün merkezleri arasında alınır.
+
+    predictor = TrafficPredictor.load('data/model')
+    predictor.predict_one({'DATE_TIME': '2025-01-06 08:00:00', 'AVERAGE_SPEED': 22, ...})
+    labels, distances = predictor.predict(batch)   # (n, d) dizi veya DataFrame
+
+`BatchingPredictor` eş zamanlı asyncio isteklerini kısa bir süre bekletip
+tek partide etiketler; `serve` bunu satır başına bir JSON kaydı alan yerel
+bir TCP sunucusu olarak çalıştırır.
+
+Örnek:
+    python src/predictor.py --serve --port 8765
+    python src/predictor.py --benchmark --rows 200000
+"""
+
+import asyncio
+import json
+import time
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from cluster_stats import center_patterns
+from incremental import DEFAULT_STATE_DIR, load_model_state, load_partitions, load_patterns
+from normalization import inverse_transform, scale_and_offset, scaler_columns
+from partitioned_clustering import (partition_indices, partition_names, partition_owners,
+                                    record_partition_name)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Asenkron ön yüzde bir partinin en fazla bekleme süresi ve boyutu
+MAX_BATCH_DELAY = 0.0005
+MAX_BATCH_SIZE = 1024
+
+# Zaman damgasından türetilen özellikler (time_features.CALENDAR_FEATURES'ın tekil karşılığı)
+TIMESTAMP_FEATURES = {
+    'hour': lambda ts: ts.hour,
+    'day': lambda ts: ts.day,
+    'day_of_week': lambda ts: ts.weekday(),
+    'weekday': lambda ts: ts.weekday(),
+    'month': lambda ts: ts.month,
+    'is_weekend': lambda ts: int(ts.weekday() >= 5),
+}
+
+Prediction = namedtuple('Prediction', ['cluster', 'pattern', 'distance'])
+
+
+def _timestamp(value):
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+
+def _with_time_features(frame, columns):
+    """Eksik zaman sütunlarını `DATE_TIME` sütunundan türeterek ekler."""
+    missing = [col for col in columns if col not in frame.columns]
+    if not missing:
+        return frame
+    unknown = [col for col in missing if col not in TIMESTAMP_FEATURES]
+    if unknown or 'DATE_TIME' not in frame.columns:
+        raise ValueError(f"Eksik sütunlar: {unknown or missing}")
+    timestamps = pd.DatetimeIndex(pd.to_datetime(frame['DATE_TIME']))
+    derived = {'hour': timestamps.hour, 'day': timestamps.day, 'day_of_week': timestamps.dayofweek,
+               'weekday': timestamps.weekday, 'month': timestamps.month,
+               'is_weekend': timestamps.dayofweek >= 5}
+    return frame.assign(**{col: np.asarray(derived[col]) for col in missing})
+
+
+class TrafficPredictor:
+    """Ham okumaları en yakın küme merkezine ve trafik kalıbına atar."""
+
+    def __init__(self, scaler, centers, patterns=None, partitions=None):
+        self.columns = scaler_columns(scaler)
+        centers = np.asarray(centers, dtype=np.float64)
+        self.original_centers = inverse_transform(scaler, centers)
+        if patterns is None:
+            patterns = center_patterns(self.original_centers, self.columns)
+        if len(patterns) != len(centers):
+            raise ValueError(f"Kalıp sayısı ({len(patterns)}) merkez sayısıyla ({len(centers)}) uyuşmuyor")
+        self.patterns = np.asarray(patterns, dtype=object)
+
+        self.partitions = partitions
+        if partitions is not None:
+            self._owner = partition_owners(partitions)
+            if len(self._owner) != len(centers):
+                raise ValueError(f"Bölüm düzenindeki K toplamı ({len(self._owner)}) merkez sayısıyla "
+                                 f"({len(centers)}) uyuşmuyor")
+            self._partition_index = {name: i for i, name in enumerate(partitions['names'])}
+
+        a, b = scale_and_offset(scaler)
+        shifted = centers - b
+        self._scale = np.asarray(a, dtype=np.float64)
+        # x @ weights + bias = ||c - b||² - 2·(x·a)·(c - b); ||x·a||² yalnızca mesafe için eklenir
+        self._weights = np.ascontiguousarray(-2.0 * (self._scale[:, None] * shifted.T))
+        self._bias = np.einsum('ij,ij->i', shifted, shifted)
+
+    @classmethod
+    def load(cls, state_dir=DEFAULT_STATE_DIR):
+        """Model durumu klasöründen (main.py veya incremental.py çıktısı) yükler."""
+        scaler, centers, _ = load_model_state(state_dir)
+        return cls(scaler, centers, load_patterns(state_dir), load_partitions(state_dir))
+
+    @property
+    def n_clusters(self):
+        return len(self._bias)
+
+    def record_vector(self, record):
+        """Tek bir okumayı (sözlük) özellik sırasındaki ham değer vektörüne çevirir.
+
+        Zaman özellikleri (ör. `hour`, `day_of_week`) kayıtta yoksa `DATE_TIME`
+        alanından türetilir.
+        """
+        values = np.empty(len(self.columns), dtype=np.float64)
+        timestamp = None
+        for j, column in enumerate(self.columns):
+            value = record.get(column)
+            if value is None:
+                if column not in TIMESTAMP_FEATURES or record.get('DATE_TIME') is None:
+                    raise ValueError(f"Eksik alan: {column}")
+                if timestamp is None:
+                    timestamp = _timestamp(record['DATE_TIME'])
+                value = TIMESTAMP_FEATURES[column](timestamp)
+            values[j] = value
+        return values
+
+    def record_partition(self, record):
+        """Tek bir okumanın bölüm indeksi; bölümsüz modelde None, görülmemiş bölümde -1."""
+        if self.partitions is None:
+            return None
+        if record.get('hour') is None and record.get('DATE_TIME') is not None:
+            timestamp = _timestamp(record['DATE_TIME'])
+            record = {**record, 'hour': timestamp.hour, 'day_of_week': timestamp.weekday()}
+        return self._partition_index.get(record_partition_name(record, self.partitions['by']), -1)
+
+    def _row_partitions(self, batch, X):
+        if self.partitions is None:
+            return None
+        if isinstance(batch, pd.DataFrame):
+            needed = ['hour'] if 'hour_bucket' in self.partitions['by'] else []
+            if 'weekend' in self.partitions['by'] and 'is_weekend' not in batch.columns:
+                needed.append('day_of_week')
+            names = partition_names(_with_time_features(batch, needed), self.partitions['by'])
+            return partition_indices(names, self.partitions)
+        if len(batch) and isinstance(batch[0], dict):
+            return np.array([self.record_partition(record) for record in batch], dtype=np.int64)
+        # Ham dizide bölüm alanları özellik sütunları arasından okunur
+        names = partition_names(pd.DataFrame(X, columns=self.columns), self.partitions['by'])
+        return partition_indices(names, self.partitions)
+
+    def _mask_partitions(self, scores, row_partitions):
+        # Satırın bölümüne ait olmayan merkezler dışlanır; görülmemiş bölümler (-1) tüm merkezlere bakar
+        known = row_partitions >= 0
+        scores[known] = np.where(self._owner[None, :] == row_partitions[known, None], scores[known], np.inf)
+
+    def _matrix(self, batch):
+        if isinstance(batch, pd.DataFrame):
+            return _with_time_features(batch, self.columns)[self.columns].to_numpy(dtype=np.float64)
+        if len(batch) and isinstance(batch[0], dict):
+            return np.array([self.record_vector(record) for record in batch])
+        X = np.asarray(batch, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != len(self.columns):
+            raise ValueError(f"(n, {len(self.columns)}) boyutlu dizi bekleniyor ({self.columns}), gelen: {X.shape}")
+        return X
+
+    def predict(self, batch):
+        """Bir parti okumayı etiketler.
+
+        Args:
+            batch: Ham birimlerde (n, d) dizi (sütunlar `columns` sırasında),
+                DataFrame veya kayıt (sözlük) listesi.
+
+        Returns:
+            (labels, distances) - int32 etiketler ve ölçeklenmiş uzayda en yakın merkeze mesafe.
+        """
+        X = self._matrix(batch)
+        scores = X @ self._weights
+        scores += self._bias
+        if self.partitions is not None:
+            self._mask_partitions(scores, self._row_partitions(batch, X))
+        labels = scores.argmin(axis=1).astype(np.int32)
+        scaled = X * self._scale
+        nearest = scores[np.arange(len(X)), labels] + np.einsum('ij,ij->i', scaled, scaled)
+        return labels, np.sqrt(np.maximum(nearest, 0.0))
+
+    def patterns_of(self, labels):
+        """Etiketlerin trafik kalıplarını döndürür."""
+        return self.patterns[np.asarray(labels)]
+
+    def predict_records(self, records):
+        """Kayıt listesini etiketler ve her kayıt için `Prediction` döndürür."""
+        labels, distances = self.predict(records)
+        return [Prediction(int(label), self.patterns[label], float(distance))
+                for label, distance in zip(labels, distances)]
+
+    def predict_one(self, record):
+        """Tek bir okumayı parti hazırlığı olmadan, en düşük gecikmeyle etiketler."""
+        x = self.record_vector(record)
+        scores = x @ self._weights + self._bias
+        partition = self.record_partition(record)
+        if partition is not None and partition >= 0:
+            scores[self._owner != partition] = np.inf
+        label = int(scores.argmin())
+        scaled = x * self._scale
+        distance = float(np.sqrt(max(scores[label] + scaled @ scaled, 0.0)))
+        return Prediction(label, self.patterns[label], distance)
+
+
+class BatchingPredictor:
+    """Eş zamanlı istekleri kısa bir pencerede biriktirip tek partide etiketleyen asyncio ön yüzü.
+
+    Parti `max_batch_size` dolunca hemen, dolmazsa ilk istekten `max_delay`
+    saniye sonra etiketlenir.
+    """
+
+    def __init__(self, predictor, max_batch_size=MAX_BATCH_SIZE, max_delay=MAX_BATCH_DELAY):
+        self.predictor = predictor
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._pending = []
+        self._timer = None
+        self.batches = 0
+
+    async def predict(self, record):
+        """Kaydı bir sonraki partiye ekler ve sonucunu bekler."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((record, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        self.batches += 1
+
+        try:
+            results = self.predictor.predict_records([record for record, _ in pending])
+        except ValueError:
+            # Hatalı kayıt partinin geri kalanını etkilemesin
+            for record, future in pending:
+                if future.done():
+                    continue
+                try:
+                    future.set_result(self.predictor.predict_one(record))
+                except Exception as e:
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
+
+async def _handle_connection(batcher, reader, writer):
+    """Satır başına bir JSON kaydı okur, sonuçları aynı sırayla yazar."""
+    responses = asyncio.Queue()
+
+    async def respond():
+        while True:
+            task = await responses.get()
+            if task is None:
+                break
+            try:
+                prediction = await task
+                payload = prediction._asdict()
+            except Exception as e:
+                payload = {'error': str(e)}
+            writer.write((json.dumps(payload, ensure_ascii=False) + '\n').encode())
+            await writer.drain()
+
+    responder = asyncio.create_task(respond())
+    try:
+        while line := await reader.readline():
+            if not line.strip():
+                continue
+            try:
+                task = asyncio.ensure_future(batcher.predict(json.loads(line)))
+            except json.JSONDecodeError as e:
+                task = asyncio.get_running_loop().create_future()
+                task.set_exception(ValueError(f"Geçersiz JSON: {e}"))
+            await responses.put(task)
+    finally:
+        await responses.put(None)
+        await responder
+        writer.close()
+
+
+async def serve(predictor, host=DEFAULT_HOST, port=DEFAULT_PORT, **batch_options):
+    """Yerel test sunucusu: her satır bir JSON okuma, her yanıt bir JSON sonuç satırı."""
+    batcher = BatchingPredictor(predictor, **batch_options)
+    server = await asyncio.start_server(lambda r, w: _handle_connection(batcher, r, w), host, port)
+    print(f"🛰️  Etiketleme sunucusu dinleniyor: {host}:{port} ({predictor.n_clusters} küme)")
+    async with server:
+        await server.serve_forever()
+
+
+def benchmark_predictor(predictor, rows=200_000, batch_size=MAX_BATCH_SIZE, single=10_000, seed=42):
+    """Tekil gecikme (p50/p99) ve parti işlem hızını ölçer.
+
+    Okumalar merkezlerin orijinal birimdeki değerleri etrafında rastgele üretilir.
+    """
+    rng = np.random.default_rng(seed)
+    centers = predictor.original_centers
+    # Ölçeklenmiş uzayda birim gürültü (standart ölçekleyicide bir standart sapma)
+    noise = rng.normal(0.0, 1.0, (rows, centers.shape[1])) / predictor._scale
+    X = centers[rng.integers(predictor.n_clusters, size=rows)] + noise
+    if 'hour' in predictor.columns:
+        # Bölümlü modelde saat geçerli bir saat dilimine düşmeli
+        hour = predictor.columns.index('hour')
+        X[:, hour] = np.clip(np.round(X[:, hour]), 0, 23)
+    records = [dict(zip(predictor.columns, row)) for row in X[:single]]
+
+    latencies = np.empty(len(records))
+    for i, record in enumerate(records):
+        start = time.perf_counter()
+        predictor.predict_one(record)
+        latencies[i] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for offset in range(0, rows, batch_size):
+        predictor.predict(X[offset:offset + batch_size])
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        'single_p50_us': round(float(np.percentile(latencies, 50)) * 1e6, 2),
+        'single_p99_us': round(float(np.percentile(latencies, 99)) * 1e6, 2),
+        'batch_size': batch_size,
+        'batch_rows_per_second': round(rows / batch_seconds),
+    }
+
+
+# Örnek kullanım: python src/predictor.py --serve  |  python src/predictor.py --benchmark
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Kayıtlı model ile canlı okumaları etiketler.")
+    parser.add_argument('--state-dir', default=DEFAULT_STATE_DIR)
+    parser.add_argument('--serve', action='store_true', help="Yerel JSON-lines TCP sunucusunu başlat")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--benchmark', action='store_true', help="Gecikme ve işlem hızını ölç")
+    parser.add_argument('--rows', type=int, default=200_000)
+    args = parser.parse_args()
+
+    predictor = TrafficPredictor.load(args.state_dir)
+    if args.serve:
+        try:
+            asyncio.run(serve(predictor, args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+    elif args.benchmark:
+        for name, value in benchmark_predictor(predictor, rows=args.rows).items():
+            print(f"⏱️  {name:<24} {value}")
+    else:
+        # Standart girdiden satır başına bir JSON kaydı
+        import sys
+
+        for line in sys.stdin:
+            if line.strip():
+                print(json.dumps(predictor.predict_one(json.loads(line))._asdict(), ensure_ascii=False))
@@ -0,0 +1,117 @@
+"""
+Kalıcı 2B PCA izdüşümü.
+
+Görselleştirme için PCA her çalıştırmada eldeki örneklem üzerinde yeniden
+eğitilirse eksenler çalıştırmadan çalıştırmaya değişir. Burada izdüşüm tam
+ölçeklenmiş matris üzerinde parça parça (IncrementalPCA) veya rastgeleleştirilmiş
+SVD ile bir kez eğitilir, model durumu klasörüne kaydedilir ve sonraki aylar
+aynı eksenlere izdüşürülür. Dönüşüm sabit boyutlu partilerle yapılır; bellek
+kullanımı satır sayısından bağımsızdır. sklearn.decomposition yalnızca eğitimde
+ve kayıtlı dizilerden model kurulurken yüklenir.
+"""
+
+import os
+
+import joblib
+import numpy as np
+
+PROJECTION_FILENAME = 'projection.joblib'
+PROJECTION_BATCH_SIZE = 100_000
+
+# Rastgeleleştirilmiş PCA'nın eğitildiği en fazla satır (tabakasız düzgün örneklem)
+RANDOMIZED_SAMPLE_SIZE = 500_000
+
+PROJECTION_METHODS = ('incremental', 'randomized')
+
+
+def fit_projection(X, n_components=2, method='incremental', batch_size=PROJECTION_BATCH_SIZE,
+                   random_state=42):
+    """Ölçeklenmiş matris üzerinde izdüşümü eğitir.
+
+    Args:
+        X: (n, d) ölçeklenmiş matris (bellek eşlemeli olabilir).
+        method: 'incremental' - tüm satırlar `batch_size`'lık partilerle `partial_fit`;
+            'randomized' - en fazla RANDOMIZED_SAMPLE_SIZE satırlık örneklemde randomized SVD.
+        batch_size: Parti boyutu.
+    """
+    if method not in PROJECTION_METHODS:
+        raise ValueError(f"Bilinmeyen izdüşüm yöntemi: {method} (seçenekler: {list(PROJECTION_METHODS)})")
+
+    from sklearn.decomposition import PCA, IncrementalPCA
+
+    print(f"🧭 PCA izdüşümü eğitiliyor ({method}, {len(X):,} satır)...")
+    if method == 'incremental':
+        projection = IncrementalPCA(n_components=n_components)
+        for start in range(0, len(X), batch_size):
+            batch = np.asarray(X[start:start + batch_size], dtype=np.float64)
+            # Son parti bileşen sayısından küçükse partial_fit hata verir
+            if len(batch) >= n_components:
+                projection.partial_fit(batch)
+    else:
+        rng = np.random.default_rng(random_state)
+        if len(X) > RANDOMIZED_SAMPLE_SIZE:
+            rows = np.sort(rng.choice(len(X), RANDOMIZED_SAMPLE_SIZE, replace=False))
+        else:
+            rows = slice(None)
+        projection = PCA(n_components=n_components, svd_solver='randomized', random_state=random_state)
+        projection.fit(np.asarray(X[rows], dtype=np.float64))
+
+    ratios = ', '.join(f'{ratio:.1%}' for ratio in projection.explained_variance_ratio_)
+    print(f"✅ İzdüşüm hazır (açıklanan varyans: {ratios})")
+    return projection
+
+
+def project(projection, X, batch_size=PROJECTION_BATCH_SIZE, dtype=np.float32):
+    """Matrisi partiler halinde izdüşürür.
+
+    Sonuç önceden ayrılan tek bir (n, k) diziye yazılır; partiler dışında
+    ara kopya oluşmaz.
+    """
+    components = projection.components_.T.astype(dtype)
+    mean = projection.mean_.astype(dtype)
+    result = np.empty((len(X), components.shape[1]), dtype=dtype)
+    for start in range(0, len(X), batch_size):
+        batch = np.asarray(X[start:start + batch_size], dtype=dtype) - mean
+        np.matmul(batch, components, out=result[start:start + batch_size])
+    return result
+
+
+def projection_arrays(projection):
+    """İzdüşümü model önbelleğine yazılabilecek dizilere ayırır."""
+    return {
+        'components': projection.components_,
+        'mean': projection.mean_,
+        'explained_variance': projection.explained_variance_,
+        'explained_variance_ratio': projection.explained_variance_ratio_,
+    }
+
+
+def projection_from_arrays(arrays):
+    """`projection_arrays` çıktısından eğitilmiş bir PCA nesnesi oluşturur."""
+    from sklearn.decomposition import PCA
+
+    components = np.asarray(arrays['components'])
+    projection = PCA(n_components=components.shape[0])
+    projection.components_ = components
+    projection.mean_ = np.asarray(arrays['mean'])
+    projection.explained_variance_ = np.asarray(arrays['explained_variance'])
+    projection.explained_variance_ratio_ = np.asarray(arrays['explained_variance_ratio'])
+    projection.n_components_ = components.shape[0]
+    projection.n_features_in_ = components.shape[1]
+    return projection
+
+
+def save_projection(projection, state_dir):
+    """İzdüşümü model durumu klasörüne kaydeder."""
+    os.makedirs(state_dir, exist_ok=True)
+    path = os.path.join(state_dir, PROJECTION_FILENAME)
+    joblib.dump(projection, path)
+    print(f"💾 PCA izdüşümü kaydedildi: {path}")
+
+
+def load_projection(state_dir):
+    """Kayıtlı izdüşümü yükler; yoksa None döndürür."""
+    path = os.path.join(state_dir, PROJECTION_FILENAME)
+    if not os.path.exists(path):
+        return None
+    return joblib.load(path)
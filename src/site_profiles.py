@@ -0,0 +1,109 @@
+"""
+Konum (GEOHASH) bazında trafik profilleri.
+
+Her saatlik okuma yerine her konumu kümelemek için işlenmiş veri, konum
+başına tek satırlık bir profile dönüştürülür: haftanın her saati (7 × 24 =
+168 dilim) için ortalama hız ve ortalama araç sayısı. Toplamlar Python
+döngüsü olmadan `np.bincount` ile tek geçişte hesaplanır. 1.7M satırlık
+problem birkaç bin satıra indiği için K seçimi tam silhouette ile yapılabilir.
+"""
+
+import numpy as np
+import pandas as pd
+
+from cluster_quality import select_optimal_k
+from clustering_analysis import determine_optimal_clusters, perform_kmeans_clustering
+from normalization import fit_scaler, transform_features
+
+HOURS_PER_WEEK = 7 * 24
+PROFILE_VALUE_COLUMNS = ['AVERAGE_SPEED', 'NUMBER_OF_VEHICLES']
+
+# GEOHASH yoksa konumlar bu hassasiyette (≈100 m) yuvarlanmış koordinatlarla belirlenir
+COORDINATE_DECIMALS = 3
+
+
+def _site_codes(df, site_column):
+    """Her satırın konum kodunu ve konum etiketlerini döndürür."""
+    if site_column in df.columns:
+        return pd.factorize(df[site_column])
+
+    scale = 10 ** COORDINATE_DECIMALS
+    lat = np.rint(df['LATITUDE'].to_numpy(np.float64) * scale).astype(np.int64)
+    lon = np.rint(df['LONGITUDE'].to_numpy(np.float64) * scale).astype(np.int64)
+    codes, uniques = pd.factorize(lat * 10 ** 9 + lon)
+    sites = [f'{key // 10 ** 9 / scale:.{COORDINATE_DECIMALS}f},{key % 10 ** 9 / scale:.{COORDINATE_DECIMALS}f}'
+             for key in uniques]
+    return codes, pd.Index(sites)
+
+
+def build_site_profiles(df, site_column='GEOHASH', value_columns=None):
+    """İşlenmiş veriden konum başına haftalık saat profillerini oluşturur.
+
+    Args:
+        df: `hour` ve `day_of_week` sütunlarını içeren işlenmiş veri.
+        site_column: Konum sütunu; yoksa yuvarlanmış LATITUDE/LONGITUDE kullanılır.
+        value_columns: Profili oluşturan ölçümler (varsayılan: ortalama hız ve araç sayısı).
+
+    Returns:
+        (profiles, profile_columns) - konum indeksli DataFrame (profil sütunları,
+        LATITUDE, LONGITUDE ve okuma sayısı) ve kümelemede kullanılacak sütunlar.
+    """
+    value_columns = value_columns or [col for col in PROFILE_VALUE_COLUMNS if col in df.columns]
+    print(f"📍 Konum profilleri oluşturuluyor ({site_column}, {len(value_columns)} ölçüm × {HOURS_PER_WEEK} saat)...")
+
+    codes, sites = _site_codes(df, site_column)
+    n_sites = len(sites)
+    slots = df['day_of_week'].to_numpy(np.int64) * 24 + df['hour'].to_numpy(np.int64)
+    cells = codes.astype(np.int64) * HOURS_PER_WEEK + slots
+    n_cells = n_sites * HOURS_PER_WEEK
+
+    counts = np.bincount(cells, minlength=n_cells).reshape(n_sites, HOURS_PER_WEEK)
+    site_counts = counts.sum(axis=1)
+
+    blocks = []
+    profile_columns = []
+    for col in value_columns:
+        values = df[col].to_numpy(np.float64)
+        sums = np.bincount(cells, weights=values, minlength=n_cells).reshape(n_sites, HOURS_PER_WEEK)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / counts
+            # Okuması olmayan saatler konumun genel ortalamasıyla doldurulur
+            site_means = sums.sum(axis=1) / site_counts
+        means = np.where(counts > 0, means, site_means[:, None])
+        blocks.append(means)
+        profile_columns += [f'{col}_h{slot:03d}' for slot in range(HOURS_PER_WEEK)]
+
+    profiles = pd.DataFrame(np.hstack(blocks).astype(np.float32), index=sites, columns=profile_columns)
+    profiles.index.name = site_column if site_column in df.columns else 'site'
+    for coordinate in ('LATITUDE', 'LONGITUDE'):
+        if coordinate in df.columns:
+            profiles[coordinate] = (np.bincount(codes, weights=df[coordinate].to_numpy(np.float64),
+                                                minlength=n_sites) / site_counts).astype(np.float32)
+    profiles['n_readings'] = site_counts
+
+    print(f"✅ {len(df):,} okuma -> {n_sites:,} konum profili")
+    return profiles, profile_columns
+
+
+def cluster_site_profiles(profiles, profile_columns, max_k=8, metric='silhouette', n_clusters=None, n_jobs=1):
+    """Konum profillerini kümeler ve her konuma küme etiketi ekler.
+
+    Konum sayısı küçük olduğundan varsayılan olarak tam silhouette ile K seçilir.
+    `n_clusters` verilirse tarama atlanır.
+
+    Returns:
+        (profiles, inertia, scores) - `cluster` sütunu eklenmiş profiller ve tarama eğrileri.
+    """
+    scaler = fit_scaler(profiles, profile_columns)
+    X = transform_features(profiles, scaler)
+
+    inertia, scores = [], []
+    if n_clusters is None:
+        max_k = min(max_k, len(profiles) - 1)
+        inertia, scores = determine_optimal_clusters(X, max_k=max_k, n_jobs=n_jobs, metric=metric)
+        n_clusters = select_optimal_k(scores, metric) if scores else 2
+
+    profiles = profiles.copy()
+    profiles['cluster'] = perform_kmeans_clustering(X, n_clusters)
+    print(f"✅ {len(profiles):,} konum {n_clusters} kümeye ayrıldı")
+    return profiles, inertia, scores
@@ -0,0 +1,76 @@
+"""
+Zaman damgalarından takvim özelliklerinin hızlı çıkarımı.
+
+Saatlik veride ayda yalnızca ~744 farklı zaman damgası vardır. Bu yüzden
+damgalar tamsayı kodlara ayrılır (factorize), ayrıştırma ve takvim
+hesapları yalnızca benzersiz değerler üzerinde yapılır, sonuçlar kodlar
+aracılığıyla tüm satırlara geri dağıtılır.
+"""
+
+import numpy as np
+import pandas as pd
+
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Özellik adı -> DatetimeIndex üzerinde hesaplayan fonksiyon
+CALENDAR_FEATURES = {
+    'hour': lambda idx: idx.hour,
+    'day': lambda idx: idx.day,
+    'day_of_week': lambda idx: idx.dayofweek,
+    'weekday': lambda idx: idx.weekday,
+    'month': lambda idx: idx.month,
+    'is_weekend': lambda idx: idx.dayofweek >= 5,
+}
+DEFAULT_FEATURES = ('hour', 'day_of_week', 'month', 'is_weekend')
+
+# Geçersiz (NaT) zaman damgaları için özellik değeri
+MISSING_VALUE = -1
+
+
+def _parse_unique(values, format):
+    """Benzersiz değerleri açık formatla ayrıştırır, uymazsa genel ayrıştırıcıya düşer."""
+    try:
+        return pd.to_datetime(values, format=format)
+    except (ValueError, TypeError):
+        return pd.to_datetime(values)
+
+
+def factorize_timestamps(series, format=DATETIME_FORMAT):
+    """Zaman damgalarını (kodlar, benzersiz DatetimeIndex) çiftine ayırır.
+
+    Metin sütunlarında ayrıştırma yalnızca benzersiz değerler için yapılır.
+    Eksik değerlerin kodu -1'dir.
+    """
+    codes, uniques = pd.factorize(series)
+    if not isinstance(uniques, pd.DatetimeIndex):
+        uniques = pd.DatetimeIndex(_parse_unique(uniques, format))
+    return codes, uniques
+
+
+def parse_timestamps(series, format=DATETIME_FORMAT):
+    """Zaman damgası sütununu benzersiz değerler üzerinden ayrıştırır."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    codes, uniques = factorize_timestamps(series, format)
+    # Sona eklenen NaT, -1 kodlu (eksik) satırlara karşılık gelir
+    values = np.append(uniques.values, np.datetime64('NaT'))
+    return pd.Series(values.take(codes), index=series.index, name=series.name)
+
+
+def add_calendar_features(df, column, features=DEFAULT_FEATURES, format=DATETIME_FORMAT):
+    """`column` sütunundan takvim özelliklerini int8 sütunlar olarak ekler.
+
+    Sütun metin ise ayrıştırılmış datetime değerleriyle değiştirilir. Her özellik
+    yalnızca benzersiz zaman damgaları için hesaplanır ve kodlarla dağıtılır.
+    """
+    codes, uniques = factorize_timestamps(df[column], format)
+
+    if not pd.api.types.is_datetime64_any_dtype(df[column]):
+        values = np.append(uniques.values, np.datetime64('NaT'))
+        df[column] = values.take(codes)
+
+    for name in features:
+        per_unique = np.asarray(CALENDAR_FEATURES[name](uniques), dtype=np.int8)
+        per_unique = np.append(per_unique, np.int8(MISSING_VALUE))
+        df[name] = per_unique.take(codes)
+    return df
@@ -1,7 +1,7 @@
 def load_data(file_path):
-    import pandas as pd
-    """Veri dosyasını yükler."""
-    return pd.read_csv(file_path)
+    """Veri dosyasını ortak yükleme katmanı üzerinden yükler."""
+    from ingestion import load_traffic_data
+    return load_traffic_data(file_path)
 
 def save_data(data, file_path):
     """Veri çerçevesini belirtilen dosya yoluna kaydeder."""
@@ -9,11 +9,8 @@ def save_data(data, file_path):
 
 def preprocess_datetime(df, datetime_column):
     """Tarih-saat bilgisini işleyerek yeni özellikler ekler."""
-    df[datetime_column] = pd.to_datetime(df[datetime_column])
-    df['hour'] = df[datetime_column].dt.hour
-    df['day'] = df[datetime_column].dt.day
-    df['weekday'] = df[datetime_column].dt.weekday
-    return df
+    from time_features import add_calendar_features
+    return add_calendar_features(df, datetime_column, features=('hour', 'day', 'weekday'))
 
 def normalize_data(df):
     """Veri çerçevesindeki sayısal verileri normalize eder."""
@@ -1,163 +1,473 @@
+"""
+Küme grafikleri ve harita.
+
+matplotlib, folium ve sklearn PCA ilk kullanımda yüklenir; bu modülü içe
+aktarmak çizim arka uçlarını yüklemez. Böylece yalnızca kümeleme, etiketleme
+veya istatistik yapan komutlar grafik kütüphanelerinin açılış süresini ödemez.
+"""
+
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.decomposition import PCA
-import folium
 import numpy as np
 import os
+import sys
+
+from instrumentation import instrumented
+from cluster_stats import compute_cluster_stats, feature_stat
+from compression import unique_row_groups
+from projection import project
+
+# Grafik çıktı ayarları (bkz. configure_rendering); show=False iken plt.show() çağrılmaz.
+# backend None değilse pyplot ilk yüklendiğinde bu arka uç seçilir.
+RENDER_SETTINGS = {'dpi': 300, 'format': 'png', 'show': True, 'backend': None}
+
+CLUSTER_COLORS = ['red', 'blue', 'green', 'orange', 'purple', 'brown', 'pink', 'gray']
 
-plt.style.use('default')
+def _pyplot():
+    """matplotlib.pyplot'u ilk kullanımda yükler ve ayarlanan arka ucu uygular."""
+    first_use = 'matplotlib.pyplot' not in sys.modules
+    if first_use and RENDER_SETTINGS['backend'] is not None:
+        import matplotlib
+        matplotlib.use(RENDER_SETTINGS['backend'])
+    import matplotlib.pyplot as plt
+    if first_use:
+        plt.style.use('default')
+    return plt
+
+def configure_rendering(dpi=None, fmt=None, headless=None):
+    """Grafiklerin çözünürlüğünü, dosya biçimini ve ekranda gösterilip gösterilmeyeceğini ayarlar.
+
+    `headless=True` etkileşimsiz Agg arka ucuna geçer ve `plt.show()` çağrılarını kapatır.
+    """
+    if dpi is not None:
+        RENDER_SETTINGS['dpi'] = dpi
+    if fmt is not None:
+        RENDER_SETTINGS['format'] = fmt
+    if headless is not None:
+        RENDER_SETTINGS['show'] = not headless
+        if headless:
+            RENDER_SETTINGS['backend'] = 'Agg'
+            # pyplot henüz yüklenmediyse arka uç ilk kullanımda seçilir
+            if 'matplotlib.pyplot' in sys.modules:
+                sys.modules['matplotlib.pyplot'].switch_backend('Agg')
+
+def _save_figure(fig, name, message):
+    """Grafiği results/graphs altına kaydeder, gerekirse gösterir ve kapatır."""
+    plt = _pyplot()
+    os.makedirs('results/graphs', exist_ok=True)
+    path = f"results/graphs/{name}.{RENDER_SETTINGS['format']}"
+    fig.savefig(path, dpi=RENDER_SETTINGS['dpi'], bbox_inches='tight')
+    print(message)
+    if RENDER_SETTINGS['show']:
+        plt.show()
+    plt.close(fig)
+    return path
 
-def plot_cluster_characteristics(data, feature_columns):
-    """Her kümenin özelliklerini görselleştirir."""
+def render_cluster_characteristics(cluster_means):
+    """Küme × özellik ortalamalar tablosundan çubuk grafikleri çizer."""
+    plt = _pyplot()
+    feature_columns = list(cluster_means.columns)
+    n_features = len(feature_columns)
+    
+    # Grafik boyutunu ayarla
+    cols = min(3, n_features)
+    rows = (n_features + cols - 1) // cols
+    
+    fig, axes = plt.subplots(rows, cols, figsize=(15, 5*rows))
+    axes = np.atleast_1d(axes).flatten()
+    
+    # Her özellik için grafik çiz
+    colors = CLUSTER_COLORS
+    
+    for i, feature in enumerate(feature_columns):
+        bars = axes[i].bar(cluster_means.index, cluster_means[feature], 
+                         color=[colors[j % len(colors)] for j in cluster_means.index])
+        axes[i].set_title(f'Kümelere Göre {feature}', fontsize=12, fontweight='bold')
+        axes[i].set_xlabel('Küme')
+        axes[i].set_ylabel(f'Ortalama {feature}')
+        
+        # Değerleri bar üzerine yaz
+        for bar in bars:
+            height = bar.get_height()
+            axes[i].text(bar.get_x() + bar.get_width()/2., height + height*0.01,
+                       f'{height:.2f}', ha='center', va='bottom')
+    
+    # Boş grafikleri gizle
+    for i in range(n_features, len(axes)):
+        axes[i].set_visible(False)
+    
+    fig.tight_layout()
+    return _save_figure(fig, 'cluster_characteristics', "✓ Küme karakteristikleri grafiği kaydedildi")
+
+def _cluster_means(data, feature_columns, stats=None):
+    if stats is None:
+        stats = compute_cluster_stats(data, feature_columns, quantiles=())
+    return feature_stat(stats, feature_columns, 'mean').round(3)
+
+@instrumented()
+def plot_cluster_characteristics(data, feature_columns, stats=None):
+    """Her kümenin özelliklerini görselleştirir.
+
+    `stats` (bkz. cluster_stats.compute_cluster_stats) verilirse ortalamalar
+    yeniden hesaplanmaz.
+    """
     try:
-        n_features = len(feature_columns)
-        if n_features == 0:
+        if len(feature_columns) == 0:
             print("⚠️ Görselleştirilecek özellik bulunamadı")
             return None
-            
-        # Grafik boyutunu ayarla
-        cols = min(3, n_features)
-        rows = (n_features + cols - 1) // cols
-        
-        fig, axes = plt.subplots(rows, cols, figsize=(15, 5*rows))
-        if rows == 1 and cols == 1:
-            axes = [axes]
-        elif rows == 1:
-            axes = [axes]
-        else:
-            axes = axes.flatten()
         
         # Küme istatistikleri
-        cluster_stats = data.groupby('cluster')[feature_columns].mean().round(3)
-        
-        # Her özellik için grafik çiz
-        colors = ['red', 'blue', 'green', 'orange', 'purple', 'brown', 'pink', 'gray']
-        
-        for i, feature in enumerate(feature_columns):
-            if i < len(axes):
-                bars = axes[i].bar(cluster_stats.index, cluster_stats[feature], 
-                                 color=[colors[j % len(colors)] for j in cluster_stats.index])
-                axes[i].set_title(f'Kümelere Göre {feature}', fontsize=12, fontweight='bold')
-                axes[i].set_xlabel('Küme')
-                axes[i].set_ylabel(f'Ortalama {feature}')
-                
-                # Değerleri bar üzerine yaz
-                for bar in bars:
-                    height = bar.get_height()
-                    axes[i].text(bar.get_x() + bar.get_width()/2., height + height*0.01,
-                               f'{height:.2f}', ha='center', va='bottom')
-        
-        # Boş grafikleri gizle
-        for i in range(len(feature_columns), len(axes)):
-            axes[i].set_visible(False)
-        
-        plt.tight_layout()
-        os.makedirs('results/graphs', exist_ok=True)
-        plt.savefig('results/graphs/cluster_characteristics.png', dpi=300, bbox_inches='tight')
-        print("✓ Küme karakteristikleri grafiği kaydedildi")
-        plt.show()
+        cluster_stats = _cluster_means(data, feature_columns, stats)
+        render_cluster_characteristics(cluster_stats)
         
         return cluster_stats
     except Exception as e:
         print(f"Cluster characteristics plot hatası: {e}")
         return None
 
-def plot_cluster_analysis(data, inertia, silhouette_scores):
-    """Küme analizi sonuçlarını görselleştirir."""
+def render_cluster_analysis(inertia, silhouette_scores, score_label='Silhouette Skoru'):
+    """Elbow ve kalite metriği eğrilerini çizer."""
+    plt = _pyplot()
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+    
+    # Elbow Method
+    k_range = range(2, len(inertia) + 2)
+    ax1.plot(k_range, inertia, 'bo-', linewidth=2, markersize=8)
+    ax1.set_title('Elbow Method - Optimal Küme Sayısı', fontsize=14, fontweight='bold')
+    ax1.set_xlabel('Küme Sayısı (k)', fontsize=12)
+    ax1.set_ylabel('Inertia', fontsize=12)
+    ax1.grid(True, alpha=0.3)
+    
+    # Silhouette Scores (veya seçilen kalite metriği)
+    ax2.plot(k_range, silhouette_scores, 'ro-', linewidth=2, markersize=8)
+    ax2.set_title(score_label, fontsize=14, fontweight='bold')
+    ax2.set_xlabel('Küme Sayısı (k)', fontsize=12)
+    ax2.set_ylabel(score_label, fontsize=12)
+    ax2.grid(True, alpha=0.3)
+    
+    fig.tight_layout()
+    return _save_figure(fig, 'cluster_analysis', "✓ Küme analizi grafiği kaydedildi")
+
+@instrumented()
+def plot_cluster_analysis(data, inertia, silhouette_scores, score_label='Silhouette Skoru'):
+    """Küme analizi sonuçlarını görselleştirir.
+
+    `silhouette_scores` yerine başka bir kalite metriği verilirse
+    `score_label` ile ekseni ve başlığı adlandırılır.
+    """
     try:
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-        
-        # Elbow Method
-        k_range = range(2, len(inertia) + 2)
-        ax1.plot(k_range, inertia, 'bo-', linewidth=2, markersize=8)
-        ax1.set_title('Elbow Method - Optimal Küme Sayısı', fontsize=14, fontweight='bold')
-        ax1.set_xlabel('Küme Sayısı (k)', fontsize=12)
-        ax1.set_ylabel('Inertia', fontsize=12)
-        ax1.grid(True, alpha=0.3)
-        
-        # Silhouette Scores
-        ax2.plot(k_range, silhouette_scores, 'ro-', linewidth=2, markersize=8)
-        ax2.set_title('Silhouette Skorları', fontsize=14, fontweight='bold')
-        ax2.set_xlabel('Küme Sayısı (k)', fontsize=12)
-        ax2.set_ylabel('Silhouette Skoru', fontsize=12)
-        ax2.grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        os.makedirs('results/graphs', exist_ok=True)
-        plt.savefig('results/graphs/cluster_analysis.png', dpi=300, bbox_inches='tight')
-        print("✓ Küme analizi grafiği kaydedildi")
-        plt.show()
+        render_cluster_analysis(inertia, silhouette_scores, score_label)
     except Exception as e:
         print(f"Cluster analysis plot hatası: {e}")
 
-def plot_pca_clusters(data, features, labels):
-    """PCA ile kümeleri 2D'de görselleştirir."""
+# Rasterleştirilmiş PCA grafiğinin ızgara çözünürlüğü (piksel)
+PCA_RASTER_BINS = 600
+
+def rasterize_clusters(points, labels, bins=PCA_RASTER_BINS, colors=CLUSTER_COLORS):
+    """2D noktaları küme başına sayım ızgarasına toplar ve tek bir RGB görüntüye boyar.
+
+    Her piksel, içindeki kümelerin renklerinin sayılarla ağırlıklı karışımıdır;
+    opaklık toplam sayının logaritmasıyla artar. Çizim maliyeti nokta sayısından
+    bağımsızdır, yalnızca `bins × bins` ızgaraya bağlıdır.
+
+    Returns:
+        (image, extent) - (bins, bins, 3) float RGB görüntü ve imshow için sınırlar.
+    """
+    from matplotlib.colors import to_rgb
+    
+    points = np.asarray(points)
+    labels = np.asarray(labels, dtype=np.int64)
+    n_clusters = int(labels.max()) + 1
+    palette = np.array([to_rgb(colors[i % len(colors)]) for i in range(n_clusters)])
+    
+    x_min, y_min = points.min(axis=0)
+    x_max, y_max = points.max(axis=0)
+    x_step = (x_max - x_min) / bins or 1.0
+    y_step = (y_max - y_min) / bins or 1.0
+    xi = np.minimum(((points[:, 0] - x_min) / x_step).astype(np.int64), bins - 1)
+    yi = np.minimum(((points[:, 1] - y_min) / y_step).astype(np.int64), bins - 1)
+    
+    # (küme, y, x) sayım küpü tek bir bincount ile
+    counts = np.bincount((labels * bins + yi) * bins + xi, minlength=n_clusters * bins * bins)
+    counts = counts.reshape(n_clusters, bins, bins).astype(np.float64)
+    total = counts.sum(axis=0)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mixed = np.einsum('kyx,kc->yxc', counts, palette) / total[..., None]
+    alpha = np.log1p(total) / np.log1p(total.max())
+    alpha = np.where(total > 0, 0.25 + 0.75 * alpha, 0.0)[..., None]
+    image = np.nan_to_num(mixed) * alpha + (1.0 - alpha)  # beyaz zemin üzerine
+    return image, (x_min, x_max, y_min, y_max)
+
+def render_pca_image(image, extent, clusters, explained_variance_ratio):
+    """Önceden rasterleştirilmiş PCA görüntüsünü (bkz. `rasterize_clusters`) çizer."""
+    from matplotlib.patches import Patch
+    
+    plt = _pyplot()
+    fig = plt.figure(figsize=(12, 8))
+    colors = CLUSTER_COLORS
+    plt.imshow(image, extent=extent, origin='lower', aspect='auto', interpolation='nearest')
+    plt.legend(handles=[Patch(color=colors[i % len(colors)], label=f'Küme {i}') for i in clusters],
+               fontsize=10)
+    _label_pca_axes(explained_variance_ratio)
+    return _save_figure(fig, 'pca_clusters', "✓ PCA küme grafiği kaydedildi")
+
+def _label_pca_axes(explained_variance_ratio):
+    plt = _pyplot()
+    plt.title('PCA ile Küme Görselleştirmesi', fontsize=16, fontweight='bold')
+    plt.xlabel(f'PCA Bileşen 1 (Varyans: {explained_variance_ratio[0]:.1%})', fontsize=12)
+    plt.ylabel(f'PCA Bileşen 2 (Varyans: {explained_variance_ratio[1]:.1%})', fontsize=12)
+    plt.grid(True, alpha=0.3)
+
+def _pca_points(features, projection=None):
+    """(2B noktalar, açıklanan varyans oranları)"""
+    if projection is not None:
+        return project(projection, features), projection.explained_variance_ratio_
+    from sklearn.decomposition import PCA
+    
+    pca = PCA(n_components=2)
+    return pca.fit_transform(features), pca.explained_variance_ratio_
+
+@instrumented()
+def plot_pca_clusters(data, features, labels, mode='scatter', bins=PCA_RASTER_BINS, projection=None):
+    """PCA ile kümeleri 2D'de görselleştirir.
+
+    `mode='raster'` tüm noktaları bir yoğunluk ızgarasına toplayıp tek bir
+    `imshow` ile çizer (bkz. `rasterize_clusters`); milyonlarca satırda bile
+    örnekleme gerekmez. `mode='scatter'` küçük veriler için nokta çizimidir.
+    `projection` verilirse (bkz. src/projection.py) PCA yeniden eğitilmez;
+    kayıtlı eksenler kullanılır ve farklı ayların grafikleri karşılaştırılabilir.
+    """
     try:
-        pca = PCA(n_components=2)
-        pca_result = pca.fit_transform(features)
+        labels = np.asarray(labels)
+        pca_result, variance_ratio = _pca_points(features, projection)
         
-        plt.figure(figsize=(12, 8))
-        colors = ['red', 'blue', 'green', 'orange', 'purple', 'brown', 'pink', 'gray']
+        if mode == 'raster':
+            image, extent = rasterize_clusters(pca_result, labels, bins, CLUSTER_COLORS)
+            print(f"🖼️  {len(pca_result):,} nokta {bins}×{bins} ızgaraya rasterleştirildi")
+            render_pca_image(image, extent, np.unique(labels), variance_ratio)
+            return
         
+        plt = _pyplot()
+        fig = plt.figure(figsize=(12, 8))
+        colors = CLUSTER_COLORS
         for i in range(len(np.unique(labels))):
             cluster_data = pca_result[labels == i]
             if len(cluster_data) > 0:
                 plt.scatter(cluster_data[:, 0], cluster_data[:, 1], 
                            c=colors[i % len(colors)], label=f'Küme {i}', 
                            alpha=0.7, s=100, edgecolors='black', linewidth=0.5)
-        
-        plt.title('PCA ile Küme Görselleştirmesi', fontsize=16, fontweight='bold')
-        plt.xlabel(f'PCA Bileşen 1 (Varyans: {pca.explained_variance_ratio_[0]:.1%})', fontsize=12)
-        plt.ylabel(f'PCA Bileşen 2 (Varyans: {pca.explained_variance_ratio_[1]:.1%})', fontsize=12)
         plt.legend(fontsize=10)
-        plt.grid(True, alpha=0.3)
-        
-        os.makedirs('results/graphs', exist_ok=True)
-        plt.savefig('results/graphs/pca_clusters.png', dpi=300, bbox_inches='tight')
-        print("✓ PCA küme grafiği kaydedildi")
-        plt.show()
+        _label_pca_axes(variance_ratio)
+        _save_figure(fig, 'pca_clusters', "✓ PCA küme grafiği kaydedildi")
     except Exception as e:
         print(f"PCA plot hatası: {e}")
 
-def create_traffic_map(data):
-    """Harita üzerinde kümeleri görselleştirir."""
+# Harita hücre boyutu (derece); 0.005° İstanbul enleminde yaklaşık 400-550 m
+MAP_CELL_SIZE = 0.005
+
+def aggregate_map_cells(latitude, longitude, clusters, speeds=None, cell_size=MAP_CELL_SIZE):
+    """Noktaları mekânsal hücrelere toplar (tamamen NumPy, satır döngüsü yok).
+
+    Her hücre için ağırlık merkezi, nokta sayısı, çoğunluk kümesi, çoğunluk
+    oranı ve (verilirse) ortalama hız hesaplanır.
+
+    Returns:
+        Hücre başına bir değer içeren dizilerden oluşan sözlük.
+    """
+    latitude = np.asarray(latitude, dtype=np.float64)
+    longitude = np.asarray(longitude, dtype=np.float64)
+    clusters = np.asarray(clusters, dtype=np.int64)
+    n_clusters = int(clusters.max()) + 1
+
+    lat_index = np.floor(latitude / cell_size).astype(np.int64)
+    lon_index = np.floor(longitude / cell_size).astype(np.int64)
+    _, cells, counts = unique_row_groups(np.stack([lat_index, lon_index], axis=1))
+    n_cells = len(counts)
+
+    per_cluster = np.bincount(cells * n_clusters + clusters, minlength=n_cells * n_clusters)
+    per_cluster = per_cluster.reshape(n_cells, n_clusters)
+    majority = per_cluster.argmax(axis=1)
+
+    cell_data = {
+        'latitude': np.bincount(cells, weights=latitude, minlength=n_cells) / counts,
+        'longitude': np.bincount(cells, weights=longitude, minlength=n_cells) / counts,
+        'count': counts,
+        'cluster': majority,
+        'share': per_cluster[np.arange(n_cells), majority] / counts,
+    }
+    if speeds is not None:
+        cell_data['mean_speed'] = np.bincount(cells, weights=np.asarray(speeds, dtype=np.float64),
+                                              minlength=n_cells) / counts
+    return cell_data
+
+def _map_columns(data):
+    """Veri çerçevesindeki enlem/boylam sütun adlarını bulur."""
+    for lat_column, lon_column in (('latitude', 'longitude'), ('LATITUDE', 'LONGITUDE')):
+        if lat_column in data.columns and lon_column in data.columns:
+            return lat_column, lon_column
+    return None, None
+
+def _map_cells(data, cell_size=MAP_CELL_SIZE):
+    """Veri çerçevesinden harita hücrelerini hesaplar; koordinat yoksa None."""
+    lat_column, lon_column = _map_columns(data)
+    if lat_column is None:
+        return None
+    speeds = data['AVERAGE_SPEED'].to_numpy() if 'AVERAGE_SPEED' in data.columns else None
+    cells = aggregate_map_cells(data[lat_column].to_numpy(), data[lon_column].to_numpy(),
+                                data['cluster'].to_numpy(), speeds, cell_size)
+    print(f"🗺️  {len(data):,} nokta -> {len(cells['count']):,} harita hücresi")
+    return cells
+
+def render_traffic_map(cells, heatmap=True):
+    """Önceden toplanmış hücrelerden (bkz. `aggregate_map_cells`) haritayı oluşturur ve kaydeder."""
+    import folium
+    
+    # Merkez koordinat hesapla
+    center_lat = float(np.average(cells['latitude'], weights=cells['count']))
+    center_lon = float(np.average(cells['longitude'], weights=cells['count']))
+    
+    # Harita oluştur
+    m = folium.Map(location=[center_lat, center_lon], zoom_start=10)
+    
+    # Küme renkleri
+    colors = CLUSTER_COLORS
+    
+    # Hücreler tek bir GeoJSON katmanı olarak eklenir
+    mean_speed = cells.get('mean_speed')
+    features = [
+        {
+            'type': 'Feature',
+            'geometry': {'type': 'Point', 'coordinates': [round(float(lon), 5), round(float(lat), 5)]},
+            'properties': {
+                'cluster': int(cluster),
+                'count': int(count),
+                'share': f'%{share * 100:.0f}',
+                'speed': f'{mean_speed[i]:.1f}' if mean_speed is not None else '-',
+                'color': colors[int(cluster) % len(colors)],
+            },
+        }
+        for i, (lat, lon, cluster, count, share) in enumerate(zip(
+            cells['latitude'], cells['longitude'], cells['cluster'], cells['count'], cells['share']))
+    ]
+    
+    folium.GeoJson(
+        {'type': 'FeatureCollection', 'features': features},
+        name='Kümeler',
+        marker=folium.CircleMarker(radius=6, weight=1, fill_opacity=0.7),
+        style_function=lambda feature: {
+            'color': 'black',
+            'fillColor': feature['properties']['color'],
+        },
+        tooltip=folium.GeoJsonTooltip(
+            fields=['cluster', 'count', 'share', 'speed'],
+            aliases=['Küme', 'Okuma sayısı', 'Çoğunluk oranı', 'Ort. hız (km/h)'],
+        ),
+    ).add_to(m)
+    
+    if heatmap:
+        from folium.plugins import HeatMap
+        heat_points = np.column_stack([cells['latitude'], cells['longitude'], cells['count']])
+        HeatMap(np.round(heat_points, 5).tolist(), name='Okuma yoğunluğu', show=False).add_to(m)
+        folium.LayerControl().add_to(m)
+    
+    # Haritayı kaydet
+    os.makedirs('results/maps', exist_ok=True)
+    m.save('results/maps/traffic_clusters.html')
+    print("✓ Harita kaydedildi: results/maps/traffic_clusters.html")
+    return m
+
+@instrumented()
+def create_traffic_map(data, cell_size=MAP_CELL_SIZE, heatmap=True):
+    """Harita üzerinde kümeleri görselleştirir.
+
+    Noktalar tek tek işaretlenmek yerine hücrelere toplanır; her hücre çoğunluk
+    kümesinin rengiyle tek bir GeoJSON katmanında gösterilir. Böylece tüm veri
+    kullanılabilir ve HTML boyutu satır sayısıyla değil hücre sayısıyla büyür.
+    `heatmap` True ise okuma yoğunluğu için ek bir ısı haritası katmanı eklenir.
+    """
     try:
-        if 'latitude' not in data.columns or 'longitude' not in data.columns:
+        cells = _map_cells(data, cell_size)
+        if cells is None:
             print("⚠️ Koordinat bilgisi bulunamadı (latitude, longitude)")
             return None
-            
-        # Merkez koordinat hesapla
-        center_lat = data['latitude'].mean()
-        center_lon = data['longitude'].mean()
-        
-        # Harita oluştur
-        m = folium.Map(location=[center_lat, center_lon], zoom_start=10)
-        
-        # Küme renkleri
-        colors = ['red', 'blue', 'green', 'orange', 'purple', 'brown', 'pink', 'gray']
-        
-        # Her nokta için marker ekle
-        for idx, row in data.iterrows():
-            cluster = int(row['cluster'])
-            color = colors[cluster % len(colors)]
-            
-            folium.CircleMarker(
-                location=[row['latitude'], row['longitude']],
-                radius=8,
-                popup=f"Küme: {cluster}",
-                color='black',
-                weight=1,
-                fillColor=color,
-                fillOpacity=0.7
-            ).add_to(m)
-        
-        # Haritayı kaydet
-        os.makedirs('results/maps', exist_ok=True)
-        m.save('results/maps/traffic_clusters.html')
-        print("✓ Harita kaydedildi: results/maps/traffic_clusters.html")
-        
-        return m
+        return render_traffic_map(cells, heatmap)
     except Exception as e:
         print(f"Harita oluşturma hatası: {e}")
-        return None
\ No newline at end of file
+        return None
+
+# Arka planda çizilmekte olan grafikler (bkz. render_batch / wait_for_renders)
+_pending_renders = []
+
+def prepare_figures(data, features, labels, feature_columns, stats=None, inertia=None, scores=None,
+                    score_label='Silhouette Skoru', projection=None, bins=PCA_RASTER_BINS):
+    """Toplu çizim için grafik işlerini hazırlar.
+
+    Ağır hesaplar (izdüşüm, rasterleştirme, hücre toplama, küme ortalamaları)
+    burada, ana süreçte NumPy ile yapılır; işlere yalnızca çizime hazır küçük
+    diziler verilir.
+
+    Returns:
+        [(ad, render_fonksiyonu, argümanlar)] listesi.
+    """
+    jobs = []
+    if inertia is not None and len(inertia) > 0:
+        jobs.append(('cluster_analysis', render_cluster_analysis, (list(inertia), list(scores), score_label)))
+    
+    labels = np.asarray(labels)
+    pca_result, variance_ratio = _pca_points(features, projection)
+    image, extent = rasterize_clusters(pca_result, labels, bins, CLUSTER_COLORS)
+    del pca_result
+    jobs.append(('pca_clusters', render_pca_image, (image, extent, np.unique(labels), variance_ratio)))
+    
+    if len(feature_columns) > 0:
+        jobs.append(('cluster_characteristics', render_cluster_characteristics,
+                     (_cluster_means(data, feature_columns, stats),)))
+    
+    cells = _map_cells(data)
+    if cells is not None:
+        jobs.append(('traffic_map', render_traffic_map, (cells,)))
+    return jobs
+
+def _init_render_worker(dpi, fmt):
+    configure_rendering(dpi=dpi, fmt=fmt, headless=True)
+
+def _render_job(name, func, args):
+    try:
+        func(*args)
+        return name, None
+    except Exception as e:
+        return name, str(e)
+
+def render_batch(jobs, max_workers=None, dpi=None, fmt=None):
+    """Grafik işlerini işçi süreçlerde, beklemeden çizmeye başlar.
+
+    İşçiler etkileşimsiz Agg arka ucunu kullanır ve `plt.show()` çağırmaz.
+    Sonuçlar `wait_for_renders` ile beklenir; bu arada ana süreç diğer
+    aşamalara (ör. küme yorumları) devam edebilir.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    
+    max_workers = max_workers or min(len(jobs), os.cpu_count() or 1) or 1
+    executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_render_worker,
+                                   initargs=(dpi or RENDER_SETTINGS['dpi'], fmt or RENDER_SETTINGS['format']))
+    _pending_renders.extend(executor.submit(_render_job, name, func, args) for name, func, args in jobs)
+    # Bekleyen işler çalışmaya devam eder; havuz son iş bitince kapanır
+    executor.shutdown(wait=False)
+    print(f"🖌️  {len(jobs)} grafik {max_workers} işçi süreçte çiziliyor...")
+
+def wait_for_renders():
+    """Arka planda çizilen grafiklerin bitmesini bekler.
+
+    Returns:
+        Başarısız işlerin {ad: hata} sözlüğü.
+    """
+    errors = {}
+    while _pending_renders:
+        try:
+            name, error = _pending_renders.pop(0).result()
+        except Exception as e:
+            name, error = 'render_batch', str(e)
+        if error is not None:
+            print(f"Grafik çizim hatası ({name}): {error}")
+            errors[name] = error
+    return errors
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modüller main.py'deki gibi doğrudan src/ altından içe aktarılır
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
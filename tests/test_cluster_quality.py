@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from sklearn.metrics import silhouette_score
+
+from cluster_quality import silhouette_chunked
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(0)
+    centers = rng.normal(scale=4.0, size=(4, 5))
+    labels = rng.integers(0, 4, 1501)
+    return centers[labels] + rng.normal(size=(1501, 5)), labels
+
+
+@pytest.mark.parametrize('chunk_size', [128, 500, 5000])
+def test_silhouette_chunked_matches_sklearn(points, chunk_size):
+    X, labels = points
+    assert silhouette_chunked(X, labels, chunk_size=chunk_size) == pytest.approx(
+        silhouette_score(X, labels), abs=1e-9)
+
+
+def test_silhouette_chunked_ignores_missing_cluster_ids(points):
+    X, labels = points
+    labels = np.array([0, 2, 3, 7])[labels]
+    assert silhouette_chunked(X, labels, chunk_size=256) == pytest.approx(
+        silhouette_score(X, labels), abs=1e-9)
+
+
+def test_silhouette_chunked_singleton_cluster(points):
+    X, labels = points
+    labels = labels.copy()
+    labels[0] = 9
+    assert silhouette_chunked(X, labels, chunk_size=256) == pytest.approx(
+        silhouette_score(X, labels), abs=1e-9)
+
+
+def test_silhouette_chunked_accepts_memmap(tmp_path, points):
+    X, labels = points
+    path = tmp_path / 'features.npy'
+    np.save(path, X.astype(np.float32))
+    mapped = np.load(path, mmap_mode='r')
+    assert silhouette_chunked(mapped, labels, chunk_size=300) == pytest.approx(
+        silhouette_score(mapped, labels), abs=1e-6)
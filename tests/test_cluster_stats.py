@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+from cluster_stats import QUANTILE_BINS, compute_cluster_stats
+
+
+def test_empty_and_all_missing_clusters_give_nan():
+    data = pd.DataFrame({'AVERAGE_SPEED': [10.0, 20.0, np.nan, np.nan]})
+    stats = compute_cluster_stats(data, ['AVERAGE_SPEED'], np.array([0, 0, 2, 2]), n_clusters=4)
+    assert stats['count'].tolist() == [2, 0, 2, 0]
+    assert 10.0 <= stats.loc[0, 'AVERAGE_SPEED_q50'] <= 20.0
+    assert stats.loc[[1, 2, 3], 'AVERAGE_SPEED_q50'].isna().all()
+
+
+def test_all_missing_column_gives_nan():
+    data = pd.DataFrame({'AVERAGE_SPEED': [np.nan, np.nan]})
+    stats = compute_cluster_stats(data, ['AVERAGE_SPEED'], np.array([0, 1]))
+    assert stats.filter(like='AVERAGE_SPEED_q').isna().all().all()
+
+
+def test_matches_pandas_groupby():
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({'AVERAGE_SPEED': rng.normal(40, 10, 3000),
+                         'NUMBER_OF_VEHICLES': rng.integers(0, 300, 3000).astype(float)})
+    labels = rng.integers(0, 5, 3000)
+    stats = compute_cluster_stats(data, list(data.columns), labels)
+
+    grouped = data.groupby(labels)
+    assert stats['count'].tolist() == grouped.size().tolist()
+    for column in data.columns:
+        for stat in ('mean', 'std', 'min', 'max'):
+            np.testing.assert_allclose(stats[f'{column}_{stat}'], grouped[column].agg(stat), rtol=1e-9)
+        # Yüzdelikler histogram taslağıyla tahmin edilir: bir kutu genişliği içinde olmalı
+        width = (data[column].max() - data[column].min()) / QUANTILE_BINS
+        np.testing.assert_allclose(stats[f'{column}_q50'], grouped[column].median(), atol=2 * width)
@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+from clustering_analysis import determine_optimal_clusters
+
+
+@pytest.fixture(scope='module')
+def points():
+    # Belirgin küme yapısı olmayan veri: farklı başlatmalar farklı yerel minimumlara iner
+    return np.random.default_rng(3).uniform(size=(2000, 3)).astype(np.float32)
+
+
+@pytest.mark.parametrize('split_n_init', [False, True])
+def test_parallel_sweep_matches_sequential(points, split_n_init):
+    sequential = determine_optimal_clusters(points, max_k=6, n_jobs=1, metric='calinski_harabasz')
+    parallel = determine_optimal_clusters(points, max_k=6, n_jobs=2, split_n_init=split_n_init,
+                                          metric='calinski_harabasz')
+    np.testing.assert_allclose(parallel[0], sequential[0], rtol=1e-6)
+    np.testing.assert_allclose(parallel[1], sequential[1], rtol=1e-6)
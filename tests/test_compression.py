@@ -0,0 +1,40 @@
+import numpy as np
+
+from compression import compress_rows, expand_labels, unique_row_groups, unique_strata
+
+
+def test_compress_expand_round_trip():
+    rng = np.random.default_rng(0)
+    X = rng.integers(0, 4, (500, 3)).astype(np.float32)
+    X[::7, 0] = -0.0  # -0.0 ile 0.0 aynı vektör sayılmalı
+
+    unique_rows, counts, inverse = compress_rows(X)
+    np.testing.assert_array_equal(unique_rows[inverse], X)
+    assert counts.sum() == len(X)
+    assert len(unique_rows) == len(np.unique(X + 0.0, axis=0))
+    np.testing.assert_array_equal(np.bincount(inverse), counts)
+
+    labels = np.arange(len(unique_rows)) % 3
+    np.testing.assert_array_equal(expand_labels(labels, inverse), labels[inverse])
+
+
+def test_compress_rows_with_rounding_merges_close_rows():
+    X = np.array([[0.101, 1.0], [0.099, 1.0], [0.5, 1.0]], dtype=np.float32)
+    unique_rows, counts, inverse = compress_rows(X, decimals=1)
+    assert len(unique_rows) == 2
+    assert inverse[0] == inverse[1] != inverse[2]
+
+
+def test_unique_row_groups_matches_numpy_unique():
+    rng = np.random.default_rng(1)
+    cells = rng.integers(-3, 3, (1000, 2))
+    first_index, inverse, counts = unique_row_groups(cells)
+    np.testing.assert_array_equal(cells[first_index][inverse], cells)
+    assert sorted(counts.tolist()) == sorted(np.unique(cells, axis=0, return_counts=True)[1].tolist())
+
+
+def test_unique_strata_takes_first_occurrence():
+    X = np.array([[1.0], [2.0], [1.0], [3.0]], dtype=np.float32)
+    unique_rows, _, inverse = compress_rows(X)
+    strata = unique_strata(np.array([10, 20, 11, 30]), inverse, len(unique_rows))
+    assert dict(zip(unique_rows[:, 0].tolist(), strata.tolist())) == {1.0: 10, 2.0: 20, 3.0: 30}
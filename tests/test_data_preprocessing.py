@@ -0,0 +1,61 @@
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_preprocessing import _merge_seen, preprocess_data_streaming, preprocess_months
+from synthetic_data import generate_traffic_csv
+
+VALUE_COLUMNS = ['GEOHASH', 'MINIMUM_SPEED', 'MAXIMUM_SPEED', 'AVERAGE_SPEED', 'NUMBER_OF_VEHICLES']
+
+
+def _read_parts(output_dir):
+    parts = sorted(glob.glob(os.path.join(output_dir, 'part-*.parquet')))
+    return pd.concat([pd.read_parquet(path) for path in parts], ignore_index=True)
+
+
+def test_merge_seen_keeps_sorted_union():
+    seen = np.array([2, 5, 9], dtype=np.uint64)
+    merged = _merge_seen(seen, np.array([7, 1, 10], dtype=np.uint64))
+    assert merged.tolist() == [1, 2, 5, 7, 9, 10]
+
+
+@pytest.mark.parametrize('chunksize', [3, 7, 100])
+def test_streaming_dedup_matches_drop_duplicates(tmp_path, chunksize):
+    raw = tmp_path / 'traffic_density_202501.csv'
+    generate_traffic_csv(str(raw), 30)
+    data = pd.read_csv(raw)
+    # Duplikeler parça sınırlarının iki yanına ve aynı parçaya düşer; bir satır eksik
+    data = pd.concat([data, data.iloc[[0, 5, 5, 29, 12]]], ignore_index=True)
+    data.loc[3, 'AVERAGE_SPEED'] = np.nan
+    data.to_csv(raw, index=False)
+
+    preprocess_data_streaming(str(raw), str(tmp_path / 'out'), chunksize=chunksize)
+
+    expected = data.dropna().drop_duplicates().reset_index(drop=True)
+    result = _read_parts(str(tmp_path / 'out')).astype({'GEOHASH': str})
+    assert len(result) == len(expected) == 29
+    pd.testing.assert_frame_equal(result[VALUE_COLUMNS], expected[VALUE_COLUMNS], check_dtype=False)
+
+
+def test_preprocess_months_loads_only_matched_months(tmp_path):
+    raw_dir = tmp_path / 'raw'
+    for month in (1, 2, 3):
+        generate_traffic_csv(str(raw_dir / f'traffic_density_2025{month:02d}.csv'), 200, month=month)
+    dataset_dir = str(tmp_path / 'months')
+    preprocess_months(str(raw_dir / 'traffic_density_2025*.csv'), dataset_dir, max_workers=1)
+
+    # Veri setinde 3 ay var; desen yalnızca ikisine uyuyor
+    os.remove(raw_dir / 'traffic_density_202503.csv')
+    data = preprocess_months(str(raw_dir / 'traffic_density_2025*.csv'), dataset_dir, max_workers=1)
+    assert sorted(data['year_month'].unique()) == [202501, 202502]
+
+    data = preprocess_months(str(raw_dir / 'traffic_density_2025*.csv'), dataset_dir,
+                             months=[202502, 202503], hours=[8, 9], max_workers=1)
+    assert data['year_month'].unique().tolist() == [202502]
+    assert set(data['hour']) <= {8, 9}
+    with pytest.raises(ValueError):
+        preprocess_months(str(raw_dir / 'traffic_density_2025*.csv'), dataset_dir, months=[202503],
+                          max_workers=1)
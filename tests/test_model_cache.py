@@ -0,0 +1,57 @@
+import os
+import time
+
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+
+from model_cache import (evict, fingerprint_array, list_entries, load_entry, make_cache_key,
+                         save_entry)
+
+
+def test_cache_key_is_stable_and_sensitive():
+    X = np.arange(12, dtype=np.float32).reshape(4, 3)
+    scaler = StandardScaler().fit(X)
+    key = make_cache_key('kmeans', fingerprint_array(X), ['a', 'b'], scaler,
+                         {'n_clusters': 3, 'kmeans': {'n_init': 5, 'tol': 1e-4}})
+
+    # Aynı içerik (farklı nesne, farklı sözlük sırası) aynı anahtarı verir
+    same = make_cache_key('kmeans', fingerprint_array(X.copy()), ['a', 'b'], StandardScaler().fit(X),
+                          {'kmeans': {'tol': 1e-4, 'n_init': np.int64(5)}, 'n_clusters': 3})
+    assert same == key
+
+    changed = [
+        make_cache_key('kmeans', fingerprint_array(X + 1), ['a', 'b'], scaler,
+                       {'n_clusters': 3, 'kmeans': {'n_init': 5, 'tol': 1e-4}}),
+        make_cache_key('kmeans', fingerprint_array(X), ['b', 'a'], scaler,
+                       {'n_clusters': 3, 'kmeans': {'n_init': 5, 'tol': 1e-4}}),
+        make_cache_key('kmeans', fingerprint_array(X), ['a', 'b'], StandardScaler().fit(X * 2),
+                       {'n_clusters': 3, 'kmeans': {'n_init': 5, 'tol': 1e-4}}),
+        make_cache_key('kmeans', fingerprint_array(X), ['a', 'b'], scaler,
+                       {'n_clusters': 3, 'kmeans': {'n_init': 6, 'tol': 1e-4}}),
+        make_cache_key('sweep', fingerprint_array(X), ['a', 'b'], scaler,
+                       {'n_clusters': 3, 'kmeans': {'n_init': 5, 'tol': 1e-4}}),
+    ]
+    assert len({key, *changed}) == len(changed) + 1
+
+
+def test_save_and_load_round_trip(tmp_path):
+    cache_dir = str(tmp_path)
+    save_entry('kmeans-a', {'centers': np.eye(3)}, {'n_clusters': 3}, cache_dir=cache_dir)
+    arrays, metadata = load_entry('kmeans-a', cache_dir=cache_dir)
+    np.testing.assert_array_equal(arrays['centers'], np.eye(3))
+    assert metadata['n_clusters'] == 3
+    assert load_entry('kmeans-missing', cache_dir=cache_dir) is None
+
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    cache_dir = str(tmp_path)
+    for name in ('a', 'b', 'c'):
+        save_entry(name, {'values': np.zeros(1000)}, cache_dir=cache_dir)
+        # mtime çözünürlüğünden bağımsız olarak kullanım sırası belirlensin
+        stamp = time.time() - {'a': 30, 'b': 20, 'c': 10}[name]
+        os.utime(os.path.join(cache_dir, name, 'meta.json'), (stamp, stamp))
+
+    load_entry('a', cache_dir=cache_dir)  # 'a' en son kullanılan olur
+    entry_size = dict(list_entries(cache_dir))['a']
+    evict(cache_dir, max_bytes=2 * entry_size)
+    assert [name for name, _ in list_entries(cache_dir)] == ['a', 'c']
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from data_preprocessing import preprocess_data
+from feature_matrix import build_feature_matrix
+from incremental import load_labels, load_partitions, save_model_state, update_month
+from normalization import load_scaler
+from partitioned_clustering import (cluster_partitions, partition_codes, partition_layout,
+                                    partition_owners)
+from predictor import TrafficPredictor
+from synthetic_data import generate_traffic_csv
+
+PARTITION = 'hour_bucket'
+
+
+@pytest.fixture(scope='module')
+def partitioned_model(tmp_path_factory):
+    root = tmp_path_factory.mktemp('partitioned')
+    csv_path = str(root / 'traffic_density_202501.csv')
+    generate_traffic_csv(csv_path, 20_000, month=1)
+    scaler_path = str(root / 'scaler.joblib')
+    data = preprocess_data(csv_path, scaler_path=scaler_path)
+    scaler = load_scaler(scaler_path)
+    X = build_feature_matrix(data, scaler, str(root / 'features.npy'))
+
+    labels, centers, partitions = cluster_partitions(data, X, PARTITION, max_k=4,
+                                                     metric='calinski_harabasz', n_jobs=1)
+    state_dir = str(root / 'model')
+    save_model_state(state_dir, scaler, centers, labels, '202501',
+                     partitions=partition_layout(partitions, PARTITION))
+    return root, state_dir, data, labels
+
+
+def test_predictor_matches_partitioned_labels(partitioned_model):
+    _, state_dir, data, labels = partitioned_model
+    predictor = TrafficPredictor.load(state_dir)
+    assert predictor.partitions['by'] == [PARTITION]
+
+    predicted, _ = predictor.predict(data)
+    assert (predicted == labels).mean() >= 0.999
+
+    records = data.iloc[:200].to_dict('records')
+    assert [p.cluster for p in predictor.predict_records(records)] == predicted[:200].tolist()
+    assert [predictor.predict_one(record).cluster for record in records] == predicted[:200].tolist()
+
+
+def test_update_month_assigns_within_partition(partitioned_model):
+    root, state_dir, _, _ = partitioned_model
+    csv_path = str(root / 'traffic_density_202502.csv')
+    generate_traffic_csv(csv_path, 10_000, month=2, seed=7)
+    labels, _ = update_month(csv_path, state_dir)
+
+    layout = load_partitions(state_dir)
+    data = preprocess_data(csv_path)
+    codes, names = partition_codes(data, PARTITION)
+    expected = np.array([layout['names'].index(name) for name in names])[codes]
+    assert np.array_equal(partition_owners(layout)[labels], expected)
+    assert np.array_equal(load_labels(state_dir, ['202502']), labels)
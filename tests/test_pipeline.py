@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+from pipeline import Stage, run_pipeline, stage_keys
+
+
+def _stages(calls, scale=2):
+    def load():
+        calls.append('load')
+        return {'table': pd.DataFrame({'x': [1.0, 2.0, 3.0]})}
+
+    def transform(table):
+        calls.append('transform')
+        return {'values': table['x'].to_numpy() * scale}
+
+    def report(values):
+        calls.append('report')
+        return {'total': float(values.sum())}
+
+    return [
+        Stage('load', load, (), {'source': 'a'}),
+        Stage('transform', transform, ('load',), lambda: {'scale': scale}),
+        Stage('report', report, ('transform',), checkpoint=False),
+    ]
+
+
+def test_unchanged_stages_are_skipped(tmp_path):
+    calls = []
+    assert set(run_pipeline(_stages(calls), str(tmp_path)).values()) == {'run'}
+    calls.clear()
+    status = run_pipeline(_stages(calls), str(tmp_path))
+    assert status == {'load': 'cached', 'transform': 'cached', 'report': 'run'}
+    # Checkpoint'ten yüklenen çıktı yalnızca ihtiyaç duyan aşama için okunur
+    assert calls == ['report']
+
+
+def test_changed_params_invalidate_dependants(tmp_path):
+    run_pipeline(_stages([]), str(tmp_path))
+    calls = []
+    status = run_pipeline(_stages(calls, scale=3), str(tmp_path))
+    assert status == {'load': 'cached', 'transform': 'run', 'report': 'run'}
+    assert calls == ['transform', 'report']
+
+    keys, changed = stage_keys(_stages([])), stage_keys(_stages([], scale=3))
+    assert keys['load'] == changed['load']
+    assert keys['transform'] != changed['transform']
+
+
+def test_start_and_force_rerun_stages(tmp_path):
+    run_pipeline(_stages([]), str(tmp_path))
+    status = run_pipeline(_stages([]), str(tmp_path), start='transform')
+    assert status == {'load': 'cached', 'transform': 'run', 'report': 'run'}
+    status = run_pipeline(_stages([]), str(tmp_path), force=True)
+    assert set(status.values()) == {'run'}
+
+
+def test_failed_stage_is_not_checkpointed(tmp_path):
+    def broken(table):
+        raise KeyError('hour')
+
+    stages = _stages([])
+    stages[1] = stages[1]._replace(func=broken)
+    status = run_pipeline(stages, str(tmp_path))
+    assert status == {'load': 'run', 'transform': 'failed', 'report': 'skipped'}
+
+    calls = []
+    status = run_pipeline(_stages(calls), str(tmp_path))
+    assert status['transform'] == 'run'
+    assert calls == ['transform', 'report']
+
+
+def test_checkpointed_arrays_round_trip(tmp_path):
+    captured = []
+    stages = _stages([])
+    stages[2] = Stage('report', lambda values: captured.append(np.asarray(values)), ('transform',),
+                      checkpoint=False)
+    run_pipeline(stages, str(tmp_path))
+    run_pipeline(stages, str(tmp_path))
+    np.testing.assert_array_equal(captured[0], [2.0, 4.0, 6.0])
+    np.testing.assert_array_equal(captured[1], captured[0])